@@ -33,13 +33,13 @@ from itertools import zip_longest
 """导入python第三方模块"""
 from PyQt5.QtGui import QIcon, QKeySequence, QPixmap
 from PyQt5.QtWidgets import (
-    QFileSystemModel, QAbstractItemView, QTableWidgetItem, 
+    QFileSystemModel, QAbstractItemView, 
     QHeaderView, QShortcut, QSplashScreen, QMainWindow, 
     QSizePolicy, QApplication, QMenu, QInputDialog, 
     QProgressDialog, QDialog, QLabel, QAction)
 from PyQt5.QtCore import (
     Qt, QDir, QSize, QTimer, QThreadPool, QUrl, QSize, 
-    QMimeData, QPropertyAnimation, QItemSelection, QItemSelectionModel)
+    QMimeData, QPropertyAnimation, QItemSelection, QItemSelectionModel, QEvent)
 
 """导入用户自定义的模块"""
 # from src.components.ui_main import Ui_MainWindow                            # 假设你的主窗口类名为Ui_MainWindow
@@ -70,8 +70,10 @@ from src.utils.delete import force_delete_folder                            # 
 from src.utils.Icon import IconCache, ImagePreloader                        # 导入文件Icon图标加载类
 from src.utils.heic import extract_jpg_from_heic                            # 导入heic文件解析工具类
 from src.utils.video import extract_video_first_frame                       # 导入视频预览工具类
-from src.utils.image import ImageProcessor                                  # 导入图片处理工具类
-from src.utils.sort import sort_by_custom                                   # 导入文件排序工具类
+from src.utils.scanner import FolderScanner, scan_folder                   # 导入后台文件夹扫描工具类
+from src.utils.folder_watcher import FolderWatcher                          # 导入文件夹变化监听类
+from src.utils.task_scheduler import configure_scheduler, shutdown_scheduler  # 导入全局任务调度器
+from src.utils.p3_converter import COLOR_ENGINES                            # 导入可选的色域转换引擎
 from src.view.sub_search_view import SearchOverlay                                  # 导入图片搜索工具类(ctrl+f)
 from src.utils.decorator import CC_TimeDec                                  # 导入自定义装饰器
 from src.utils.aeboxlink import (check_process_running,                     # 导入自定义装饰器
@@ -81,6 +83,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 from src.utils.decorator import CC_TimeDec
 from src.components.custom_qCombox_spinner import CustomComboBox
 from src.components.custom_qTableWidget_drag import DragTableWidget
+from src.components.custom_qTableView_files import FileTableView, has_file_info_text
 
 class Ui_MainWindow(object):
     """主窗口UI类"""
@@ -430,7 +433,7 @@ class Ui_MainWindow(object):
             # 设置表格的主窗口引用
             self.RB_QTableWidget0.set_main_window(self)
         else:
-            self.RB_QTableWidget0 = QtWidgets.QTableWidget(self.Right_Bottom_QGroupBox)
+            self.RB_QTableWidget0 = FileTableView(self.Right_Bottom_QGroupBox)
 
         self.RB_QTableWidget0.setObjectName("RB_QTableWidget0")
         self.verticalLayout_3.addWidget(self.RB_QTableWidget0)
@@ -558,16 +561,34 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         self.paths_list = []                    # 文件路径列表
         self.dirnames_list = []                 # 选中的同级文件夹列表
         self.image_index_max = []               # 存储当前选中及复选框选中的，所有图片列有效行最大值
-        self.preloading_file_name_paths = []    # 预加载图标前的文件路径列表
         self.compare_window = None              # 添加子窗口引用
         self.last_key_press = False             # 记录第一次按下键盘空格键或B键
         self.left_tree_file_display = False     # 设置左侧文件浏览器初始化标志位，只显示文件夹
         self.simple_mode = True                 # 设置默认模式为简单模式，同EXIF信息功能
         self.current_theme = "默认主题"          # 设置初始主题为默认主题
 
+        # 添加文件夹扫描相关的属性初始化
+        self.current_scanner = None
+        self.current_refresh_scanner = None     # 增量刷新文件夹的扫描线程
+        self.pending_refresh_folders = []       # 全量扫描期间发生变化、等待扫描完成后刷新的文件夹
+        self.removed_from_list_paths = set()    # 从列表中删除(未删除原文件)的文件路径，增量刷新时不再显示
+        self.watch_folders = True               # 是否监听表格中的文件夹并增量更新表格，可在basic_settings.json中配置
+        # 监听表格中显示的文件夹，文件增删改后增量更新对应的列；load_settings()会触发首次更新表格，需在此之前创建
+        self.folder_watcher = FolderWatcher(self)
+        self.folder_watcher.folders_changed.connect(self.on_watched_folders_changed)
+
         # 添加预加载相关的属性初始化
         self.current_preloader = None 
         self.preloading = False        
+        self.preload_workers = max(1, min(8, (os.cpu_count() or 2) - 1))  # 预加载图标的并行线程数，可在basic_settings.json中配置
+        self.icon_prefetch_rows = 5             # 可见区域上下额外优先加载的行数
+        self.evict_offscreen_icons = False      # 是否释放远离可见区域的图标，可在basic_settings.json中配置
+        self.icon_evict_margin_rows = 200       # 超出可见区域该行数的图标会被释放
+        self.compare_prefetch_mb = 1024         # 看图子界面预取上一组/下一组图片的内存预算(MB)，为0时关闭预取
+        self.decode_workers = 0                 # 全局任务调度器的工作线程数，为0时按CPU核数自动设置
+        self.decode_process_pool = False        # 是否在子进程中执行色域转换等持有GIL的计算
+        self.color_engine = "lcms"              # 色域转换引擎，lcms为LittleCMS，numpy为矩阵+LUT的并行实现
+        self.histogram_step = 4                 # 看图子界面直方图的取样步长，1为统计全部像素
 
         # 初始化线程池
         self.threadpool = QThreadPool()
@@ -1135,6 +1156,15 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
         # 表格选择变化时，更新状态栏和预览区域显示
         self.RB_QTableWidget0.itemSelectionChanged.connect(self.handle_table_selection)
+
+        # 表格滚动或视口尺寸变化时，延迟50ms后优先加载可见区域的图标
+        self.viewport_icon_timer = QTimer(self)
+        self.viewport_icon_timer.setSingleShot(True)
+        self.viewport_icon_timer.setInterval(50)
+        self.viewport_icon_timer.timeout.connect(self.load_visible_icons)
+        self.RB_QTableWidget0.verticalScrollBar().valueChanged.connect(self.schedule_visible_icon_loading)
+        self.RB_QTableWidget0.horizontalScrollBar().valueChanged.connect(self.schedule_visible_icon_loading)
+        self.RB_QTableWidget0.viewport().installEventFilter(self)
         
         # 底部状态栏按钮连接函数
         self.statusbar_button1.clicked.connect(self.setting)   # 🔆设置按钮槽函数
@@ -1760,6 +1790,7 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             # 执行删除操作
             for col_idx, row in items_to_delete:
                 if col_idx < len(self.files_list) and row < len(self.files_list[col_idx]):
+                    self.removed_from_list_paths.add(self.paths_list[col_idx][row])
                     del self.files_list[col_idx][row]
                     del self.paths_list[col_idx][row]
             
@@ -1799,8 +1830,8 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
                 except Exception as e:
                     show_message_box(f"删除文件失败: {file_path}, 错误: {e}", "提示", 500)
 
-            # 删除表格中的行，可以直接更新表格
-            self.update_RB_QTableWidget0()
+            # 只重新扫描被删除文件所在的文件夹，增量更新表格
+            self.refresh_changed_folders({os.path.dirname(file_path) for file_path in file_paths_to_delete})
             show_message_box(f"{len(file_paths_to_delete)} 个文件已从列表中删除并删除原文件", "提示", 1000)
 
         except Exception as e:
@@ -2068,12 +2099,16 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         """从当前列表中更新表格，适配从当前列表删除文件功能"""
         print(f"[update_RB_QTableWidget0_from_list]-->从当前列表中更新表格")
         try:    
-            # 取消当前的预加载任务
+            # 取消当前的预加载任务、文件夹扫描和增量刷新任务，旧任务的结果不能追加到重建后的表格中；
+            # 尚未扫描的文件夹和正在刷新的文件夹在表格重建后重新扫描
+            remaining_folders = [folder for folder in self.current_scanner.folders
+                                 if os.path.basename(folder) not in dir_name_list] if self.current_scanner else []
+            refreshing_folders = list(self.current_refresh_scanner.folders) if self.current_refresh_scanner else []
             self.cancel_preloading()
+            self.cancel_folder_scan()
+            self.cancel_folder_refresh()
             # 清空表格和缓存
             self.RB_QTableWidget0.clear()
-            self.RB_QTableWidget0.setRowCount(0)
-            self.RB_QTableWidget0.setColumnCount(0)
             self.image_index_max = [] # 清空图片列有效行最大值 
 
             # 先初始化表格结构和内容，不加载图标,并获取图片列有效行最大值
@@ -2085,6 +2120,11 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             if file_name_paths:  # 确保有文件路径才开始预加载
                 self.start_image_preloading(file_name_paths)
 
+            if remaining_folders:
+                self.start_folder_scan(remaining_folders)
+            if refreshing_folders:
+                self.refresh_folders(refreshing_folders)
+
         except Exception as e:
             print(f"[update_RB_QTableWidget0_from_list]-->error--从当前列表中更新表格任务失败: {e}")
 
@@ -2093,87 +2133,50 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
     def update_RB_QTableWidget0(self):
         """更新右侧表格功能函数"""
         
-        # 取消当前的预加载任务
+        # 取消当前的预加载任务和文件夹扫描任务
         self.cancel_preloading()
+        self.cancel_folder_scan()
+        self.cancel_folder_refresh()
+        self.folder_watcher.clear()
+        self.removed_from_list_paths = set()
 
-        # 清空表格和缓存
-        self.RB_QTableWidget0.clear()
-        self.RB_QTableWidget0.setRowCount(0)
-        self.RB_QTableWidget0.setColumnCount(0)
+        # 清空表格和缓存，行高先按单行文本设置，扫描到图片信息后再调整
+        self.RB_QTableWidget0.set_files([], [], row_height=52)
         self.image_index_max = [] # 清空图片列有效行最大值  
-        
-        # 收集文件名基本信息以及文件路径，并将相关信息初始化为类中全局变量
-        file_infos_list, file_paths, dir_name_list = self.collect_file_paths()
-        self.files_list = file_infos_list      # 初始化文件名及基本信息列表
-        self.paths_list = file_paths           # 初始化文件路径列表
-        self.dirnames_list = dir_name_list     # 初始化选中的同级文件夹列表
-
-        # 先初始化表格结构和内容，不加载图标,并获取图片列有效行最大值
-        self.image_index_max = self.init_table_structure(file_infos_list, dir_name_list)       
+        self.files_list = []                   # 初始化文件名及基本信息列表
+        self.paths_list = []                   # 初始化文件路径列表
+        self.dirnames_list = []                # 初始化选中的同级文件夹列表
+        self.RB_QTableWidget0.setIconSize(QSize(48, 48))  
 
-        # 对file_paths进行转置,实现加载图标按行加载，并初始化预加载图标线程前的问价排列列表
-        file_name_paths = [path for column in zip_longest(*file_paths, fillvalue=None) for path in column if path is not None]
-        self.preloading_file_name_paths = file_name_paths 
+        # 扫描开始前就监听所有选中的文件夹，扫描期间发生的变化在扫描完成后刷新；
+        # 当前为空的文件夹不扫描，出现文件后由增量刷新追加对应的列
+        if self.watch_folders:
+            self.folder_watcher.set_folders(self.get_checked_folders())
 
-        # 开始预加载图标    
-        if file_name_paths:  # 确保有文件路径才开始预加载
-            self.start_image_preloading(file_name_paths)
+        # 获取需要显示的文件夹，在后台线程中逐个扫描，每扫描完一个文件夹就填充一列
+        selected_folders_path, _ = self.get_selected_folders()
+        if selected_folders_path:
+            self.start_folder_scan(selected_folders_path)
 
 
     def init_table_structure(self, file_name_list, dir_name_list):
-        """初始化表格结构和内容，不包含图标"""
+        """初始化表格结构和内容，不包含图标
+        表格模型直接引用按列组织的文件信息列表，单元格文本在显示时按需生成
+        """
         try:
-            # 设置表格的列数
-            self.RB_QTableWidget0.setColumnCount(len(file_name_list))
-            # 设置列标题为当前选中的文件夹名，设置列名为文件夹名
-            self.RB_QTableWidget0.setHorizontalHeaderLabels(dir_name_list)  
+            self.RB_QTableWidget0.setIconSize(QSize(48, 48))  
 
             # 判断是否存在文件
             if not file_name_list or not file_name_list[0]:
+                self.RB_QTableWidget0.set_files([], dir_name_list)
                 return []  
             
-            # 设置表格的行数
-            max_cols = max(len(row) for row in file_name_list) 
-            self.RB_QTableWidget0.setRowCount(max_cols)  
-            self.RB_QTableWidget0.setIconSize(QSize(48, 48))  
+            # 用于记录每列的图片数量
+            pic_num_list = [len(column) for column in file_name_list]
 
-            pic_num_list = [] # 用于记录每列的图片数量
-            flag_ = 0 # 用于记录是否需要设置固定行高
-            # 填充 QTableWidget,先填充文件名称，后填充图标(用多线程的方式后加载图标)
-            for col_index, row in enumerate(file_name_list):
-                pic_num_list.append(len(row))
-                for row_index, value in enumerate(row):
-                    if value[4][0] is None and value[4][1] is None:
-                        resolution = " "
-                    else:
-                        resolution = f"{value[4][0]}x{value[4][1]}"
-                    if value[5] is None:
-                        exposure_time = " "
-                    else:
-                        exposure_time = value[5]
-                    if value[6] is None:
-                        iso = " "
-                    else: 
-                        iso = value[6]
-                    # 文件名称、分辨率、曝光时间、ISO
-                    if resolution == " " and exposure_time == " " and iso == " ": 
-                        item_text = value[0]
-                        flag_ = 0 
-                    else:
-                        item_text = value[0] + "\n" + f"{resolution} {exposure_time} {iso}"
-                        flag_ = 1 # 设置flag_为1，设置行高
-                    item = QTableWidgetItem(item_text)
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # 禁止编辑
-                    self.RB_QTableWidget0.setItem(row_index, col_index, item)  # 设置单元格项
-                ###############################    列  ,     行   ，内容    ######################
-
-            # 设置单元格行高固定为60,如果flag_为0，则不设置行高
-            if flag_:
-                for row in range(self.RB_QTableWidget0.rowCount()):
-                    self.RB_QTableWidget0.setRowHeight(row, 60)
-            else:
-                for row in range(self.RB_QTableWidget0.rowCount()):
-                    self.RB_QTableWidget0.setRowHeight(row, 52)
+            # 存在分辨率、曝光时间、ISO信息时单元格显示两行，统一行高为60，否则为52
+            row_height = 60 if has_file_info_text(file_name_list) else 52
+            self.RB_QTableWidget0.set_files(file_name_list, dir_name_list, row_height)
 
             # # 更新标签显示  
             self.statusbar_label0.setText(f"📢:当前选中的文件夹中包含 {pic_num_list} 张图")  
@@ -2184,22 +2187,21 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             return []
 
         
-    def collect_file_paths(self):
-        """收集需要显示的文件路径"""
-        # 初始化列表
-        file_infos = []  # 文件名列表
-        file_paths = []  # 文件路径列表
-        dir_name_list = [] # 文件夹名列表
+    def get_checked_folders(self):
+        """获取当前文件夹及复选框中选中的同级文件夹路径列表，不检查文件夹中是否包含文件"""
+        selected_folders = self.model.getCheckedItems()  # 获取选中的文件夹
+        current_directory = self.RT_QComboBox.currentText() # 当前选中的文件夹目录 
+        parent_directory = os.path.dirname(current_directory)  # 获取父目录
+        
+        # 构建所有需要显示的文件夹路径
+        selected_folders_path = [os.path.join(parent_directory, path) for path in selected_folders]
+        selected_folders_path.insert(0, current_directory)  # 将当前选中的文件夹路径插入到列表的最前面
+        return selected_folders_path
 
+    def get_selected_folders(self):
+        """获取需要显示的文件夹路径列表及文件夹名列表，剔除不包含对应类型文件的文件夹"""
         try:
-            # 获取复选框中选择的文件夹路径列表
-            selected_folders = self.model.getCheckedItems()  # 获取选中的文件夹
-            current_directory = self.RT_QComboBox.currentText() # 当前选中的文件夹目录 
-            parent_directory = os.path.dirname(current_directory)  # 获取父目录
-            
-            # 构建所有需要显示的文件夹路径
-            selected_folders_path = [os.path.join(parent_directory, path) for path in selected_folders]
-            selected_folders_path.insert(0, current_directory)  # 将当前选中的文件夹路径插入到列表的最前面
+            selected_folders_path = self.get_checked_folders()
             
             # 检测当前文件夹路径是否包含文件，没有则剔除该文件夹，修复多级空文件夹显示错乱的bug
             selected_option = self.RT_QComboBox0.currentText()
@@ -2221,68 +2223,189 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
             # 获取文件夹名列表
             dir_name_list = [os.path.basename(dir_name) for dir_name in selected_folders_path]
-            
-            # 处理每个文件夹
-            for folder in selected_folders_path:
-                if not os.path.exists(folder):
-                    continue
-                    
-                file_name_list, file_path_list = self.filter_files(folder)
-                if file_name_list:  # 只添加非空列表
-                    file_infos.append(file_name_list)
-                    file_paths.append(file_path_list)
-                
-            return file_infos, file_paths, dir_name_list
-            
+
+            return selected_folders_path, dir_name_list
+
         except Exception as e:
-            print(f"collect_file_paths函数_收集文件路径失败: {e}")
-            return [], [], []
-        
+            print(f"[get_selected_folders]-->获取需要显示的文件夹失败: {e}")
+            return [], []
+
     def filter_files(self, folder):
         """根据选项过滤文件"""
-        files_and_dirs_with_mtime = [] 
-        selected_option = self.RT_QComboBox0.currentText()
-        sort_option = self.RT_QComboBox2.currentText()
-
-        # 使用 os.scandir() 获取文件夹中的条目
-        with os.scandir(folder) as entries:
-            # 使用列表推导式和 DirEntry 对象的 stat() 方法获取文件元组，比os.listdir()更高效,性能更高
-            for entry in entries:
-                if entry.is_file():
-                    if selected_option == "显示图片文件":
-                        if entry.name.lower().endswith(self.IMAGE_FORMATS):
-                            # 非极简模式下通过PIL获取图片的宽度、高度、曝光时间、ISO
-                            if not self.simple_mode: 
-                                with ImageProcessor(entry.path) as img:
-                                    width, height, exposure_time, iso = img.width, img.height, img.exposure_time, img.iso
-                            # 获取图片的分辨率，极简模式下不获取图片的宽度、高度、曝光时间、ISO
-                            else:   
-                                width, height, exposure_time, iso = None, None, None, None
-                            # 文件名称、创建时间、修改时间、文件大小、分辨率、曝光时间、ISO、文件路径
-                            files_and_dirs_with_mtime.append((entry.name, entry.stat().st_ctime, entry.stat().st_mtime, entry.stat().st_size,
-                                                           (width, height), exposure_time, iso, entry.path))
-                    elif selected_option == "显示视频文件":
-                        if entry.name.lower().endswith(self.VIDEO_FORMATS):     
-                            # 文件名称、创建时间、修改时间、文件大小、分辨率、曝光时间、ISO、文件路径
-                            files_and_dirs_with_mtime.append((entry.name, entry.stat().st_ctime, entry.stat().st_mtime, entry.stat().st_size,
-                                                           (None, None), None, None, entry.path))
-                    elif selected_option == "显示所有文件":
-                            # 文件名称、创建时间、修改时间、文件大小、分辨率、曝光时间、ISO、文件路径
-                            files_and_dirs_with_mtime.append((entry.name, entry.stat().st_ctime, entry.stat().st_mtime, entry.stat().st_size,
-                                                           (None, None), None, None, entry.path))
-                    else: # 没有选择任何选项就跳过
-                        print("filter_files函数:selected_option没有选择任何选项,跳过")
-                        continue
-
-        # 使用sort_by_custom函数进行排序
-        files_and_dirs_with_mtime = sort_by_custom(sort_option, files_and_dirs_with_mtime, self.simple_mode, selected_option)
-
-        # 获取文件路径列表，files_and_dirs_with_mtime的最后一列
-        file_paths = [item[-1] for item in files_and_dirs_with_mtime]
-
-        return files_and_dirs_with_mtime, file_paths
+        return scan_folder(folder, self.RT_QComboBox0.currentText(), self.RT_QComboBox2.currentText(),
+                           self.simple_mode, self.IMAGE_FORMATS, self.VIDEO_FORMATS)
+
+    def start_folder_scan(self, folders):
+        """启动后台文件夹扫描线程，文件夹监听列表由调用方设置"""
+        print(f"[start_folder_scan]-->开始后台扫描 {len(folders)} 个文件夹")
+        self.start_time_folder_scan = time.time()
+        try:
+            self.current_scanner = FolderScanner(
+                folders, self.RT_QComboBox0.currentText(), self.RT_QComboBox2.currentText(),
+                self.simple_mode, self.IMAGE_FORMATS, self.VIDEO_FORMATS)
+            self.current_scanner.signals.folder_scanned.connect(self.on_folder_scanned)
+            self.current_scanner.signals.progress.connect(self.update_scan_progress)
+            self.current_scanner.signals.finished.connect(self.on_folder_scan_finished)
+            self.current_scanner.signals.error.connect(self.on_folder_scan_error)
+            self.threadpool.start(self.current_scanner)
+        except Exception as e:
+            print(f"[start_folder_scan]-->启动后台扫描线程失败: {e}")
+
+    def cancel_folder_scan(self):
+        """取消当前文件夹扫描任务"""
+        if self.current_scanner:
+            self.current_scanner.stop()
+            self.current_scanner = None
+
+    def is_current_scanner(self):
+        """判断信号是否来自当前扫描线程，已取消的扫描线程发出的信号忽略"""
+        return self.current_scanner is not None and self.sender() is self.current_scanner.signals
+
+    def on_folder_scanned(self, file_infos, file_paths, dir_name):
+        """单个文件夹扫描完成，向表格追加一列并加载该列图标"""
+        if not self.is_current_scanner():
+            return
+        self.append_folder_column(file_infos, file_paths, dir_name)
+
+    def append_folder_column(self, file_infos, file_paths, dir_name):
+        """向表格追加一个文件夹的列并加载该列图标"""
+        try:
+            self.files_list.append(file_infos)
+            self.paths_list.append(file_paths)
+            self.dirnames_list.append(dir_name)
+            self.image_index_max.append(len(file_infos))
+
+            # 存在分辨率、曝光时间、ISO信息时单元格显示两行，行高调整为60
+            row_height = 60 if has_file_info_text([file_infos]) else None
+            self.RB_QTableWidget0.append_files(file_infos, dir_name, row_height)
+
+            # 更新标签显示
+            self.statusbar_label0.setText(f"📢:当前选中的文件夹中包含 {self.image_index_max} 张图")
+
+            # 追加到正在运行的预加载器中，并将队列中尚未加载的文件按行优先重新排列，预加载器已结束时重新启动
+            if self.current_preloader and self.preloading and self.current_preloader.add_paths(file_paths):
+                self.current_preloader.prioritize(
+                    [path for row in zip_longest(*self.paths_list, fillvalue=None) for path in row if path is not None])
+            else:
+                self.cancel_preloading()
+                self.start_image_preloading(file_paths)
+
+            # 新的一列可能出现在可见区域，重新调度可见区域优先加载
+            self.schedule_visible_icon_loading()
+
+        except Exception as e:
+            print(f"[append_folder_column]-->向表格追加文件夹 {dir_name} 失败: {e}")
+
+    def update_scan_progress(self, current, total, dir_name):
+        """处理文件夹扫描进度"""
+        if self.is_current_scanner():
+            self.statusbar_label1.setText(f"🔉: 正在扫描 {dir_name}...{current}/{total}🍃")
+
+    def on_folder_scan_finished(self):
+        """处理文件夹扫描完成"""
+        if not self.is_current_scanner():
+            return
+        self.current_scanner = None
+        print(f"[on_folder_scan_finished]-->所有文件夹扫描完成,耗时：{time.time()-self.start_time_folder_scan:.2f}秒")
+        if not self.files_list:
+            self.statusbar_label0.setText(f"📢:当前选中的文件夹中包含 [] 张图")
+
+        # 刷新扫描期间发生变化的文件夹
+        if self.pending_refresh_folders:
+            pending, self.pending_refresh_folders = self.pending_refresh_folders, []
+            self.refresh_folders(pending)
+
+    def on_folder_scan_error(self, error):
+        """处理文件夹扫描错误"""
+        print(f"[on_folder_scan_error]-->文件夹扫描错误: {error}")
+        if self.is_current_scanner():
+            self.current_scanner = None
+
+    def on_watched_folders_changed(self, folders):
+        """监听的文件夹发生变化(已防抖)，全量扫描进行中时等扫描完成后再刷新"""
+        print(f"[on_watched_folders_changed]-->文件夹发生变化: {folders}")
+        if self.current_scanner is not None:
+            self.pending_refresh_folders.extend(f for f in folders if f not in self.pending_refresh_folders)
+            return
+        self.refresh_folders(folders)
+
+    def refresh_folders(self, folders):
+        """重新扫描指定文件夹，只更新表格中对应的列，不清空表格和图标"""
+        try:
+            # 只处理表格中已显示的文件夹及正在监听的文件夹(扫描时为空的文件夹没有对应的列)，正在刷新的文件夹一并重新扫描
+            watched = set(self.folder_watcher.folders())
+            folders = [os.path.normpath(folder) for folder in folders
+                       if os.path.basename(os.path.normpath(folder)) in self.dirnames_list
+                       or os.path.normpath(folder) in watched]
+            if self.current_refresh_scanner is not None:
+                folders += [folder for folder in self.current_refresh_scanner.folders if folder not in folders]
+            self.cancel_folder_refresh()
+            if not folders:
+                return
+
+            self.current_refresh_scanner = FolderScanner(
+                folders, self.RT_QComboBox0.currentText(), self.RT_QComboBox2.currentText(),
+                self.simple_mode, self.IMAGE_FORMATS, self.VIDEO_FORMATS, emit_empty=True)
+            self.current_refresh_scanner.signals.folder_scanned.connect(self.on_folder_refreshed)
+            self.current_refresh_scanner.signals.finished.connect(self.on_folder_refresh_finished)
+            self.current_refresh_scanner.signals.error.connect(self.on_folder_refresh_finished)
+            self.threadpool.start(self.current_refresh_scanner)
+        except Exception as e:
+            print(f"[refresh_folders]-->启动增量刷新失败: {e}")
+
+    def refresh_changed_folders(self, folders):
+        """文件操作后刷新指定文件夹，正在监听的文件夹由监听器防抖后统一刷新，不重复扫描"""
+        watched = set(self.folder_watcher.folders())
+        if folders := [folder for folder in folders if os.path.normpath(folder) not in watched]:
+            self.refresh_folders(folders)
+
+    def cancel_folder_refresh(self):
+        """取消当前增量刷新任务"""
+        if self.current_refresh_scanner:
+            self.current_refresh_scanner.stop()
+            self.current_refresh_scanner = None
+
+    def is_current_refresh_scanner(self):
+        """判断信号是否来自当前增量刷新线程"""
+        return self.current_refresh_scanner is not None and self.sender() is self.current_refresh_scanner.signals
+
+    def on_folder_refreshed(self, file_infos, file_paths, dir_name):
+        """单个文件夹重新扫描完成，替换表格中对应的列并保持选中状态；扫描时为空的文件夹出现文件后追加一列"""
+        if not self.is_current_refresh_scanner():
+            return
+        try:
+            if self.removed_from_list_paths:
+                file_infos = [info for info in file_infos if info[-1] not in self.removed_from_list_paths]
+                file_paths = [info[-1] for info in file_infos]
+            if dir_name not in self.dirnames_list:
+                if file_infos:
+                    self.append_folder_column(file_infos, file_paths, dir_name)
+                return
+            col = self.dirnames_list.index(dir_name)
+
+            self.files_list[col] = file_infos
+            self.paths_list[col] = file_paths
+            self.image_index_max[col] = len(file_infos)
+
+            # 未修改的文件保留图标，新增和修改过的文件重新加载图标
+            row_height = 60 if has_file_info_text([file_infos]) else None
+            reload_paths = self.RB_QTableWidget0.replace_files(col, file_infos, row_height)
+            self.statusbar_label0.setText(f"📢:当前选中的文件夹中包含 {self.image_index_max} 张图")
+
+            if reload_paths:
+                if not (self.current_preloader and self.preloading and self.current_preloader.add_paths(reload_paths)):
+                    self.cancel_preloading()
+                    self.start_image_preloading(reload_paths)
+                self.schedule_visible_icon_loading()
+
+        except Exception as e:
+            print(f"[on_folder_refreshed]-->增量更新文件夹 {dir_name} 失败: {e}")
+
+    def on_folder_refresh_finished(self, *args):
+        """增量刷新完成或出错"""
+        if self.is_current_refresh_scanner():
+            self.current_refresh_scanner = None
 
-        
     def start_image_preloading(self, file_paths):
         """开始预加载图片"""
         if self.preloading:
@@ -2297,7 +2420,7 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         
         try:
             # 创建新的预加载器
-            self.current_preloader = ImagePreloader(file_paths)
+            self.current_preloader = ImagePreloader(file_paths, workers=self.preload_workers)
             self.current_preloader.signals.progress.connect(self.update_preload_progress)
             self.current_preloader.signals.batch_loaded.connect(self.on_batch_loaded)
             self.current_preloader.signals.finished.connect(self.on_preload_finished)
@@ -2313,7 +2436,7 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         """取消当前预加载任务"""
         try:
             if self.current_preloader and self.preloading:
-                self.current_preloader._stop = True  # 使用 _stop 属性而不是 stop() 方法
+                self.current_preloader.stop()  # 停止预加载，同时唤醒暂停中的工作线程
                 self.preloading = False
                 self.current_preloader = None
                 
@@ -2327,24 +2450,13 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             self.update_table_icon(path, icon)
             
     def update_table_icon(self, file_path, icon):
-        """更新表格中的指定图标
-        通过先查找行来优化图标更新效率
-        """
-        filename = os.path.basename(file_path)
-        folder = os.path.basename(os.path.dirname(file_path))
-        
-        # 先在每一行中查找文件名
-        for row in range(self.RB_QTableWidget0.rowCount()):
-            # 遍历每一列查找匹配的文件夹
-            for col in range(self.RB_QTableWidget0.columnCount()):
-                header = self.RB_QTableWidget0.horizontalHeaderItem(col)
-                item = self.RB_QTableWidget0.item(row, col)
-                
-                if (header and header.text() == folder and 
-                    item and item.text().split('\n')[0] == filename):
-                    if bool(icon):
-                        item.setIcon(icon)
-                    return  # 找到并更新后直接返回
+        """更新表格中的指定图标，通过表格模型的文件路径索引直接定位单元格；生成失败的单元格做标记，滚动时不再重复加载"""
+        if (cell := self.RB_QTableWidget0.file_model.find_path(file_path)) is None:
+            return
+        if icon:
+            self.RB_QTableWidget0.file_model.set_cell_icon(*cell, icon)
+        else:
+            self.RB_QTableWidget0.file_model.mark_icon_failed(*cell)
 
     def update_preload_progress(self, current, total):
         """处理预加载进度"""
@@ -2353,8 +2465,12 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         
     def on_preload_finished(self):
         """处理预加载完成"""
+        # 只有当前预加载器完成时才重置状态，已取消的旧预加载器发出的信号忽略
+        if self.current_preloader and self.sender() is self.current_preloader.signals:
+            self.preloading = False
+            self.current_preloader = None
         # 打印提示信息
-        print(f"[on_preload_finished]-->所有图标预加载完成,耗时：{time.time()-self.start_time_image_preloading:.2f}秒")
+        print(f"[on_preload_finished]-->所有图标预加载完成,耗时：{time.time()-self.start_time_image_preloading:.2f}秒, 解码级别统计: {IconCache.get_tier_stats()}")
         # 更新状态栏信息显示
         self.statusbar_label1.setText(f"🔉: 图标已全部加载-^-耗时：{time.time()-self.start_time_image_preloading:.2f}秒🍃")
         gc.collect()
@@ -2363,6 +2479,66 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         """处理预加载错误"""
         print(f"[on_preload_error]-->图标预加载错误: {error}")
 
+    def eventFilter(self, obj, event):
+        """监听表格视口尺寸变化，调度可见区域图标加载"""
+        if event.type() == QEvent.Resize and obj is self.RB_QTableWidget0.viewport():
+            self.schedule_visible_icon_loading()
+        return super().eventFilter(obj, event)
+
+    def schedule_visible_icon_loading(self, *args):
+        """表格滚动或尺寸变化时重启定时器，停止滚动后再调度可见区域图标加载"""
+        self.viewport_icon_timer.start()
+
+    def get_visible_rows(self, margin=0):
+        """获取表格可见区域的行范围(含上下margin行)，表格为空返回None"""
+        table = self.RB_QTableWidget0
+        row_count = table.rowCount()
+        if row_count == 0:
+            return None
+        first_row = table.rowAt(0)
+        last_row = table.rowAt(table.viewport().height() - 1)
+        first_row = 0 if first_row < 0 else first_row
+        last_row = row_count - 1 if last_row < 0 else last_row
+        return max(0, first_row - margin), min(row_count - 1, last_row + margin)
+
+    def load_visible_icons(self):
+        """优先加载可见区域(含预加载边距)的图标，并按需释放远离可见区域的图标"""
+        try:
+            if not (visible_rows := self.get_visible_rows(self.icon_prefetch_rows)):
+                return
+            first_row, last_row = visible_rows
+
+            # 按行优先顺序收集可见区域的文件路径
+            file_model = self.RB_QTableWidget0.file_model
+            visible_cells = [(row, col) for row in range(first_row, last_row + 1)
+                             for col in range(file_model.columnCount())
+                             if file_model.file_info(row, col) is not None]
+
+            if self.current_preloader and self.preloading:
+                # 预加载进行中，将可见区域的文件提前到队列最前面
+                self.current_preloader.prioritize([file_model.file_path(*cell) for cell in visible_cells])
+            else:
+                # 预加载已结束(如图标被释放后滚动回来)，只加载缺少图标的文件，生成失败的文件不再重试
+                missing_paths = [file_model.file_path(*cell) for cell in visible_cells
+                                 if file_model.needs_icon(*cell)]
+                if missing_paths:
+                    self.start_image_preloading(missing_paths)
+
+            if self.evict_offscreen_icons:
+                self.evict_far_icons(first_row, last_row)
+
+        except Exception as e:
+            print(f"[load_visible_icons]-->error--加载可见区域图标失败: {e}")
+
+    def evict_far_icons(self, first_row, last_row):
+        """释放距离可见区域超过icon_evict_margin_rows行的图标，图标仍保留在IconCache中"""
+        keep_first = first_row - self.icon_evict_margin_rows
+        keep_last = last_row + self.icon_evict_margin_rows
+        file_model = self.RB_QTableWidget0.file_model
+        for cell in file_model.icon_cells():
+            if not keep_first <= cell[0] <= keep_last:
+                file_model.set_cell_icon(*cell, None)
+
     def RT_QComboBox1_init(self):
         """自定义RT_QComboBox1, 添加复选框选项"""
         print("[RT_QComboBox1_init]-->开始添加地址栏文件夹的同级文件夹到下拉复选框中")
@@ -2600,19 +2776,19 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
         
         table_style = f"""
-            QTableWidget#RB_QTableWidget0 {{
+            QTableView#RB_QTableWidget0 {{
                 /* 表格整体样式 */
                 background-color: {GRAY};
                 color: {FONTCOLOR};
             }}
             
-            QTableWidget#RB_QTableWidget0::item {{
+            QTableView#RB_QTableWidget0::item {{
                 /* 单元格样式 */
                 background-color: {GRAY};
                 color: {FONTCOLOR};
             }}
             
-            QTableWidget#RB_QTableWidget0::item:selected {{
+            QTableView#RB_QTableWidget0::item:selected {{
                 /* 选中单元格样式 */
                 background-color: {BACKCOLOR};
                 color: {FONTCOLOR};
@@ -2630,7 +2806,7 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             }}
             
             /* 修改左上角区域样式 */
-            QTableWidget#RB_QTableWidget0::corner {{
+            QTableView#RB_QTableWidget0::corner {{
                 background-color: {BACKCOLOR};  /* 设置左上角背景色 */
                 color: {FONTCOLOR};
             }}
@@ -2868,19 +3044,19 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
             
             table_style = f"""
-                QTableWidget#RB_QTableWidget0 {{
+                QTableView#RB_QTableWidget0 {{
                     /* 表格整体样式 */
                     background-color: {BLACK};
                     color: {WHITE};
                 }}
                 
-                QTableWidget#RB_QTableWidget0::item {{
+                QTableView#RB_QTableWidget0::item {{
                     /* 单元格样式 */
                     background-color: {GRAY};
                     color: {BLACK};
                 }}
                 
-                QTableWidget#RB_QTableWidget0::item:selected {{
+                QTableView#RB_QTableWidget0::item:selected {{
                     /* 选中单元格样式 */
                     background-color: {BLACK};
                     color: {WHITE};
@@ -3217,6 +3393,8 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
     def cleanup(self):
         """清理资源"""
+        self.cancel_folder_scan()
+        self.cancel_folder_refresh()
         self.cancel_preloading()
         if self.compare_window:
             self.compare_window.deleteLater()
@@ -3290,6 +3468,30 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
 
                     # 恢复拖拽模式状态,默认开启
                     self.drag_flag = settings.get("drag_flag", True)
+
+                    # 恢复预加载图标的并行线程数
+                    self.preload_workers = max(1, int(settings.get("preload_workers", self.preload_workers)))
+
+                    # 恢复是否释放远离可见区域的图标，默认关闭
+                    self.evict_offscreen_icons = settings.get("evict_offscreen_icons", False)
+
+                    # 恢复是否监听文件夹变化并增量更新表格，默认开启
+                    self.watch_folders = settings.get("watch_folders", True)
+
+                    # 恢复看图子界面预取图片组的内存预算
+                    self.compare_prefetch_mb = max(0, int(settings.get("compare_prefetch_mb", self.compare_prefetch_mb)))
+
+                    # 恢复全局任务调度器的工作线程数及是否启用进程池
+                    self.decode_workers = max(0, int(settings.get("decode_workers", self.decode_workers)))
+                    self.decode_process_pool = settings.get("decode_process_pool", False)
+                    configure_scheduler(self.decode_workers, self.decode_process_pool)
+
+                    # 恢复色域转换引擎，无效值时使用LittleCMS
+                    color_engine = settings.get("color_engine", self.color_engine)
+                    self.color_engine = color_engine if color_engine in COLOR_ENGINES else "lcms"
+
+                    # 恢复直方图取样步长
+                    self.histogram_step = max(1, int(settings.get("histogram_step", self.histogram_step)))
             else:
                 # 若没有cache/设置，则在此初始化主题设置--默认主题
                 self.apply_theme()
@@ -3332,7 +3534,29 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
                 "simple_mode": self.simple_mode,
 
                 # 拖拽模式状态
-                "drag_flag": self.drag_flag
+                "drag_flag": self.drag_flag,
+
+                # 预加载图标的并行线程数
+                "preload_workers": self.preload_workers,
+
+                # 是否释放远离可见区域的图标
+                "evict_offscreen_icons": self.evict_offscreen_icons,
+
+                # 是否监听文件夹变化并增量更新表格
+                "watch_folders": self.watch_folders,
+
+                # 看图子界面预取图片组的内存预算(MB)
+                "compare_prefetch_mb": self.compare_prefetch_mb,
+
+                # 全局任务调度器的工作线程数(0为自动)及是否启用进程池
+                "decode_workers": self.decode_workers,
+                "decode_process_pool": self.decode_process_pool,
+
+                # 色域转换引擎(lcms/numpy)
+                "color_engine": self.color_engine,
+
+                # 看图子界面直方图的取样步长
+                "histogram_step": self.histogram_step
 
             }
 
@@ -3358,18 +3582,9 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             row_min, row_max = 0, self.RB_QTableWidget0.rowCount() - 1 
             # 用于存储文件路径和文件索引的列表
             file_paths, current_image_index = [], []  
-            # 判断是否是首次按键
-            if not self.last_key_press:
-                step_row = 0   # 首次按键不移动
-                self.last_key_press = True # 第二次进入设置为True
-            else:
-                # 统计行索引需要移动step
-                if len(set([item.column() for item in selected_items])) == len(selected_items):
-                    # 如果选中项的个数和图片列数相等，则表示是单选，行索引移动step_row = 1
-                    step_row = 1
-                else:
-                    # 如果选中项的个数和图片列数不相等，则表示是多选，行索引移动step_row = 选中项的行索引去重后长度
-                    step_row = len(set([item.row() for item in selected_items]))   
+            # 判断是否是首次按键，首次按键不移动，第二次进入设置为True
+            step_row = self.get_space_and_b_step_row(selected_items)
+            self.last_key_press = True
             
             # 清除所有选中的项
             self.RB_QTableWidget0.clearSelection() 
@@ -3427,6 +3642,53 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             print(f"[press_space_and_b_get_selected_file_paths]-->处理键盘按下事件时发生错误: {e}")
             return [], []
     
+    def get_space_and_b_step_row(self, selected_items):
+        """计算按下space和b键时选中项需要移动的行数"""
+        if not self.last_key_press:
+            return 0   # 首次按键不移动
+        # 统计行索引需要移动step
+        if len(set([item.column() for item in selected_items])) == len(selected_items):
+            # 如果选中项的个数和图片列数相等，则表示是单选，行索引移动step_row = 1
+            return 1
+        # 如果选中项的个数和图片列数不相等，则表示是多选，行索引移动step_row = 选中项的行索引去重后长度
+        return len(set([item.row() for item in selected_items]))
+
+    def predict_space_and_b_file_paths(self, key_type):
+        """预测按下space和b键后将返回的文件路径列表及索引，不修改表格选中状态，供看图子界面预取使用"""
+        try:
+            selected_items = self.RB_QTableWidget0.selectedItems()
+            if not selected_items:
+                return [], []
+
+            step_row = self.get_space_and_b_step_row(selected_items)
+            row_max = self.RB_QTableWidget0.rowCount() - 1
+            image_index_max = self.image_index_max or [self.RB_QTableWidget0.rowCount()] * self.RB_QTableWidget0.columnCount()
+            parent_directory = Path(self.RT_QComboBox.currentText()).parent
+
+            file_paths, current_image_index = [], []
+            for item in selected_items:
+                col_index = item.column()
+                row_index = item.row() + (step_row if key_type == 'space' else -step_row)
+                if row_index > row_max or row_index < 0:
+                    return [], []
+
+                # 与press_space_and_b_get_selected_file_paths保持一致，由单元格文本和列名构建路径
+                target = self.RB_QTableWidget0.item(row_index, col_index)
+                if target and target.text():
+                    file_name = target.text().split('\n')[0]
+                    column_name = self.RB_QTableWidget0.horizontalHeaderItem(col_index).text()
+                    full_path = (parent_directory / column_name / file_name).as_posix()
+                    if os.path.isfile(full_path):
+                        file_paths.append(full_path)
+
+                if row_index + 1 <= image_index_max[col_index]:
+                    current_image_index.append(f"{row_index+1}/{image_index_max[col_index]}")
+
+            return file_paths, current_image_index
+        except Exception as e:
+            print(f"[predict_space_and_b_file_paths]-->预测下一组文件失败: {e}")
+            return [], []
+
     def on_f1_pressed(self):
         """处理F1键按下事件"""
         try:
@@ -3969,6 +4231,8 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         self.rename_tool.setWindowIcon(QIcon(icon_path))
         # 链接关闭事件
         self.rename_tool.closed.connect(self.on_rename_tool_closed) 
+        # 重命名期间暂停文件夹监听，关闭工具后合并为一次增量刷新
+        self.folder_watcher.set_suspended(True)
         self.rename_tool.show()
         self.hide()
 
@@ -4031,7 +4295,15 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
             self.rename_tool.deleteLater()
             self.rename_tool = None
         self.show()
-        self.update_RB_QTableWidget0() # 更新右侧RB_QTableWidget0表格 
+        # 只重新扫描表格中的文件夹，保留未重命名文件的图标；文件夹本身被重命名时全量更新表格
+        # 恢复监听后，重命名期间监听到的变化防抖后合并发出，由监听器触发增量刷新
+        self.folder_watcher.set_suspended(False)
+        current_directory = self.RT_QComboBox.currentText()
+        folders = [os.path.join(os.path.dirname(current_directory), name) for name in self.dirnames_list]
+        if all(os.path.isdir(folder) for folder in folders):
+            self.refresh_changed_folders(folders)
+        else:
+            self.update_RB_QTableWidget0() # 更新右侧RB_QTableWidget0表格 
 
     def on_image_process_window_closed(self):
         """处理图片处理子窗口关闭事件"""
@@ -4060,6 +4332,7 @@ class HiviewerMainwindow(QMainWindow, Ui_MainWindow):
         print("closeEvent()-主界面--关闭事件")
         self.save_settings()  # 保存关闭时基础设置
         self.cleanup()        # 清除内存
+        shutdown_scheduler()  # 取消全局任务调度器中未开始的任务，释放进程池
         print("接受主界面关闭事件, 保存关闭前的配置并清理内存")
         event.accept()
 
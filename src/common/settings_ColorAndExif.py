@@ -27,6 +27,7 @@ def load_exif_settings():
                     "exif_info": bool(1),
                     "roi_info": bool(1),
                     "ai_tips": bool(0),
+                    "roi_sync": bool(0),
                     "p3_color_space": bool(0),
                     "gray_color_space": bool(0),
                     "srgb_color_space": bool(1),
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""看图子界面的分块多分辨率图片项
+
+QGraphicsPixmapItem 需要先把整张图上传为 QPixmap(一亿像素的图片耗时数秒), 之后每次平移、
+同步滚轮缩放都对整张原图做平滑缩放. TiledImageItem 直接使用解码得到的 QImage:
+    - 后台线程逐级生成 1/2、1/4 ... 的降采样层级(金字塔), 最小一级不超过一个分块大小
+    - 绘制时根据当前缩放比例选择层级, 只绘制与可见区域相交的分块, 分块按需转换为 QPixmap 并做LRU缓存
+    - 缩放比例小于1:1时不会生成原图分块, 只有放大超过1:1后才加载原图分块
+层级尚未生成时直接从原图绘制可见区域, 显示结果与 QGraphicsPixmapItem 一致.
+完整图片处理完成前可通过 setPreview() 显示按原图尺寸拉伸的缩略预览图, 布局和缩放比例与完整图片一致.
+"""
+import math
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QObject, QRectF, QRect, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QPainter
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from src.utils.task_scheduler import get_scheduler, PRIORITY_VISIBLE
+
+
+TILE_SIZE = 512                         # 分块边长(像素)
+TILE_CACHE_BYTES = 64 * 1024 * 1024     # 每个图片项缓存的分块内存上限
+
+
+class _PyramidSignals(QObject):
+    """后台线程生成层级后通知主线程"""
+    level_ready = pyqtSignal(int, int, QImage)  # (生成批次, 层级, 层级图像)
+
+
+class TiledImageItem(QGraphicsItem):
+    """分块多分辨率图片项, 接口与 QGraphicsPixmapItem 的常用部分一致(image/setImage 对应 pixmap/setPixmap)"""
+
+    def __init__(self, image=None, owner=None, parent=None):
+        """
+        Args:
+            image (QImage): 原图, 可以是直接包装 numpy 内存的 QImage.
+            owner: image 所引用内存的持有者(如 DecodedImage), 保存引用防止内存被提前释放.
+        """
+        super().__init__(parent)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self._signals = _PyramidSignals()
+        self._signals.level_ready.connect(self._on_level_ready)
+        self._generation = 0
+        self._image = QImage()
+        self._owner = None
+        self._width = self._height = 0
+        self._preview = QImage()        # 缩略预览图, 层级生成完成前用于绘制
+        self._preview_owner = None
+        self._levels = {}               # {层级: QImage}, 层级0为原图
+        self._max_level = 0
+        self._tiles = OrderedDict()     # {(层级, 列, 行): QPixmap}, LRU
+        self._tile_bytes = 0
+        if image is not None:
+            self.setImage(image, owner)
+
+    def image(self):
+        """返回原图"""
+        return self._image
+
+    def setPreview(self, preview, width, height, owner=None):
+        """
+        显示缩略预览图, 图片项尺寸为原图尺寸(width x height), 之后调用 setImage 替换为原图.
+        Args:
+            preview (QImage): 预览图.
+            owner: preview 所引用内存的持有者.
+        """
+        self.prepareGeometryChange()
+        self._generation += 1
+        self._image, self._owner = QImage(), None
+        self._width, self._height = int(width), int(height)
+        self._preview, self._preview_owner = preview if preview is not None else QImage(), owner
+        self._levels = {}
+        self._tiles.clear()
+        self._tile_bytes = 0
+        self._max_level = 0
+        self.update()
+
+    def setImage(self, image, owner=None, keep_preview=False):
+        """
+        替换原图, 清空分块缓存并在后台重新生成层级.
+        Args:
+            keep_preview: 原图与预览图内容一致时为True, 层级生成完成前继续用预览图绘制缩小的画面.
+        """
+        self.prepareGeometryChange()
+        self._generation += 1
+        self._image = image if image is not None else QImage()
+        self._owner = owner
+        self._width, self._height = self._image.width(), self._image.height()
+        self._levels = {0: self._image} if not self._image.isNull() else {}
+        self._tiles.clear()
+        self._tile_bytes = 0
+        self._max_level = 0
+        longest = max(self._image.width(), self._image.height())
+        while longest > TILE_SIZE:
+            longest = (longest + 1) // 2
+            self._max_level += 1
+        if not keep_preview or self._max_level == 0:
+            self._preview, self._preview_owner = QImage(), None
+        if self._max_level > 0:
+            get_scheduler().submit(self._build_levels, self._generation, self._max_level, self._image, self._owner,
+                                   priority=PRIORITY_VISIBLE)
+        self.update()
+
+    def _build_levels(self, generation, max_level, image, owner):
+        """工作线程中逐级降采样生成金字塔, owner 参数保证生成期间原图内存有效"""
+        current = image
+        for level in range(1, max_level + 1):
+            if generation != self._generation:
+                return
+            current = current.scaled(max(1, current.width() // 2), max(1, current.height() // 2),
+                                     Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            # 转换为32位格式, 绘制时无需再转换像素格式
+            if current.format() not in (QImage.Format_RGB32, QImage.Format_Grayscale8):
+                current = current.convertToFormat(QImage.Format_RGB32)
+            try:
+                self._signals.level_ready.emit(generation, level, current)
+            except RuntimeError:
+                return  # 图片项已被销毁
+
+    def _on_level_ready(self, generation, level, image):
+        if generation != self._generation:
+            return
+        self._levels[level] = image
+        if level == self._max_level:
+            # 层级由大到小依次生成, 最小一级完成后不再需要预览图
+            self._preview, self._preview_owner = QImage(), None
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self._width, self._height)
+
+    def _level_for(self, lod):
+        """
+        根据缩放比例选择层级, 只有缩放比例达到1:1及以上时使用原图(第0级).
+        缩小显示时使用第 floor(log2(1/缩放比例)) 级且至少为第1级, 缩放比例在0.5~1之间时也使用二分之一层级,
+        此时层级分辨率略低于屏幕分辨率.
+        """
+        if lod >= 1 or self._max_level == 0:
+            return 0
+        return min(self._max_level, max(1, int(math.floor(math.log2(1 / lod)))))
+
+    def _tile(self, level, col, row):
+        """获取分块QPixmap, 不存在时从层级图像中截取并缓存"""
+        key = (level, col, row)
+        if (pixmap := self._tiles.get(key)) is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        source = self._levels[level]
+        pixmap = QPixmap.fromImage(source.copy(QRect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)))
+        self._tiles[key] = pixmap
+        self._tile_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        while self._tile_bytes > TILE_CACHE_BYTES and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self._tile_bytes -= old.width() * old.height() * old.depth() // 8
+        return pixmap
+
+    def paint(self, painter, option, widget=None):
+        if self._image.isNull() and self._preview.isNull():
+            return
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+        painter.save()
+        # 关闭抗锯齿, 避免分块边缘出现缝隙
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self._level_for(lod)
+        if level not in self._levels:
+            if not self._preview.isNull() and (self._image.isNull() or self._preview.width() >= self._width * lod):
+                # 原图未就绪或预览图分辨率足够时, 从预览图绘制可见区域
+                fx = self._preview.width() / self._width
+                fy = self._preview.height() / self._height
+                source = QRectF(exposed.left() * fx, exposed.top() * fy, exposed.width() * fx, exposed.height() * fy)
+                painter.drawImage(exposed, self._preview, source)
+            else:
+                # 层级尚未生成, 直接从原图绘制可见区域
+                painter.drawImage(exposed, self._image, exposed)
+            painter.restore()
+            return
+
+        source = self._levels[level]
+        fx = self._image.width() / source.width()
+        fy = self._image.height() / source.height()
+        col0 = max(0, int(exposed.left() / fx) // TILE_SIZE)
+        col1 = min((source.width() - 1) // TILE_SIZE, int(exposed.right() / fx) // TILE_SIZE)
+        row0 = max(0, int(exposed.top() / fy) // TILE_SIZE)
+        row1 = min((source.height() - 1) // TILE_SIZE, int(exposed.bottom() / fy) // TILE_SIZE)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                pixmap = self._tile(level, col, row)
+                target = QRectF(col * TILE_SIZE * fx, row * TILE_SIZE * fy, pixmap.width() * fx, pixmap.height() * fy)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        painter.restore()
+
+    def tile_cache_bytes(self):
+        """分块缓存占用的内存字节数"""
+        return self._tile_bytes
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""主界面右侧文件表格的模型/视图实现
+
+FileTableModel 直接使用 FolderScanner 逐列扫描得到的文件信息列表,
+单元格文本和图标在 data() 中按需生成, 不再为每个文件创建 QTableWidgetItem,
+建表耗时与文件夹中的文件数量基本无关.
+
+FileTableView 在 QTableView 的基础上提供与 QTableWidget 相同的常用接口
+(item/selectedItems/horizontalHeaderItem/scrollToItem/itemSelectionChanged等),
+主界面中原有基于 QTableWidgetItem 的逻辑无需修改即可继续使用.
+"""
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QItemSelectionModel, QModelIndex, pyqtSignal)
+from PyQt5.QtGui import QIcon
+
+
+def format_file_info_text(value):
+    """根据文件信息元组生成单元格文本: 文件名称 + (分辨率 曝光时间 ISO)"""
+    width, height = value[4]
+    resolution = " " if width is None and height is None else f"{width}x{height}"
+    exposure_time = " " if value[5] is None else value[5]
+    iso = " " if value[6] is None else value[6]
+    if resolution == " " and exposure_time == " " and iso == " ":
+        return value[0]
+    return value[0] + "\n" + f"{resolution} {exposure_time} {iso}"
+
+
+def has_file_info_text(file_infos_list):
+    """判断文件信息列表中是否存在分辨率/曝光时间/ISO信息(决定行高)"""
+    return any(value[4] != (None, None) or value[5] is not None or value[6] is not None
+               for column in file_infos_list for value in column)
+
+
+class FileTableModel(QAbstractTableModel):
+    """按列组织的文件表格数据模型
+
+    file_infos_list[col][row] 为文件信息元组:
+    (文件名称, 创建时间, 修改时间, 文件大小, (宽, 高), 曝光时间, ISO, 文件路径)
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = []          # 按列组织的文件信息列表
+        self._headers = []          # 列标题(文件夹名)
+        self._row_count = 0
+        self._icons = {}            # {(行, 列): QIcon}
+        self._failed_icons = set()  # 图标生成失败的单元格(行, 列), 滚动时不再重复加载
+        self._texts = {}            # 重命名等操作修改过的单元格文本 {(行, 列): str}
+        self._path_index = None     # {文件路径: (行, 列)}, 首次查找时构建
+
+    def set_files(self, file_infos_list, dir_name_list):
+        """设置表格数据, 只保存各列列表的引用, 不逐个创建单元格"""
+        self.beginResetModel()
+        self._columns = list(file_infos_list or [])
+        self._headers = list(dir_name_list or [])
+        self._row_count = max((len(column) for column in self._columns), default=0)
+        self._icons = {}
+        self._failed_icons = set()
+        self._texts = {}
+        self._path_index = None
+        self.endResetModel()
+
+    def clear(self):
+        """清空表格数据"""
+        self.set_files([], [])
+
+    def append_column(self, file_infos, header):
+        """在表格末尾追加一列, 用于后台扫描逐列填充表格"""
+        col = len(self._columns)
+        self.beginInsertColumns(QModelIndex(), col, col)
+        self._columns.append(file_infos)
+        self._headers.append(header)
+        self._path_index = None
+        self.endInsertColumns()
+
+        # 新列比现有行数多时追加行
+        if len(file_infos) > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, len(file_infos) - 1)
+            self._row_count = len(file_infos)
+            self.endInsertRows()
+
+    def replace_column(self, col, file_infos):
+        """替换一列的文件信息, 用于文件夹变化后的增量更新
+
+        未修改的文件(路径、修改时间、大小都相同)保留已加载的图标及加载失败标记, 其他单元格的图标和修改过的文本丢弃,
+        只在行数变化时插入/删除末尾的行, 其余列不受影响.
+        Returns:
+            list: 需要重新加载图标的文件路径列表
+        """
+        old_column = self._columns[col]
+        old_icons = {}
+        old_failed = set()
+        for row, value in enumerate(old_column):
+            icon = self._icons.pop((row, col), None)
+            if icon is not None:
+                old_icons[value[-1]] = (value[2], value[3], icon)
+            if (row, col) in self._failed_icons:
+                self._failed_icons.discard((row, col))
+                old_failed.add((value[-1], value[2], value[3]))
+            self._texts.pop((row, col), None)
+
+        self._columns[col] = file_infos
+        reload_paths = []
+        for row, value in enumerate(file_infos):
+            cached = old_icons.get(value[-1])
+            if cached is not None and cached[:2] == (value[2], value[3]):
+                self._icons[(row, col)] = cached[2]
+            elif (value[-1], value[2], value[3]) in old_failed:
+                self._failed_icons.add((row, col))
+            else:
+                reload_paths.append(value[-1])
+        self._path_index = None
+
+        # 调整行数
+        row_count = max((len(column) for column in self._columns), default=0)
+        if row_count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, row_count - 1)
+            self._row_count = row_count
+            self.endInsertRows()
+        elif row_count < self._row_count:
+            self.beginRemoveRows(QModelIndex(), row_count, self._row_count - 1)
+            self._row_count = row_count
+            self.endRemoveRows()
+
+        if self._row_count:
+            self.dataChanged.emit(self.index(0, col), self.index(self._row_count - 1, col),
+                                  [Qt.DisplayRole, Qt.DecorationRole])
+        return reload_paths
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else max(len(self._headers), len(self._columns))
+
+    def file_info(self, row, col):
+        """获取单元格对应的文件信息元组, 空单元格返回None"""
+        if 0 <= col < len(self._columns) and 0 <= row < len(self._columns[col]):
+            return self._columns[col][row]
+        return None
+
+    def file_path(self, row, col):
+        """获取单元格对应的文件路径, 空单元格返回None"""
+        value = self.file_info(row, col)
+        return value[-1] if value else None
+
+    def cell_text(self, row, col):
+        """获取单元格文本, 空单元格返回空字符串"""
+        if (row, col) in self._texts:
+            return self._texts[(row, col)]
+        value = self.file_info(row, col)
+        return format_file_info_text(value) if value else ""
+
+    def set_cell_text(self, row, col, text):
+        """修改单元格文本"""
+        self._texts[(row, col)] = text
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def find_path(self, file_path):
+        """查找文件路径所在的单元格(行, 列), 不存在返回None"""
+        if self._path_index is None:
+            self._path_index = {value[-1]: (row, col)
+                                for col, column in enumerate(self._columns)
+                                for row, value in enumerate(column)}
+        return self._path_index.get(file_path)
+
+    def cell_icon(self, row, col):
+        """获取单元格图标, 未加载返回None"""
+        return self._icons.get((row, col))
+
+    def set_cell_icon(self, row, col, icon):
+        """设置单元格图标, 传入None或空图标表示释放该图标"""
+        if icon is None or icon.isNull():
+            if self._icons.pop((row, col), None) is None:
+                return
+        else:
+            self._icons[(row, col)] = icon
+            self._failed_icons.discard((row, col))
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def mark_icon_failed(self, row, col):
+        """标记单元格图标生成失败, 文件未修改前不再重新加载"""
+        self._failed_icons.add((row, col))
+
+    def needs_icon(self, row, col):
+        """单元格是否需要加载图标: 有文件、未加载且未标记失败"""
+        return (self.file_info(row, col) is not None and (row, col) not in self._icons
+                and (row, col) not in self._failed_icons)
+
+    def icon_cells(self):
+        """返回已设置图标的单元格(行, 列)列表"""
+        return list(self._icons)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self.cell_text(row, col) or None
+        if role == Qt.DecorationRole:
+            return self._icons.get((row, col))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid() or self.file_info(index.row(), index.column()) is None:
+            return Qt.NoItemFlags
+        # 禁止编辑
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+
+class FileTableItem:
+    """单元格代理对象, 提供与 QTableWidgetItem 相同的常用接口"""
+
+    __slots__ = ("_view", "_row", "_col")
+
+    def __init__(self, view, row, col):
+        self._view = view
+        self._row = row
+        self._col = col
+
+    def row(self):
+        return self._row
+
+    def column(self):
+        return self._col
+
+    def text(self):
+        return self._view.file_model.cell_text(self._row, self._col)
+
+    def setText(self, text):
+        self._view.file_model.set_cell_text(self._row, self._col, text)
+
+    def icon(self):
+        return self._view.file_model.cell_icon(self._row, self._col) or QIcon()
+
+    def setIcon(self, icon):
+        self._view.file_model.set_cell_icon(self._row, self._col, icon)
+
+    def file_path(self):
+        return self._view.file_model.file_path(self._row, self._col)
+
+    def isSelected(self):
+        return self._view.selectionModel().isSelected(self._view.file_model.index(self._row, self._col))
+
+    def setSelected(self, selected):
+        flag = QItemSelectionModel.Select if selected else QItemSelectionModel.Deselect
+        self._view.selectionModel().select(self._view.file_model.index(self._row, self._col), flag)
+
+
+class FileHeaderItem:
+    """列标题代理对象, 提供与 QTableWidgetItem 相同的 text() 接口"""
+
+    __slots__ = ("_text",)
+
+    def __init__(self, text):
+        self._text = text
+
+    def text(self):
+        return self._text
+
+
+class FileTableView(QTableView):
+    """基于 FileTableModel 的文件表格视图, 兼容 QTableWidget 的常用接口"""
+
+    # 与 QTableWidget.itemSelectionChanged 保持一致
+    itemSelectionChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_model = FileTableModel(self)
+        self.setModel(self.file_model)
+        self.selectionModel().selectionChanged.connect(self.itemSelectionChanged)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        # 统一行高, 不再逐行调用 setRowHeight
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def set_files(self, file_infos_list, dir_name_list, row_height=None):
+        """设置表格数据, row_height 为统一行高"""
+        if row_height:
+            self.verticalHeader().setDefaultSectionSize(row_height)
+        self.file_model.set_files(file_infos_list, dir_name_list)
+
+    def clear(self):
+        """清空表格"""
+        self.file_model.clear()
+
+    def append_files(self, file_infos, header, row_height=None):
+        """追加一列文件, row_height 为统一行高"""
+        if row_height:
+            self.verticalHeader().setDefaultSectionSize(row_height)
+        self.file_model.append_column(file_infos, header)
+
+    def replace_files(self, col, file_infos, row_height=None):
+        """替换一列文件并按文件路径恢复选中状态, 返回需要重新加载图标的文件路径列表"""
+        if row_height:
+            self.verticalHeader().setDefaultSectionSize(row_height)
+
+        selection = self.selectionModel()
+        selected_paths = [self.file_model.file_path(index.row(), index.column())
+                          for index in selection.selectedIndexes()]
+        current_path = self.file_model.file_path(self.currentIndex().row(), self.currentIndex().column())
+
+        reload_paths = self.file_model.replace_column(col, file_infos)
+
+        # 该列的行号已变化, 按文件路径重新选中
+        self.blockSignals(True)
+        selection.blockSignals(True)
+        try:
+            selection.clearSelection()
+            for path in selected_paths:
+                if path and (cell := self.file_model.find_path(path)) is not None:
+                    selection.select(self.file_model.index(*cell), QItemSelectionModel.Select)
+            if current_path and (cell := self.file_model.find_path(current_path)) is not None:
+                selection.setCurrentIndex(self.file_model.index(*cell), QItemSelectionModel.NoUpdate)
+        finally:
+            selection.blockSignals(False)
+            self.blockSignals(False)
+        self.viewport().update()
+
+        # 选中的文件被删除时才通知选中状态变化
+        if any(path and self.file_model.find_path(path) is None for path in selected_paths):
+            self.itemSelectionChanged.emit()
+        return reload_paths
+
+    def rowCount(self):
+        return self.file_model.rowCount()
+
+    def columnCount(self):
+        return self.file_model.columnCount()
+
+    def item(self, row, col):
+        """获取单元格代理对象, 空单元格返回None"""
+        if self.file_model.file_info(row, col) is None:
+            return None
+        return FileTableItem(self, row, col)
+
+    def itemAt(self, pos):
+        """获取坐标处的单元格代理对象"""
+        index = self.indexAt(pos)
+        return self.item(index.row(), index.column()) if index.isValid() else None
+
+    def selectedItems(self):
+        """获取所有选中的单元格代理对象, 按行列排序"""
+        indexes = sorted(self.selectionModel().selectedIndexes(), key=lambda i: (i.row(), i.column()))
+        return [FileTableItem(self, index.row(), index.column()) for index in indexes
+                if self.file_model.file_info(index.row(), index.column()) is not None]
+
+    def horizontalHeaderItem(self, col):
+        """获取列标题代理对象"""
+        text = self.file_model.headerData(col, Qt.Horizontal)
+        return FileHeaderItem(text) if isinstance(text, str) else None
+
+    def scrollToItem(self, item, hint=QAbstractItemView.EnsureVisible):
+        """滚动到指定单元格"""
+        if item is not None:
+            self.scrollTo(self.file_model.index(item.row(), item.column()), hint)
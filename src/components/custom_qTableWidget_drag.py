@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
-from PyQt5.QtWidgets import (QAbstractItemView, QApplication, QTableWidget)
+from PyQt5.QtWidgets import (QAbstractItemView, QApplication)
 from PyQt5.QtCore import (Qt, QTimer, QMimeData, QPoint, QUrl)
 from PyQt5.QtGui import (QPixmap, QPainter, QDrag, QColor, QFont)
 
+from src.components.custom_qTableView_files import FileTableView
 
-class DragTableWidget(QTableWidget):
-    """重写QTableWidget类, 支持拖拽功能"""
+
+class DragTableWidget(FileTableView):
+    """重写FileTableView类, 支持拖拽功能"""
 
     def __init__(self, parent=None):
         super().__init__(parent)
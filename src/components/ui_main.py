@@ -11,6 +11,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 # 导入自定义的QComboBox类 & QDragTableWidget类
 from .custom_qCombox_spinner import CustomComboBox
 from .custom_qTableWidget_drag import DragTableWidget
+from .custom_qTableView_files import FileTableView
 from src.utils.decorator import CC_TimeDec
 
 '''
@@ -308,7 +309,7 @@ class Ui_MainWindow(object):
             # 设置表格的主窗口引用
             self.RB_QTableWidget0.set_main_window(self)
         else:
-            self.RB_QTableWidget0 = QtWidgets.QTableWidget(self.Right_Bottom_QGroupBox)
+            self.RB_QTableWidget0 = FileTableView(self.Right_Bottom_QGroupBox)
 
         self.RB_QTableWidget0.setObjectName("RB_QTableWidget0")
         self.verticalLayout_3.addWidget(self.RB_QTableWidget0)
@@ -1,12 +1,9 @@
 # -*- coding: utf-8 -*-
-import os
-import time
-import json
 import shutil
-import hashlib
 import threading
 from pathlib import Path
-from functools import lru_cache
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import CancelledError
 from typing import Optional, Tuple
 
 # 三方库
@@ -18,6 +15,10 @@ from PyQt5.QtCore import (QRunnable, QObject, pyqtSignal)
 # 自定义模块
 from src.utils.heic import extract_jpg_from_heic
 from src.utils.video import extract_first_frame_from_video
+from src.utils.metadata_index import close_metadata_index
+from src.utils.icon_store import IconStore, make_icon_key
+from src.utils.thumbnail import load_icon_image, TIER_READER, TIER_FULL
+from src.utils.task_scheduler import get_scheduler, PRIORITY_ICON
 from src.view.sub_compare_image_view import pil_to_pixmap
 
 
@@ -39,51 +40,161 @@ class WorkerSignals(QObject):
 
 
 class ImagePreloader(QRunnable):
-    """改进的图片预加载工作线程"""
-    def __init__(self, file_paths):
+    """改进的图片预加载工作线程, 在全局任务调度器中以最低优先级并行生成图标
+    
+    file_paths 已按表格行优先的顺序排列(可见区域在前), 并行生成的图标
+    仍按该顺序分批通过 batch_loaded 信号发出; 表格滚动时可通过 prioritize()
+    将可见区域的文件提前到待加载队列的最前面
+    """
+    def __init__(self, file_paths, workers=1):
         super().__init__()
         self.file_paths = file_paths
+        self.workers = max(1, int(workers))
         self.signals = WorkerSignals()
         self._pause = False
         self._stop = False
         self._pause_condition = threading.Event()
         self._pause_condition.set()  # 初始状态为未暂停
+        self._queue = deque(path for path in file_paths if path)  # 待生成图标的文件路径队列, 启动前即可追加和调整顺序
+        self._queue_lock = threading.Lock()
+        self._closed = False         # 队列已关闭，不再接受追加的文件
+        self._total = len(file_paths)
         
     def pause(self):
-        """暂停预加载"""
+        """暂停预加载, 取消已提交到调度器但尚未开始的图标任务, 运行循环将其放回队列, 恢复后重新提交"""
         self._pause = True
         self._pause_condition.clear()
+        get_scheduler().cancel(self)
 
     def resume(self):
         """恢复预加载"""
         self._pause = False
         self._pause_condition.set()
+
+    def stop(self):
+        """停止预加载, 同时唤醒处于暂停状态的工作线程使其退出"""
+        self._stop = True
+        with self._queue_lock:
+            self._closed = True
+        self._pause_condition.set()
+        # 取消已提交到调度器但尚未开始的图标任务
+        get_scheduler().cancel(self)
+
+    def add_paths(self, file_paths):
+        """向运行中的预加载器追加文件, 预加载器已结束或已停止时返回False"""
+        with self._queue_lock:
+            if self._closed:
+                return False
+            file_paths = [path for path in file_paths if path]
+            self._queue.extend(file_paths)
+            self._total += len(file_paths)
+            return True
+
+    def _close_if_empty(self):
+        """队列为空时关闭队列, 返回是否已关闭"""
+        with self._queue_lock:
+            if not self._queue:
+                self._closed = True
+            return self._closed
+
+    def prioritize(self, file_paths):
+        """将仍在待加载队列中的文件按传入顺序移动到队列最前面, 已提交或已完成的文件忽略"""
+        with self._queue_lock:
+            queued = set(self._queue)
+            front = [path for path in dict.fromkeys(file_paths) if path in queued]
+            if not front:
+                return
+            front_set = set(front)
+            self._queue = deque(front + [path for path in self._queue if path not in front_set])
+
+    def _next_path(self):
+        """从待加载队列头部取出下一个文件路径, 队列为空返回None"""
+        with self._queue_lock:
+            return self._queue.popleft() if self._queue else None
+
+    def _load_icon(self, file_path):
+        """调度器工作线程中生成单个图标, 取消后直接返回None"""
+        if self._stop:
+            return None
+        return IconCache.get_icon(file_path)  # 使用缓存系统获取图标
         
     def run(self):
         try:
-            total = len(self.file_paths)
             batch = []
             batch_size = 10
-            
-            for i, file_path in enumerate(self.file_paths):
+            loaded = 0
+
+            # 先从图标存储中一次性批量取出已缓存的图标，表格可以立即填充
+            cached_icons = IconCache.get_cached_icons(self.file_paths)
+            for file_path, icon in cached_icons.items():
                 if self._stop:
                     break
-                    
-                # 使用 Event 来实现暂停
-                self._pause_condition.wait()
-                    
-                if file_path:
-                    icon = IconCache.get_icon(file_path)  # 使用缓存系统获取图标
+                batch.append((file_path, icon))
+                loaded += 1
+                if len(batch) >= batch_size:
+                    self.signals.batch_loaded.emit(batch)
+                    self.signals.progress.emit(loaded, self._total)
+                    batch = []
+            if cached_icons:
+                self.signals.progress.emit(loaded, self._total)
+
+            # 已缓存的文件移出队列，需要生成的文件保持队列中的顺序
+            if cached_icons:
+                with self._queue_lock:
+                    self._queue = deque(path for path in self._queue if path not in cached_icons)
+
+            # 滑动窗口提交任务，按提交顺序取结果，既能并行生成又能保证发出顺序
+            # 任务提交到全局调度器，优先级低于看图子界面的解码任务，同时提交的图标任务不超过workers*2个
+            window = self.workers * 2
+            scheduler = get_scheduler()
+            futures = deque()
+            try:
+                while not self._stop:
+                    # 使用 Event 来实现暂停, 暂停期间不再提交新任务
+                    self._pause_condition.wait()
+                    while len(futures) < window and (file_path := self._next_path()) is not None:
+                        futures.append((file_path, scheduler.submit(self._load_icon, file_path, priority=PRIORITY_ICON, tag=self)))
+                    if not futures:
+                        if self._close_if_empty():
+                            break
+                        continue
+
+                    file_path, future = futures.popleft()
+                    try:
+                        icon = future.result()
+                    except CancelledError:
+                        if self._stop:
+                            break
+                        # 暂停时被取消的任务按原顺序放回队列头部, 已开始的任务继续等待结果
+                        pending, requeue = [(file_path, future)] + list(futures), []
+                        futures.clear()
+                        for path, pending_future in pending:
+                            if pending_future.cancel():
+                                requeue.append(path)
+                            else:
+                                futures.append((path, pending_future))
+                        with self._queue_lock:
+                            self._queue.extendleft(reversed(requeue))
+                        continue
+                    if self._stop:
+                        break
                     batch.append((file_path, icon))
+                    loaded += 1
                     
                     if len(batch) >= batch_size:
                         self.signals.batch_loaded.emit(batch)
                         batch = []
+                        # 按批次将新生成的图标写入存储
+                        IconCache.flush()
                         
-                    self.signals.progress.emit(i + 1, total)
+                    self.signals.progress.emit(loaded, self._total)
+            finally:
+                for _, future in futures:
+                    future.cancel()
                     
-            if batch:  # 发送最后的批次
+            if batch and not self._stop:  # 发送最后的批次
                 self.signals.batch_loaded.emit(batch)
+            IconCache.flush()
                 
             self.signals.finished.emit()
             
@@ -93,11 +204,20 @@ class ImagePreloader(QRunnable):
 
 class IconCache:
     """图标缓存类"""
-    _cache = {}
+    _cache = OrderedDict()                                     # 内存缓存, 键为(路径, 修改时间ns, 文件大小)
+    _cache_lock = threading.Lock()
     _cache_base_dir = BASEICONPATH / "cache"
-    _cache_dir = BASEICONPATH / "cache" / "icons"
-    _cache_index_file = BASEICONPATH / "cache" / "icons.json"
-    _max_cache_size = 1000  # 最大缓存数量，超过会删除最旧的缓存
+    _cache_db_file = BASEICONPATH / "cache" / "icons.db"       # 单文件图标存储
+    _legacy_cache_dir = BASEICONPATH / "cache" / "icons"       # 旧版本每个图标一张PNG的缓存目录
+    _legacy_cache_index_file = BASEICONPATH / "cache" / "icons.json"
+    _max_cache_size = 10000     # 图标存储最大缓存数量，超过会按最近访问时间删除最旧的缓存
+    _max_memory_size = 2000     # 内存缓存最大数量
+    _store = None               # IconStore实例，首次使用时创建
+    _store_lock = threading.Lock()
+    _pending = []               # 待批量写入存储的图标 [(key, png_bytes)]
+    _pending_batch_size = 50    # 待写入数量达到该值时自动写入
+    _icon_tiers = OrderedDict() # 每个文件生成图标时使用的解码级别 {文件路径: 级别}
+    _tier_stats = Counter()     # 各解码级别的使用次数
     # 视频文件格式
     VIDEO_FORMATS = ('.mp4', '.avi', '.mov', '.wmv', '.mpeg', '.mpg', '.mkv') 
     # 图片文件格式
@@ -109,29 +229,26 @@ class IconCache:
     }
 
     @classmethod
-    @lru_cache(maxsize=_max_cache_size) # 使用LRU缓存策略替代简单的时间戳排序,该策略如何手动清除缓存？使用cls.get_icon.cache_clear()
     def get_icon(cls, file_path):
-        """获取图标，优先从缓存获取"""
+        """获取图标，优先从内存缓存获取，其次从图标存储获取，最后生成新图标"""
         try:
+            key = make_icon_key(file_path)
+
             # 检查内存缓存
-            if file_path in cls._cache:
-                # print("获取图标, 进入读缓存")
-                return cls._cache[file_path]
-
-            # 检查文件缓存
-            cache_path = cls._get_cache_path(file_path)
-            if Path(cache_path).exists():
-                # print("获取图标, 进入文件缓存")
-                icon = QIcon(cache_path)
-                cls._cache[file_path] = icon
+            if (icon := cls._get_memory(key)) is not None:
                 return icon
 
+            # 检查图标存储
+            if data := cls._get_store().get(key):
+                if (icon := cls._icon_from_bytes(data)) is not None:
+                    cls._set_memory(key, icon)
+                    return icon
+
             # 生成新图标 
             icon = cls._generate_icon(file_path)
             if icon:
-                # print("获取图标, 进入生成新图标")
-                cls._cache[file_path] = icon
-                cls._save_to_cache(file_path, icon)
+                cls._set_memory(key, icon)
+                cls._save_to_cache(key, icon)
             
             return icon
 
@@ -139,12 +256,106 @@ class IconCache:
             print(f"获取图标失败: {e}")
             return QIcon()
 
-    # 在_get_cache_path方法中添加文件修改时间校验
     @classmethod
-    def _get_cache_path(cls, file_path):
-        file_stat = os.stat(file_path)
-        file_hash = hashlib.md5(f"{file_path}-{file_stat.st_mtime}".encode()).hexdigest()
-        return str(cls._cache_dir / f"{file_hash}.png")
+    def get_cached_icons(cls, file_paths):
+        """批量获取已缓存的图标，只查询一次图标存储
+
+        Args:
+            file_paths: 文件路径列表，允许包含None
+            
+        Returns:
+            dict: {文件路径: QIcon}，只包含命中缓存的文件，顺序与file_paths一致
+        """
+        result, missing = {}, {}
+        for file_path in file_paths:
+            if not file_path:
+                continue
+            try:
+                key = make_icon_key(file_path)
+            except OSError:
+                continue
+            if (icon := cls._get_memory(key)) is not None:
+                result[file_path] = icon
+            else:
+                missing[key] = file_path
+
+        if missing:
+            stored = cls._get_store().get_many(missing.keys())
+            for key, data in stored.items():
+                if (icon := cls._icon_from_bytes(data)) is not None:
+                    cls._set_memory(key, icon)
+                    result[missing[key]] = icon
+
+        # 按传入顺序返回，保证表格按行填充
+        return {path: result[path] for path in file_paths if path in result}
+
+    @classmethod
+    def _get_memory(cls, key):
+        """从内存缓存中获取图标并刷新其LRU位置"""
+        with cls._cache_lock:
+            icon = cls._cache.get(key)
+            if icon is not None:
+                cls._cache.move_to_end(key)
+            return icon
+
+    @classmethod
+    def _set_memory(cls, key, icon):
+        """写入内存缓存，超过 _max_memory_size 时删除最久未使用的图标"""
+        with cls._cache_lock:
+            cls._cache[key] = icon
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls._max_memory_size:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def _record_tier(cls, file_path, tier):
+        """记录生成图标时使用的解码级别"""
+        with cls._cache_lock:
+            cls._icon_tiers[file_path] = tier
+            cls._icon_tiers.move_to_end(file_path)
+            while len(cls._icon_tiers) > cls._max_memory_size:
+                cls._icon_tiers.popitem(last=False)
+            cls._tier_stats[tier] += 1
+
+    @classmethod
+    def get_icon_tier(cls, file_path):
+        """获取文件生成图标时使用的解码级别，embedded/draft/reader/full，未生成过返回None"""
+        with cls._cache_lock:
+            return cls._icon_tiers.get(file_path)
+
+    @classmethod
+    def get_tier_stats(cls):
+        """获取各解码级别的使用次数统计"""
+        with cls._cache_lock:
+            return dict(cls._tier_stats)
+
+    @classmethod
+    def _get_store(cls):
+        """获取图标存储实例，首次使用时创建并清理旧版本的PNG缓存"""
+        with cls._store_lock:
+            if cls._store is None:
+                if cls._legacy_cache_dir.exists():
+                    shutil.rmtree(cls._legacy_cache_dir, ignore_errors=True)
+                if cls._legacy_cache_index_file.exists():
+                    cls._legacy_cache_index_file.unlink(missing_ok=True)
+                cls._store = IconStore(cls._cache_db_file, max_entries=cls._max_cache_size)
+            return cls._store
+
+    @staticmethod
+    def _icon_to_bytes(icon):
+        """将图标编码为PNG字节流"""
+        buffer = QtCore.QBuffer()
+        buffer.open(QtCore.QIODevice.WriteOnly)
+        icon.pixmap(48, 48).toImage().save(buffer, "PNG")
+        return bytes(buffer.data())
+
+    @staticmethod
+    def _icon_from_bytes(data):
+        """将PNG字节流解码为图标，失败返回None"""
+        image = QImage()
+        if not image.loadFromData(data, "PNG"):
+            return None
+        return QIcon(QPixmap.fromImage(image))
 
     @classmethod
     def _generate_icon(cls, file_path):
@@ -166,11 +377,6 @@ class IconCache:
             
             # 图片文件处理
             elif file_ext in cls.IMAGE_FORMATS:
-                # HEIC文件处理,自动转换为jpg格式
-                if file_ext == ".heic":
-                    if new_path:= extract_jpg_from_heic(file_path):
-                        file_path = new_path
-                
                 return cls._generate_image_icon(file_path)
             
             # 其它文件类型
@@ -192,7 +398,19 @@ class IconCache:
         Returns:
             QIcon: 处理后的图标对象
         """
+        source_path = file_path
         try:
+            # 方案零：优先使用内嵌缩略图，其次JPEG的DCT缩放解码，避免完整解码大图
+            image, tier = load_icon_image(file_path, (48, 48))
+            if image is not None and bool(pixmap := pil_to_pixmap(image)):
+                cls._record_tier(source_path, tier)
+                return QIcon(pixmap)
+
+            # HEIC文件处理,没有内嵌缩略图时自动转换为jpg格式
+            if Path(file_path).suffix.lower() == ".heic":
+                if new_path:= extract_jpg_from_heic(file_path):
+                    file_path = new_path
+
             # 方案一：使用QImageReader高效加载
             reader = QImageReader(file_path)
             reader.setAutoTransform(True)     # 设置自动转换（处理EXIF方向信息）
@@ -222,11 +440,13 @@ class IconCache:
             # 尝试读取图像
             if bool(img := reader.read()):
                 pixmap = QPixmap.fromImage(img)
+                cls._record_tier(source_path, TIER_READER)
                 return QIcon(pixmap)
             
             # 方案二：使用PIL 加载，ImageOps.exif_transpose自动处理EXIF方向信息
             with Image.open(file_path) as img:
                 if bool(pixmap := pil_to_pixmap(img)):
+                    cls._record_tier(source_path, TIER_FULL)
                     return QIcon(pixmap)
 
         except Exception as e:
@@ -341,55 +561,44 @@ class IconCache:
 
 
     @classmethod
-    def _save_to_cache(cls, file_path, icon):
-        """保存图标到缓存"""
+    def _save_to_cache(cls, key, icon):
+        """将图标加入待写入队列，达到批量大小时写入图标存储"""
         try:
-            # 确保缓存目录存在
-            cls._cache_dir.mkdir(parents=True, exist_ok=True)
-
-            # 保存图标
-            cache_path = cls._get_cache_path(file_path)
-            icon.pixmap(48, 48).save(cache_path, "PNG")
-
-            # 更新索引文件
-            cls._update_cache_index(file_path)
+            data = cls._icon_to_bytes(icon)
+            with cls._cache_lock:
+                cls._pending.append((key, data))
+                need_flush = len(cls._pending) >= cls._pending_batch_size
+            if need_flush:
+                cls.flush()
 
         except Exception as e:
             print(f"保存图标缓存失败: {e}")
-            
-    @classmethod
-    def _update_cache_index(cls, file_path):
-        """更新缓存索引"""
-        try:
-            # 读取现有索引
-            index = {}
-            if cls._cache_index_file.exists():
-                with open(cls._cache_index_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    index = json.load(f)
-
-            # 更新索引
-            cache_path = cls._get_cache_path(file_path)
-            index[cache_path] = {
-                'original_path': file_path,
-                'timestamp': time.time()
-            }
-
-            # 保存索引
-            with open(cls._cache_index_file, 'w', encoding='utf-8', errors='ignore') as f:
-                json.dump(index, f, ensure_ascii=False, indent=4)
 
-        except Exception as e:
-            print(f"更新缓存索引失败: {e}")
+    @classmethod
+    def flush(cls):
+        """将待写入队列中的图标批量写入图标存储"""
+        with cls._cache_lock:
+            pending, cls._pending = cls._pending, []
+        if pending:
+            cls._get_store().put_many(pending)
 
     @classmethod
     def clear_cache(cls):
         """清理本地中的缓存"""
         try:
-            # 清除lru_cache的缓存
-            cls.get_icon.cache_clear()  
-
-            # 清理内存缓存
-            cls._cache.clear()
+            # 清理内存缓存及待写入队列
+            with cls._cache_lock:
+                cls._cache.clear()
+                cls._pending.clear()
+                cls._icon_tiers.clear()
+                cls._tier_stats.clear()
+
+            # 关闭图标存储的数据库连接，否则无法删除数据库文件
+            with cls._store_lock:
+                if cls._store is not None:
+                    cls._store.close()
+                    cls._store = None
+            close_metadata_index()
 
             # 清理文件缓存
             if cls._cache_base_dir.exists():
@@ -0,0 +1,153 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :color_engine.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :矩阵/TRC类型ICC配置文件之间的NumPy/OpenCV色域转换引擎
+
+ImageCms(LittleCMS)转换整张全分辨率图片时全程持有GIL, 多张图片只能串行转换.
+sRGB、Display-P3、DCI-P3、Rec2020(resource/icc)以及手机相机内嵌的配置文件大多只由
+rXYZ/gXYZ/bXYZ 三个原色和 rTRC/gTRC/bTRC 三条色调响应曲线组成, 两个这样的配置文件之间的转换可以拆成:
+    8位输入 --解码LUT(256项)--> 源RGB线性值 --3x3矩阵--> 目标RGB线性值 --开方--> 编码LUT(65536项) --> 8位输出
+LUT查表和矩阵乘法由 cv2.LUT / cv2.transform / numpy 完成, 计算期间释放GIL, 并按行分块控制中间结果的内存,
+分块可交给全局任务调度器并行执行. 含A2B/B2A查找表的配置文件及绝对色度意图仍由LittleCMS转换.
+'''
+
+import struct
+
+import cv2
+import numpy as np
+
+from src.utils.task_scheduler import get_scheduler, PRIORITY_VISIBLE
+
+BAND_ROWS = 256             # 每个分块的行数, 中间结果为 BAND_ROWS x 宽 x 3 的float32
+ENCODE_LUT_SIZE = 65536     # 编码LUT的项数, 按线性值的平方根均匀量化, 伽马2.6等暗部斜率很大的曲线也不超过1个色阶
+
+
+class UnsupportedProfileError(ValueError):
+    """配置文件不是矩阵/TRC类型, 需要由LittleCMS转换"""
+
+
+def _s15fixed16(data, offset, count):
+    """读取ICC的 s15Fixed16Number 数组"""
+    return np.array(struct.unpack_from(f'>{count}i', data, offset), dtype=np.float64) / 65536.0
+
+
+def _parse_curve(tag):
+    """解析 curv/para 类型的色调响应曲线, 返回 编码值[0,1] -> 线性值[0,1] 的函数"""
+    kind = tag[:4]
+    if kind == b'curv':
+        count = struct.unpack_from('>I', tag, 8)[0]
+        if count == 0:
+            return lambda x: x
+        if count == 1:
+            gamma = struct.unpack_from('>H', tag, 12)[0] / 256.0
+            return lambda x: np.power(x, gamma)
+        table = np.array(struct.unpack_from(f'>{count}H', tag, 12), dtype=np.float64) / 65535.0
+        grid = np.linspace(0.0, 1.0, count)
+        return lambda x: np.interp(x, grid, table)
+    if kind == b'para':
+        function_type = struct.unpack_from('>H', tag, 8)[0]
+        param_count = {0: 1, 1: 3, 2: 4, 3: 5, 4: 7}.get(function_type)
+        if param_count is None:
+            raise UnsupportedProfileError(f"不支持的参数曲线类型: {function_type}")
+        params = list(_s15fixed16(tag, 12, param_count))
+        # 统一为类型4的形式: X >= d 时 Y = (aX+b)^g + e, 否则 Y = cX + f
+        if function_type == 0:
+            g, a, b, c, d, e, f = params[0], 1.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        elif function_type == 1:
+            g, a, b = params
+            c, d, e, f = 0.0, -b / a, 0.0, 0.0
+        elif function_type == 2:
+            g, a, b, offset = params
+            c, d, e, f = 0.0, -b / a, offset, offset
+        elif function_type == 3:
+            g, a, b, c, d = params
+            e = f = 0.0
+        else:
+            g, a, b, c, d, e, f = params
+        return lambda x: np.where(x >= d, np.power(np.maximum(a * x + b, 0.0), g) + e, c * x + f)
+    raise UnsupportedProfileError(f"不支持的曲线类型: {kind!r}")
+
+
+class MatrixTRCProfile:
+    """矩阵/TRC类型的RGB配置文件: 每通道的色调响应曲线及 RGB线性值 -> XYZ(D50) 的3x3矩阵"""
+
+    def __init__(self, data: bytes):
+        """
+        Args:
+            data: ICC配置文件的字节内容.
+        Raises:
+            UnsupportedProfileError: 不是RGB色彩空间、含查找表或缺少矩阵/曲线标签.
+        """
+        if len(data) < 132 or data[16:20] != b'RGB ' or data[20:24] != b'XYZ ':
+            raise UnsupportedProfileError("只支持RGB色彩空间、XYZ连接空间的配置文件")
+        tags = {}
+        for i in range(struct.unpack_from('>I', data, 128)[0]):
+            signature, offset, size = struct.unpack_from('>4sII', data, 132 + 12 * i)
+            tags[signature] = data[offset:offset + size]
+        # 含查找表的配置文件, LittleCMS会优先使用查找表而不是矩阵, 这里不处理
+        if any(signature in tags for signature in (b'A2B0', b'A2B1', b'A2B2', b'B2A0', b'B2A1', b'B2A2')):
+            raise UnsupportedProfileError("配置文件包含A2B/B2A查找表")
+        try:
+            # 三个原色的XYZ作为矩阵的三列, v4配置文件中已适配到D50
+            self.matrix = np.stack([_s15fixed16(tags[sig], 8, 3) for sig in (b'rXYZ', b'gXYZ', b'bXYZ')], axis=1)
+            self.curves = [_parse_curve(tags[sig]) for sig in (b'rTRC', b'gTRC', b'bTRC')]
+        except KeyError as e:
+            raise UnsupportedProfileError(f"缺少矩阵/曲线标签: {e}")
+
+
+class MatrixTRCTransform:
+    """两个矩阵/TRC配置文件之间的8位RGB转换, 结果与LittleCMS的相对色度(感知/饱和度)意图一致, 误差不超过1个色阶"""
+
+    def __init__(self, src: MatrixTRCProfile, dst: MatrixTRCProfile):
+        # 解码LUT: 8位编码值 -> 源RGB线性值, 形状为 1x256x3 供 cv2.LUT 使用
+        x = np.arange(256, dtype=np.float64) / 255.0
+        self.decode_lut = np.stack([curve(x) for curve in src.curves], axis=-1).astype(np.float32).reshape(1, 256, 3)
+
+        # 源RGB线性值 -> XYZ(D50) -> 目标RGB线性值
+        self.matrix = (np.linalg.inv(dst.matrix) @ src.matrix).astype(np.float32)
+
+        # 编码LUT: sqrt(目标RGB线性值)(16位量化) -> 8位编码值, 三个通道首尾相接, 通道c的下标加上 c*ENCODE_LUT_SIZE
+        # 直接按线性值量化时, 纯幂函数曲线在0附近的一个量化步长就对应数个8位色阶
+        grid = np.linspace(0.0, 1.0, ENCODE_LUT_SIZE)
+        luts = []
+        for curve in dst.curves:
+            forward = np.maximum.accumulate(np.clip(curve(grid), 0.0, 1.0))
+            luts.append(np.round(np.interp(grid * grid, forward, grid) * 255.0))
+        self.encode_lut = np.concatenate(luts).astype(np.uint8)
+        self._channel_offsets = np.arange(3, dtype=np.int32) * ENCODE_LUT_SIZE
+
+    def _apply_band(self, rgb, out):
+        linear = cv2.transform(cv2.LUT(rgb, self.decode_lut), self.matrix)
+        np.clip(linear, 0.0, 1.0, out=linear)
+        cv2.sqrt(linear, linear)
+        linear *= ENCODE_LUT_SIZE - 1
+        linear += 0.5
+        index = linear.astype(np.int32)
+        index += self._channel_offsets
+        np.take(self.encode_lut, index, out=out, mode='clip')
+
+    def apply(self, rgb: np.ndarray, out: np.ndarray = None, parallel: bool = False) -> np.ndarray:
+        """
+        转换 HxWx3 的 uint8 RGB 数组.
+        Args:
+            rgb: 输入图像.
+            out: 输出数组, 默认新建; 可以传入 rgb 本身原地转换.
+            parallel: 是否将各行分块提交到全局任务调度器并行转换.
+        Returns:
+            np.ndarray: 转换后的数组(out).
+        """
+        if rgb.ndim != 3 or rgb.shape[2] != 3 or rgb.dtype != np.uint8:
+            raise ValueError(f"只支持 HxWx3 的 uint8 数组, 传入: {rgb.shape} {rgb.dtype}")
+        if out is None:
+            out = np.empty_like(rgb)
+        bands = [slice(y, min(y + BAND_ROWS, rgb.shape[0])) for y in range(0, rgb.shape[0], BAND_ROWS)]
+        run = lambda band: self._apply_band(rgb[band], out[band])
+        if parallel:
+            get_scheduler().map(run, bands, priority=PRIORITY_VISIBLE, caller_runs=True)
+        else:
+            for band in bands:
+                run(band)
+        return out
@@ -0,0 +1,173 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :compare_prefetch.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :看图子界面按组预取图片处理结果, 按内存预算做LRU淘汰
+
+看图子界面按下空格/B键切换图片组时, 需要对每张图片解码、色域转换、计算直方图并生成pixmap,
+GroupPrefetcher 以 PRIORITY_PREFETCH 优先级向全局任务调度器提交预测的上一组/下一组图片, 切换时直接取用处理结果;
+不再单独创建线程池, 组内的解码任务由执行该组的工作线程参与执行(map 的 caller_runs), 不会阻塞等待.
+缓存条目以组为单位, 超出内存预算时淘汰最久未使用的组, 当前显示的组(set_displayed)的缓冲区仍被视图引用, 不参与淘汰;
+用户切换到其它图片组后, 不再相邻的组的预取任务会被取消.
+'''
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+from src.utils.task_scheduler import get_scheduler, PRIORITY_PREFETCH
+
+
+def make_group_key(paths: Sequence[str], index_list: Sequence[str], extra: Hashable = None) -> tuple:
+    """构建图片组的缓存键, 包含文件修改时间, 文件被修改后自动失效"""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(-1)
+    return tuple(paths), tuple(index_list or ()), tuple(mtimes), extra
+
+
+class GroupPrefetcher:
+    """图片组预取缓存类, 只应在主线程中调用其方法"""
+
+    def __init__(self, process_group: Callable[[List[str], List[str]], list],
+                 size_of: Callable[[list], int], budget_bytes: int,
+                 cancel: Optional[Callable[[Hashable], object]] = None):
+        """
+        Args:
+            process_group: 处理一组图片的函数 process_group(图片路径列表, 图片索引列表, *args) -> 处理结果列表.
+            size_of: 估算一组处理结果占用内存字节数的函数.
+            budget_bytes: 缓存的内存预算, 为0时不预取.
+            cancel: 丢弃某一组时调用 cancel(key), 用于取消该组已提交到任务调度器的子任务.
+        """
+        self._process_group = process_group
+        self._size_of = size_of
+        self._cancel = cancel
+        self.budget_bytes = budget_bytes
+        self._closed = False
+        self._entries = OrderedDict()   # {key: Future}, 按最近使用排序
+        self._sizes = {}                # {key: 字节数}, 只记录已完成的组
+        self._displayed = None          # 当前显示的组, 其缓冲区被视图引用, 淘汰不释放内存
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0 and not self._closed
+
+    def get(self, key) -> Optional[list]:
+        """获取一组处理结果, 正在后台处理时等待其完成, 未缓存返回None"""
+        with self._lock:
+            future = self._entries.get(key)
+            if future is None:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"[GroupPrefetcher.get]-->error: 预取图片组失败: {e}")
+            with self._lock:
+                self._discard(key)
+            return None
+
+    def peek(self, key) -> Optional[Future]:
+        """获取一组处理结果的Future, 不等待后台处理完成, 未缓存返回None"""
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+            return future
+
+    def set_displayed(self, key) -> None:
+        """设置当前显示的组, 该组在切换到其它组之前不被淘汰; 之前显示的组恢复为可淘汰并按预算淘汰"""
+        with self._lock:
+            self._displayed = key
+            self._evict()
+
+    def put(self, key, results: list) -> None:
+        """缓存当前显示的一组处理结果, 回退到该组时无需重新处理"""
+        if not self.enabled or not results:
+            return
+        future = Future()
+        future.set_result(results)
+        with self._lock:
+            self._entries[key] = future
+            self._entries.move_to_end(key)
+            self._sizes[key] = self._size_of(results)
+            self._evict(protected=(key,))
+
+    def request(self, key, paths: List[str], index_list: List[str], *args) -> None:
+        """请求后台预取一组图片, 已缓存或正在处理时直接返回, args 原样传给 process_group"""
+        if not self.enabled or not paths:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            # 以组的键作为标签, 丢弃该组时尚未开始的任务一并取消
+            future = get_scheduler().submit(self._process_group, list(paths), list(index_list or []), *args,
+                                            priority=PRIORITY_PREFETCH, tag=key)
+            self._entries[key] = future
+        future.add_done_callback(lambda f, key=key: self._on_done(key, f))
+
+    def _on_done(self, key, future: Future) -> None:
+        """预取完成, 记录内存占用并执行淘汰"""
+        if future.cancelled():
+            return
+        with self._lock:
+            if self._entries.get(key) is not future:
+                return
+            if future.exception() is not None:
+                self._discard(key)
+                return
+            self._sizes[key] = self._size_of(future.result())
+            self._evict(protected=(key,))
+
+    def retain(self, keys: Sequence) -> None:
+        """取消不在 keys 中且尚未完成的预取任务, 用户切换图片组后调用, 已完成的组保留在缓存中"""
+        keep = set(keys)
+        with self._lock:
+            for key, future in list(self._entries.items()):
+                if key not in keep and not future.done():
+                    self._discard(key)
+
+    def _evict(self, protected: Tuple = ()) -> None:
+        """按最近使用顺序淘汰已完成的组, 直到总内存不超过预算, 调用方需持有锁"""
+        total = sum(self._sizes.values())
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            if key in protected or key == self._displayed or key not in self._sizes:
+                continue
+            total -= self._sizes[key]
+            self._discard(key)
+
+    def _discard(self, key) -> None:
+        future = self._entries.pop(key, None)
+        self._sizes.pop(key, None)
+        if future is not None and not future.done():
+            future.cancel()
+            if self._cancel is not None:
+                self._cancel(key)
+
+    def memory_usage(self) -> int:
+        """返回已缓存的组占用的内存字节数"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def clear(self) -> None:
+        """清空缓存, 取消未开始的预取任务"""
+        with self._lock:
+            self._displayed = None
+            for key in list(self._entries):
+                self._discard(key)
+
+    def shutdown(self) -> None:
+        """清空缓存并停止预取, 不等待正在处理的任务"""
+        self.clear()
+        self._closed = True
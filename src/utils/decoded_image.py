@@ -0,0 +1,159 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :decoded_image.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :看图子界面的解码图像容器, PIL/NumPy/QImage 共享同一块连续内存
+
+原流程中每张图片同时持有 PIL 图像、pil_to_pixmap 中的 numpy 副本、RGB->BGR 的 cv_img 副本以及计算直方图时展平的灰度副本,
+8张5000万像素的图片会占用数GB内存. DecodedImage 解码后只保留一块 HxWx3 的 RGB 连续内存:
+    - rgb: 只读的 numpy 视图
+    - qimage(): 直接包装该内存的 QImage, 不复制
+    - bgr(): 按需生成指定区域的 BGR 副本(ROI统计只复制框选区域)
+    - gray(): 按需生成并缓存的灰度图(1字节/像素), 灰度图显示与直方图共用
+    - integral_stats(): 按需构建并缓存的块积分图, ROI统计 O(1) 查询
+decode_preview() 用于看图子界面先显示的缩略预览图, JPEG 在解码阶段直接按 1/2~1/8 缩小.
+'''
+
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+from PyQt5.QtGui import QImage, QPixmap
+
+from src.utils.integral_stats import IntegralStats
+
+PREVIEW_MAX_SIDE = 512      # 预览图解码的目标边长, JPEG 实际解码尺寸为不小于该值的 1/2~1/8 原图
+
+
+def format_nbytes(nbytes):
+    """格式化内存大小"""
+    if nbytes < 1024 ** 2:
+        return f"{nbytes / 1024:.1f} KB"
+    if nbytes < 1024 ** 3:
+        return f"{nbytes / 1024 ** 2:.1f} MB"
+    return f"{nbytes / 1024 ** 3:.2f} GB"
+
+
+class DecodedImage:
+    """解码后的RGB图像, 所有表示共享同一块连续内存"""
+
+    def __init__(self, rgb: np.ndarray, exif=None):
+        """
+        Args:
+            rgb: HxWx3 的 uint8 RGB 数组, 非连续时会复制一次.
+            exif: 原图的 Image.Exif 对象, 解码后不再保留 PIL 图像, EXIF 需单独保存.
+        """
+        if rgb.ndim != 3 or rgb.shape[2] != 3 or rgb.dtype != np.uint8:
+            raise ValueError(f"只支持 HxWx3 的 uint8 数组, 传入: {rgb.shape} {rgb.dtype}")
+        self._rgb = np.ascontiguousarray(rgb)
+        self._rgb.flags.writeable = False
+        self.exif = exif
+        self._gray = None
+        self._integral = None
+        self._lock = threading.Lock()
+        self._integral_lock = threading.Lock()     # 积分图构建耗时较长, 单独加锁不阻塞灰度图
+
+    @classmethod
+    def from_pil(cls, pil_image: Image.Image) -> "DecodedImage":
+        """从PIL图像创建, 复制一次像素数据后即可释放PIL图像"""
+        exif = pil_image.getexif()
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        return cls(np.array(pil_image), exif)
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """只读的 HxWx3 RGB 视图"""
+        return self._rgb
+
+    @property
+    def shape(self):
+        return self._rgb.shape
+
+    @property
+    def width(self) -> int:
+        return self._rgb.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self._rgb.shape[0]
+
+    def qimage(self) -> QImage:
+        """包装共享内存的QImage, 不复制像素数据; 返回的QImage不能比本对象存活更久"""
+        return QImage(self._rgb.data, self.width, self.height, self._rgb.strides[0], QImage.Format_RGB888)
+
+    def pixmap(self) -> QPixmap:
+        """生成显示用的QPixmap, 只在QPixmap内部复制一次"""
+        return QPixmap.fromImage(self.qimage())
+
+    def pil(self) -> Image.Image:
+        """生成PIL图像副本, 只用于必须传入PIL图像的接口(如ImageCms色域转换), 用完即释放"""
+        return Image.fromarray(self._rgb)
+
+    def bgr(self, y1=0, y2=None, x1=0, x2=None) -> np.ndarray:
+        """生成指定区域的连续BGR副本, 供OpenCV接口使用"""
+        return cv2.cvtColor(self._rgb[y1:y2, x1:x2], cv2.COLOR_RGB2BGR)
+
+    def gray(self) -> np.ndarray:
+        """灰度图, 首次调用时生成并缓存"""
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    gray = cv2.cvtColor(self._rgb, cv2.COLOR_RGB2GRAY)
+                    gray.flags.writeable = False
+                    self._gray = gray
+        return self._gray
+
+    def integral_stats(self) -> IntegralStats:
+        """ROI统计使用的积分图, 首次调用时构建并缓存"""
+        if self._integral is None:
+            with self._integral_lock:
+                if self._integral is None:
+                    self._integral = IntegralStats(self._rgb)
+        return self._integral
+
+    @property
+    def has_integral_stats(self) -> bool:
+        """积分图是否已构建, 主线程据此决定直接查询还是提交到工作线程"""
+        return self._integral is not None
+
+    def gray_qimage(self) -> QImage:
+        """包装灰度图内存的QImage, 不复制像素数据"""
+        gray = self.gray()
+        return QImage(gray.data, gray.shape[1], gray.shape[0], gray.strides[0], QImage.Format_Grayscale8)
+
+    def resized(self, factor: float) -> np.ndarray:
+        """按比例缩放后的RGB图, 用于计算整图统计信息"""
+        size = (max(1, int(self.width * factor)), max(1, int(self.height * factor)))
+        return cv2.resize(self._rgb, size, interpolation=cv2.INTER_LANCZOS4)
+
+    @property
+    def nbytes(self) -> int:
+        """RGB缓冲区及已生成的灰度图、积分图占用的内存字节数"""
+        return (self._rgb.nbytes + (self._gray.nbytes if self._gray is not None else 0)
+                + (self._integral.nbytes if self._integral is not None else 0))
+
+
+def decode_preview(path, max_side=PREVIEW_MAX_SIDE):
+    """
+    快速解码缩略预览图, 不做ICC色域转换, 只用于完整图片处理完成前的占位显示.
+    Args:
+        path: 图片路径.
+        max_side: 预览图的目标边长.
+    Returns:
+        tuple: (预览图 DecodedImage, 原图宽, 原图高), 宽高已按EXIF方向校正, 与完整解码后的尺寸一致.
+    """
+    with Image.open(path) as img:
+        width, height = img.size
+        orientation = img.getexif().get(0x0112, 1)
+        # JPEG 按DCT缩放直接解码出缩小的图像, 其它格式(draft不生效)完整解码后再缩小
+        img.draft('RGB', (max_side, max_side))
+        if max(img.size) > max_side * 2:
+            img.thumbnail((max_side * 2, max_side * 2))
+        preview = ImageOps.exif_transpose(img)
+    if orientation in (5, 6, 7, 8):
+        width, height = height, width
+    return DecodedImage.from_pil(preview), width, height
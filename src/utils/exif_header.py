@@ -0,0 +1,204 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :exif_header.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :只读取JPEG文件头解析宽高、曝光时间、ISO, 批量多线程提取
+
+ImageProcessor 需要为每个文件创建PIL图像对象并解析完整EXIF, 这里直接按标记段读取JPEG文件头:
+1. APP1(Exif)段: 解析TIFF结构的IFD0和Exif子IFD, 只取曝光时间(33434)和ISO(34855)
+2. SOFn段: 读取图像宽高, 读到后立即停止, 不读取压缩数据
+解析结果与 ImageProcessor 的输出格式保持一致, 非JPEG格式或遇到不常见的字段类型时回退到 ImageProcessor.
+'''
+
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.utils.image import ImageProcessor
+
+
+# 宽, 高, 曝光时间, ISO
+ImageMetadata = Tuple[Optional[int], Optional[int], Optional[str], Optional[object]]
+
+# 只解析这些后缀的文件头, 其他格式回退到 ImageProcessor
+HEADER_FORMATS = ('.jpg', '.jpeg')
+
+TAG_EXIF_IFD = 0x8769
+TAG_EXPOSURE_TIME = 33434
+TAG_ISO = 34855
+
+# TIFF字段类型: (struct格式, 字节数)
+_TIFF_TYPES = {
+    3: ("H", 2),     # SHORT
+    4: ("L", 4),     # LONG
+    5: ("LL", 8),    # RATIONAL
+    8: ("h", 2),     # SSHORT
+    9: ("l", 4),     # SLONG
+    10: ("ll", 8),   # SRATIONAL
+}
+
+# 不带长度字段的独立标记: TEM、RST0~RST7、SOI
+_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+# 帧起始标记SOF0~SOF15, 排除DHT(C4)、JPG(C8)、DAC(CC)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class UnsupportedHeader(Exception):
+    """文件头结构不在快速解析范围内, 需要回退到 ImageProcessor"""
+
+
+def _read_jpeg_segments(file_path: str) -> Tuple[Tuple[int, int], Optional[bytes]]:
+    """按标记段读取JPEG文件头, 返回 ((宽, 高), Exif的TIFF数据), 读到SOF段即停止"""
+    exif = None
+    with open(file_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            raise UnsupportedHeader("不是JPEG文件")
+        while True:
+            byte = f.read(1)
+            if byte != b"\xff":
+                raise UnsupportedHeader("标记段结构异常")
+            marker = f.read(1)
+            while marker == b"\xff":  # 跳过填充字节
+                marker = f.read(1)
+            if not marker:
+                raise UnsupportedHeader("文件头不完整")
+            marker = marker[0]
+            if marker in _STANDALONE_MARKERS:
+                continue
+            if marker in (0xD9, 0xDA):  # EOI/SOS之前仍未读到SOF
+                raise UnsupportedHeader("未找到SOF段")
+
+            length_bytes = f.read(2)
+            if len(length_bytes) != 2:
+                raise UnsupportedHeader("文件头不完整")
+            length = struct.unpack(">H", length_bytes)[0] - 2
+
+            if marker == 0xE1 and exif is None:
+                data = f.read(length)
+                # 与PIL一致, 只使用第一个Exif段, XMP等其他APP1段忽略
+                if data[:6] == b"Exif\x00\x00":
+                    exif = data[6:]
+            elif marker in _SOF_MARKERS:
+                data = f.read(5)
+                if len(data) != 5:
+                    raise UnsupportedHeader("SOF段不完整")
+                height, width = struct.unpack(">HH", data[1:5])
+                return (width, height), exif
+            else:
+                f.seek(length, os.SEEK_CUR)
+
+
+def _parse_ifd(tiff: bytes, offset: int, order: str, tags: Dict[int, object]) -> Optional[int]:
+    """解析一个IFD中需要的字段写入tags, 返回Exif子IFD的偏移(没有则为None)"""
+    if offset + 2 > len(tiff):
+        raise UnsupportedHeader("IFD偏移越界")
+    count = struct.unpack_from(order + "H", tiff, offset)[0]
+    exif_offset = None
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        if entry + 12 > len(tiff):
+            raise UnsupportedHeader("IFD条目越界")
+        tag, field_type, value_count = struct.unpack_from(order + "HHL", tiff, entry)
+        if tag not in (TAG_EXIF_IFD, TAG_EXPOSURE_TIME, TAG_ISO):
+            continue
+        if field_type not in _TIFF_TYPES:
+            raise UnsupportedHeader(f"不支持的字段类型: {field_type}")
+        fmt, size = _TIFF_TYPES[field_type]
+        if value_count != 1:
+            # 多值字段在PIL中为元组, 交给ImageProcessor按原逻辑处理
+            raise UnsupportedHeader(f"字段{tag}包含{value_count}个值")
+        value_offset = entry + 8
+        if size > 4:
+            value_offset = struct.unpack_from(order + "L", tiff, entry + 8)[0]
+        if value_offset + size > len(tiff):
+            raise UnsupportedHeader("字段值越界")
+        value = struct.unpack_from(order + fmt, tiff, value_offset)
+
+        if tag == TAG_EXIF_IFD:
+            exif_offset = value[0]
+        else:
+            tags[tag] = value if len(value) == 2 else value[0]
+    return exif_offset
+
+
+def _parse_exif(tiff: bytes) -> Tuple[Optional[str], Optional[object]]:
+    """解析Exif的TIFF数据, 返回 (曝光时间, ISO)"""
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        raise UnsupportedHeader("TIFF字节序异常")
+    ifd0_offset = struct.unpack_from(order + "L", tiff, 4)[0]
+
+    # 与PIL的_getexif()一致, Exif子IFD中的字段覆盖IFD0中的同名字段
+    tags = {}
+    exif_offset = _parse_ifd(tiff, ifd0_offset, order, tags)
+    if exif_offset:
+        _parse_ifd(tiff, exif_offset, order, tags)
+
+    exposure_time = None
+    exposure = tags.get(TAG_EXPOSURE_TIME)
+    if isinstance(exposure, tuple):
+        numerator, denominator = exposure
+        # 与 ImageProcessor.get_image_exposure_time() 中的分数处理保持一致
+        if numerator != 0:
+            exposure_time = f"1/{denominator // numerator}"
+    elif exposure is not None:
+        raise UnsupportedHeader("曝光时间不是分数类型")
+
+    return exposure_time, tags.get(TAG_ISO)
+
+
+def read_header_metadata(file_path: str) -> ImageMetadata:
+    """只读取文件头获取 (宽, 高, 曝光时间, ISO), 无法快速解析时回退到 ImageProcessor"""
+    if file_path.lower().endswith(HEADER_FORMATS):
+        try:
+            (width, height), tiff = _read_jpeg_segments(file_path)
+            exposure_time, iso = _parse_exif(tiff) if tiff else (None, None)
+            return width, height, exposure_time, iso
+        except (UnsupportedHeader, struct.error):
+            pass
+
+    with ImageProcessor(file_path) as img:
+        return img.width, img.height, img.exposure_time, img.iso
+
+
+def read_metadata_batch(file_paths: Iterable[str], workers: Optional[int] = None,
+                        cancel_event=None, progress_callback=None) -> Dict[str, ImageMetadata]:
+    """
+    该函数主要是实现了多线程批量读取图片宽高、曝光时间、ISO的功能.
+    Args:
+        file_paths (iterable): 图片文件路径.
+        workers (int): 线程数, 默认取CPU核心数且不超过8.
+        cancel_event (threading.Event): 置位后取消未开始的任务并提前返回.
+        progress_callback (callable): 进度回调 progress_callback(已完成, 总数).
+    Returns:
+        dict: {文件路径: (宽, 高, 曝光时间, ISO)}, 读取失败的文件不包含在结果中
+    """
+    file_paths = list(file_paths)
+    result = {}
+    if not file_paths:
+        return result
+    if workers is None:
+        workers = max(1, min(8, os.cpu_count() or 1))
+
+    # 文件头读取以IO为主, 解析量很小, 使用线程池即可, 不需要进程池的启动和序列化开销
+    with ThreadPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+        futures = {executor.submit(read_header_metadata, path): path for path in file_paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            if cancel_event is not None and cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+                break
+            path = futures[future]
+            try:
+                result[path] = future.result()
+            except Exception as e:
+                print(f"[read_metadata_batch]-->warning: 读取图片信息失败--{path}: {e}")
+            if progress_callback is not None and done % 50 == 0:
+                progress_callback(done, len(file_paths))
+    return result
@@ -0,0 +1,72 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :folder_watcher.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :监听表格中显示的文件夹, 防抖后发出发生变化的文件夹列表
+
+相机连拍落盘、外部删除/重命名等操作会在短时间内触发大量目录变化通知,
+FolderWatcher 将同一时间窗口内的通知合并, 只在最后一次变化后 debounce_ms 毫秒发出一次信号,
+主界面据此只重新扫描发生变化的文件夹并增量更新表格, 不再清空整个表格.
+'''
+
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+
+class FolderWatcher(QObject):
+    """基于 QFileSystemWatcher 的文件夹监听类, 带防抖"""
+
+    folders_changed = pyqtSignal(list)  # 防抖后发出发生变化的文件夹路径列表
+
+    def __init__(self, parent=None, debounce_ms=300):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._changed = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._emit_changed)
+        self._suspended = False
+
+    def set_folders(self, folders):
+        """设置需要监听的文件夹, 替换之前的监听列表"""
+        self.clear()
+        folders = [os.path.normpath(folder) for folder in folders if os.path.isdir(folder)]
+        if folders:
+            self._watcher.addPaths(folders)
+
+    def folders(self):
+        """返回当前监听的文件夹列表"""
+        return self._watcher.directories()
+
+    def clear(self):
+        """取消所有监听, 丢弃未发出的变化"""
+        if directories := self._watcher.directories():
+            self._watcher.removePaths(directories)
+        self._timer.stop()
+        self._changed = []
+
+    def set_suspended(self, suspended):
+        """暂停/恢复发出信号, 暂停期间的变化在恢复后合并发出"""
+        self._suspended = suspended
+        if not suspended and self._changed:
+            self._timer.start()
+
+    def _on_directory_changed(self, folder):
+        """目录变化通知, 重新计时"""
+        if folder not in self._changed:
+            self._changed.append(folder)
+        # 部分平台在目录被删除后会自动移除监听, 目录重新出现时需要重新添加
+        if os.path.isdir(folder) and folder not in self._watcher.directories():
+            self._watcher.addPath(folder)
+        self._timer.start()
+
+    def _emit_changed(self):
+        if self._suspended or not self._changed:
+            return
+        changed, self._changed = self._changed, []
+        self.folders_changed.emit(changed)
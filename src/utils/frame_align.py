@@ -0,0 +1,118 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :frame_align.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :多视频对齐, 在目标视频中查找与基准帧最相似的帧(由粗到精)
+
+原方案对每个目标视频均匀定位采样100帧, 每次 cap.set 都要从关键帧重新解码, 再以全分辨率灰度图的平均绝对差比较,
+多个目标视频依次处理, 且采样间隔内的帧永远比较不到. 这里:
+    - 每帧缩小为 THUMB_SIZE 的灰度缩略图并归一化(减均值除标准差), 不同设备拍摄的亮度差异不影响比较
+    - 粗搜索: 顺序 grab() 整个视频, 每隔 帧数 // COARSE_SAMPLES 帧才取出一帧比较. OpenCV 定位时会从目标之前
+      十几帧处的关键帧开始解码, 逐个定位采样点的解码量反而多于顺序解码一遍
+    - 精搜索: 取粗搜索得分的局部极小值中最好的 TOP_CANDIDATES 个作为候选(同一处相邻的采样点只占一个名额,
+      场景重复时真正的匹配点在采样间隔内可能不如别处的相似帧), 在其前后相邻采样点之间顺序解码每一帧比较,
+      有视频索引时按关键帧定位并校验帧号, 结果精确到帧
+    - 多个目标视频通过全局任务调度器并行处理
+'''
+
+import cv2
+import numpy as np
+
+from src.utils.frame_source import FrameSource
+from src.utils.task_scheduler import get_scheduler, PRIORITY_VISIBLE
+from src.utils.video_index import load_video_index
+
+THUMB_SIZE = (64, 36)       # 比较用缩略图的宽高
+COARSE_SAMPLES = 200        # 粗搜索最多比较的帧数
+TOP_CANDIDATES = 5          # 进入精搜索的候选(得分的局部极小值)数
+
+
+def frame_signature(frame: np.ndarray) -> np.ndarray:
+    """BGR帧的比较特征: 归一化的灰度缩略图"""
+    # 先缩小再转灰度, 颜色转换只处理缩略图
+    thumb = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+    if thumb.ndim == 3:
+        thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    thumb = thumb.astype(np.float32)
+    mean, std = cv2.meanStdDev(thumb)
+    return (thumb - float(mean[0, 0])) / max(float(std[0, 0]), 1.0)
+
+
+def _score(signature, reference) -> float:
+    """平均绝对差, 越小越相似"""
+    return cv2.norm(signature, reference, cv2.NORM_L1) / reference.size
+
+
+def _coarse_sequential(cap, total_frames, reference):
+    """顺序解码, 每隔 total_frames // COARSE_SAMPLES 帧比较一帧, 返回 [(帧号, 得分)]"""
+    step = max(1, total_frames // COARSE_SAMPLES)
+    samples = []
+    frame_number = 0
+    while cap.grab():
+        if frame_number % step == 0:
+            ret, frame = cap.retrieve()
+            if ret:
+                samples.append((frame_number, _score(frame_signature(frame), reference)))
+        frame_number += 1
+    return samples
+
+
+def find_best_match(video_path, reference: np.ndarray):
+    """
+    在视频中查找与基准特征最相似的帧.
+    Args:
+        video_path: 目标视频路径.
+        reference: 基准帧的 frame_signature().
+    Returns:
+        tuple: (最佳帧号, 得分), 无法读取视频时帧号为-1.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"[find_best_match]-->error: 无法打开目标视频: {video_path}")
+        return -1, float("inf")
+    try:
+        index = load_video_index(video_path)
+        total_frames = index.frame_count if index is not None else int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        samples = _coarse_sequential(cap, total_frames, reference)
+        if not samples:
+            return -1, float("inf")
+
+        # 精搜索: 在候选前后相邻采样点之间逐帧比较
+        positions = [frame_number for frame_number, _ in samples]
+        scores = dict(samples)
+        source = FrameSource(cap, index=index)
+        minima = [i for i in range(len(samples))
+                  if (i == 0 or samples[i][1] <= samples[i - 1][1])
+                  and (i + 1 == len(samples) or samples[i][1] <= samples[i + 1][1])]
+        ranked = sorted(minima, key=lambda i: samples[i][1])[:TOP_CANDIDATES]
+        for i in ranked:
+            start = positions[i - 1] + 1 if i > 0 else 0
+            end = positions[i + 1] - 1 if i + 1 < len(positions) else positions[i] + (positions[i] - start)
+            frame = source.frame_at(start)
+            frame_number = start
+            while frame is not None and frame_number <= end:
+                if frame_number not in scores:
+                    scores[frame_number] = _score(frame_signature(frame), reference)
+                frame_number, frame = source.read()
+                if frame is None:
+                    break
+        source.clear()
+        best = min(scores, key=scores.get)
+        return best, scores[best]
+    finally:
+        cap.release()
+
+
+def find_best_matches(video_paths, reference: np.ndarray) -> dict:
+    """并行处理多个目标视频, 返回 {视频路径: (最佳帧号, 得分)}, 出错的视频帧号为-1"""
+    def match(path):
+        try:
+            return find_best_match(path, reference)
+        except Exception as e:
+            print(f"[find_best_matches]-->error: 处理视频 {path} 时出错: {e}")
+            return -1, float("inf")
+    video_paths = list(video_paths)
+    results = get_scheduler().map(match, video_paths, priority=PRIORITY_VISIBLE, caller_runs=True)
+    return dict(zip(video_paths, results))
@@ -0,0 +1,169 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :frame_source.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频逐帧解码源, 解码器保持打开, 前进只解码下一帧, 后退从关键帧解码并缓存到环形缓冲区
+
+原方案逐帧前进/后退时为每个播放器新建 VideoCapture 并从第0帧解码到目标帧, 10分钟的4K视频在接近结尾处
+单步一次要解码上万帧. FrameSource:
+    - 持有一个打开的 VideoCapture, 记录解码器下一次 read() 返回的帧号, 目标帧就是下一帧时只解码一帧
+    - 目标帧在前方 FORWARD_DECODE_LIMIT 帧以内时顺序 grab() 跳过中间帧, 更远时直接定位
+    - 最近解码的帧保存在环形缓冲区中(按帧大小限制内存), 后退命中缓冲区时不解码
+    - 小幅后退未命中时定位到目标帧之前一个缓冲区长度的位置(解码器从其之前最近的关键帧开始解码),
+      顺序解码到目标帧并填满缓冲区, 之后连续后退直接命中缓冲区
+    - 设置了视频索引(VideoIndex)后, 定位时跳到目标之前最近的关键帧, 以解码后第一帧的时间戳校验实际帧号,
+      落点越过目标时退到前一个关键帧重试, 帧号准确; 时间与帧号按索引中的时间戳换算
+FrameSource 不是线程安全的, 由调用方(FrameReader)加锁.
+'''
+
+from collections import OrderedDict
+
+import cv2
+
+from src.utils.video_index import VideoIndex
+
+RING_BUDGET_BYTES = 256 * 1024 * 1024   # 每个解码源环形缓冲区的内存上限, 4K帧约缓存10帧
+MIN_RING_FRAMES = 4
+MAX_RING_FRAMES = 64                    # 播放时缓冲区同时包含预解码的帧和刚显示过的帧
+FORWARD_DECODE_LIMIT = 60               # 目标帧在前方该帧数以内时顺序解码, 否则直接定位
+SEEK_RETRIES = 3                        # 定位落点越过目标时退到前一个关键帧重试的次数
+
+
+class FrameSource:
+    """帧号精确的解码源, read() 顺序读取, frame_at() 随机访问"""
+
+    def __init__(self, cap: cv2.VideoCapture, fps: float = None, index: VideoIndex = None):
+        """
+        Args:
+            cap: 已打开的 VideoCapture, 由 FrameSource 接管读取位置, 调用方负责释放.
+            fps: 视频帧率, 默认读取 CAP_PROP_FPS.
+            index: 视频索引, 也可以在后台构建完成后通过 set_index() 设置.
+        """
+        self.cap = cap
+        self.fps = fps or cap.get(cv2.CAP_PROP_FPS)
+        self.frame_time = 1000 / self.fps if self.fps > 0 else 33.33
+        self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.position = 0               # 下一次 read() 返回的帧号
+        self._decoder_index = int(cap.get(cv2.CAP_PROP_POS_FRAMES))    # 解码器下一次解码的帧号
+        self._ring = OrderedDict()      # {帧号: 帧}, 按最近使用排序
+        self._ring_size = MAX_RING_FRAMES
+        self.index = None
+        if index is not None:
+            self.set_index(index)
+
+    def set_index(self, index: VideoIndex) -> None:
+        """设置视频索引, 之后的定位从关键帧开始并校验帧号"""
+        self.index = index
+        self.total_frames = index.frame_count
+
+    def time_ms(self, index: int) -> int:
+        """帧号对应的时间戳(毫秒)"""
+        if self.index is not None:
+            return int(self.index.time_ms(index))
+        return int(index * self.frame_time)
+
+    def index_at(self, time_ms: float) -> int:
+        """时间戳(毫秒)对应的帧号"""
+        if self.index is not None:
+            return self.index.index_at(time_ms)
+        return max(0, int(round(time_ms / self.frame_time)))
+
+    def seek(self, index: int) -> None:
+        """定位到 index, 下一次 read() 返回该帧; 实际解码延迟到读取时进行"""
+        self.position = max(0, int(index))
+
+    def read(self):
+        """读取 position 处的帧, 返回 (帧号, 帧), 到达结尾时返回 (None, None)"""
+        index = self.position
+        frame = self.frame_at(index)
+        return (index, frame) if frame is not None else (None, None)
+
+    def skip(self) -> bool:
+        """跳过 position 处的帧, 不在缓冲区中时只 grab() 不转换颜色, 追赶播放时钟时使用; 到达结尾时返回False"""
+        index = self.position
+        if index not in self._ring:
+            if index != self._decoder_index:
+                return self.read()[1] is not None
+            if not self.cap.grab():
+                return False
+            self._decoder_index += 1
+        self.position = index + 1
+        return True
+
+    def frame_at(self, index: int):
+        """
+        返回第 index 帧(BGR), 之后 read() 从 index + 1 继续; 超出范围或解码失败时返回None.
+        返回的帧同时保存在环形缓冲区中, 调用方不能原地修改.
+        """
+        if index < 0:
+            return None
+        frame = self._ring.get(index)
+        if frame is not None:
+            self._ring.move_to_end(index)
+        else:
+            frame = self._decode_to(index)
+        if frame is not None:
+            self.position = index + 1
+        return frame
+
+    def _decode_to(self, index):
+        # 小幅后退(逐帧后退)时多解码一个缓冲区长度的帧, 连续后退直接命中缓冲区;
+        # 前进及大幅跳转(拖动进度条)时只保留目标帧
+        start = index
+        if index < self._decoder_index or index - self._decoder_index > FORWARD_DECODE_LIMIT:
+            if 0 < self._decoder_index - index <= self._ring_size:
+                start = max(0, index - self._ring_size + 1)
+            self._seek_decoder(start)
+        while self._decoder_index <= index:
+            if self._decoder_index >= start:
+                ret, frame = self.cap.read()
+                if ret:
+                    self._remember(self._decoder_index, frame)
+            else:
+                ret = self.cap.grab()
+            if not ret:
+                return None
+            self._decoder_index += 1
+        return self._ring.get(index)
+
+    def _seek_decoder(self, index) -> None:
+        """将解码器定位到 index 或其之前的帧, 之后顺序解码到 index"""
+        if self.index is None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            self._decoder_index = index
+            return
+        keyframe = self.index.keyframe_before(index)
+        for _ in range(SEEK_RETRIES):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            # 以解码后第一帧的时间戳确定实际位置, 不依赖解码器估算的帧号
+            actual = self.index.index_of_pts(self.cap.get(cv2.CAP_PROP_POS_MSEC))
+            if actual <= index:
+                if actual == index:
+                    self._remember(actual, frame)
+                self._decoder_index = actual + 1
+                return
+            if keyframe == 0:
+                break
+            keyframe = self.index.keyframe_before(keyframe - 1)
+        # 无法按关键帧定位时从头开始顺序解码
+        print(f"[FrameSource._seek_decoder]-->warning: 按关键帧定位失败, 从第0帧解码到帧 {index}")
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._decoder_index = 0
+
+    def _remember(self, index, frame):
+        if not self._ring:
+            # 按第一帧的大小确定缓冲区长度
+            self._ring_size = max(MIN_RING_FRAMES, min(MAX_RING_FRAMES, RING_BUDGET_BYTES // max(1, frame.nbytes)))
+        self._ring[index] = frame
+        self._ring.move_to_end(index)
+        while len(self._ring) > self._ring_size:
+            self._ring.popitem(last=False)
+
+    def clear(self) -> None:
+        """释放缓冲区中的帧"""
+        self._ring.clear()
@@ -0,0 +1,73 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :histogram.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :看图子界面的亮度及R/G/B直方图计算, 结果按(路径, 修改时间, 文件大小)缓存到元数据索引
+
+原流程每次打开图片都要把整张图转换为灰度并展平后统计, 且只有亮度直方图. 这里:
+    - 按 step 对图像隔行隔列取样(numpy视图, 不复制), step 为1时统计全部像素
+    - R/G/B 三个通道直接对 HxWx3 数组调用 cv2.calcHist, 不拆分通道
+    - 亮度优先复用已缓存的灰度图(DecodedImage.gray), 与灰度图显示一致
+    - 结果为 4x256 的数组(亮度, R, G, B), 写入元数据索引, 再次打开未修改的图片时不再统计像素
+'''
+
+import os
+
+import cv2
+import numpy as np
+
+from src.utils.metadata_index import get_metadata_index, make_meta_key
+
+HISTOGRAM_STEP = 4      # 默认取样步长, 5000万像素的图片取样后约300万像素, 直方图形状与全图统计一致
+MAX_HISTOGRAM_STEP = 16
+
+
+def compute_histograms(rgb: np.ndarray, step: int = 1, gray: np.ndarray = None) -> np.ndarray:
+    """
+    统计亮度及R/G/B直方图.
+    Args:
+        rgb: HxWx3 的 uint8 RGB 数组.
+        step: 取样步长, 每隔 step 行、step 列取一个像素.
+        gray: 与 rgb 同尺寸的灰度图, 已缓存时传入, 省去一次颜色转换.
+    Returns:
+        np.ndarray: 4x256 的 int64 数组, 依次为亮度、R、G、B.
+    """
+    step = max(1, int(step))
+    sample = rgb[::step, ::step] if step > 1 else rgb
+    if step > 1:
+        # cv2 只接受连续内存, 取样后的数据量只有原图的 1/step^2
+        sample = np.ascontiguousarray(sample)
+    if gray is None or step > 1:
+        gray = cv2.cvtColor(sample, cv2.COLOR_RGB2GRAY)
+    hist = np.empty((4, 256), dtype=np.int64)
+    hist[0] = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+    for channel in range(3):
+        hist[channel + 1] = cv2.calcHist([sample], [channel], None, [256], [0, 256]).ravel()
+    return hist
+
+
+def cached_histograms(path, decoded, step: int = HISTOGRAM_STEP) -> np.ndarray:
+    """
+    获取图片的直方图, 元数据索引中有 (路径, 修改时间, 文件大小, 取样步长) 一致的记录时直接返回, 否则统计后写入.
+    Args:
+        path: 图片文件路径, 为None时只统计不缓存.
+        decoded: 解码后的 DecodedImage.
+        step: 取样步长.
+    Returns:
+        np.ndarray: 4x256 的 int64 数组, 依次为亮度、R、G、B.
+    """
+    key = None
+    if path:
+        try:
+            key = make_meta_key(path, os.stat(path))
+            if (hist := get_metadata_index().get_histogram(key, step)) is not None:
+                return hist
+        except OSError as e:
+            print(f"[cached_histograms]-->warning: 读取文件信息失败, 不缓存直方图--{path}: {e}")
+            key = None
+    hist = compute_histograms(decoded.rgb, step, decoded.gray() if step == 1 else None)
+    if key is not None:
+        get_metadata_index().put_histogram(key, step, hist)
+    return hist
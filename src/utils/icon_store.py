@@ -0,0 +1,126 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :icon_store.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :基于SQLite(WAL模式)的单文件图标缩略图存储
+
+替代原先 cache/icons/ 下每个文件一张PNG + 每次重写 icons.json 索引的方案:
+1. 以 (文件路径, 修改时间, 文件大小) 作为键, 文件被修改后自动失效
+2. 支持批量写入 put_many(), 预加载线程按批次提交, 避免逐条写盘
+3. 支持批量读取 get_many(), 一次查询取回整列表格的图标
+4. 按最近访问时间(LRU)淘汰, 保证条目数不超过 max_entries
+'''
+
+import os
+import time
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.sqlite_store import SQLiteStore
+
+
+# 存储键类型: (文件路径, 修改时间ns, 文件大小)
+IconKey = Tuple[str, int, int]
+
+
+def make_icon_key(file_path: str, file_stat: Optional[os.stat_result] = None) -> IconKey:
+    """根据文件路径构建存储键, 可传入已获取的stat结果避免重复stat"""
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+    return (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+class IconStore(SQLiteStore):
+    """单文件图标存储类, 线程安全, 每个线程持有独立的sqlite连接"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS icons (
+            path        TEXT    NOT NULL,
+            mtime_ns    INTEGER NOT NULL,
+            size        INTEGER NOT NULL,
+            data        BLOB    NOT NULL,
+            last_access REAL    NOT NULL,
+            PRIMARY KEY (path, mtime_ns, size)
+        );
+        CREATE INDEX IF NOT EXISTS idx_icons_last_access ON icons(last_access);
+    """
+
+    def __init__(self, db_path, max_entries: int = 10000):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+
+    def get(self, key: IconKey) -> Optional[bytes]:
+        """读取单个图标数据, 不存在返回None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[IconKey]) -> Dict[IconKey, bytes]:
+        """批量读取图标数据, 返回 {key: png_bytes}, 只包含命中的键"""
+        keys = list(keys)
+        result = {}
+        if not keys:
+            return result
+        try:
+            conn = self._conn()
+            wanted = set(keys)
+            for i in range(0, len(keys), self._QUERY_CHUNK):
+                chunk = keys[i:i + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT path, mtime_ns, size, data FROM icons WHERE path IN ({placeholders})",
+                    [k[0] for k in chunk]).fetchall()
+                for path, mtime_ns, size, data in rows:
+                    key = (path, mtime_ns, size)
+                    if key in wanted:
+                        result[key] = data
+            # 更新命中条目的访问时间, 供LRU淘汰使用
+            if result:
+                now = time.time()
+                with conn:
+                    conn.executemany(
+                        "UPDATE icons SET last_access=? WHERE path=? AND mtime_ns=? AND size=?",
+                        [(now, *k) for k in result])
+        except sqlite3.Error as e:
+            print(f"[IconStore.get_many]-->error: 读取图标存储失败: {e}")
+        return result
+
+    def put_many(self, items: List[Tuple[IconKey, bytes]]) -> None:
+        """批量写入图标数据, 同一路径的旧版本会被替换, 写入后执行淘汰"""
+        if not items:
+            return
+        try:
+            conn = self._conn()
+            now = time.time()
+            with conn:
+                conn.executemany("DELETE FROM icons WHERE path=?", [(k[0],) for k, _ in items])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO icons (path, mtime_ns, size, data, last_access) VALUES (?, ?, ?, ?, ?)",
+                    [(*k, sqlite3.Binary(data), now) for k, data in items])
+            self.evict()
+        except sqlite3.Error as e:
+            print(f"[IconStore.put_many]-->error: 写入图标存储失败: {e}")
+
+    def evict(self) -> int:
+        """按最近访问时间淘汰超出 max_entries 的条目, 返回删除数量"""
+        try:
+            conn = self._conn()
+            count = conn.execute("SELECT COUNT(*) FROM icons").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow <= 0:
+                return 0
+            with conn:
+                conn.execute(
+                    "DELETE FROM icons WHERE rowid IN (SELECT rowid FROM icons ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,))
+            return overflow
+        except sqlite3.Error as e:
+            print(f"[IconStore.evict]-->error: 淘汰图标缓存失败: {e}")
+            return 0
+
+    def count(self) -> int:
+        """返回当前存储的条目数"""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM icons").fetchone()[0]
+        except sqlite3.Error:
+            return 0
@@ -0,0 +1,240 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :metadata_index.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :基于SQLite的全局图片元数据索引
+
+非极简模式下切换文件夹时, 原先需要对每张图片执行 Image.open + _getexif 读取宽高、曝光时间、ISO,
+索引以文件路径为主键记录这些字段以及文件大小、创建/修改时间, 以 (修改时间, 文件大小) 判断是否失效,
+再次打开同一文件夹时只需对每个文件stat一次并批量查询一次索引.
+看图子界面的亮度及R/G/B直方图(4x256)以同样的键记录在 histograms 表中, 再次打开未修改的图片时不再统计像素.
+视频的逐帧时间戳和关键帧帧号记录在 video_index 表中, 再次打开未修改的视频时不再扫描.
+'''
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.sqlite_store import SQLiteStore
+
+
+"""设置本项目的入口路径,全局变量BASEICONPATH"""
+BASEICONPATH = Path(__file__).parent.parent.parent
+
+# 索引键类型: (文件路径, 修改时间ns, 文件大小)
+MetaKey = Tuple[str, int, int]
+# 索引值类型: (宽, 高, 曝光时间, ISO)
+MetaValue = Tuple[Optional[int], Optional[int], Optional[str], Optional[object]]
+
+
+def make_meta_key(file_path: str, file_stat: os.stat_result) -> MetaKey:
+    """根据文件路径和stat结果构建索引键"""
+    return (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def is_cacheable_metadata(value: MetaValue) -> bool:
+    """只缓存sqlite能原样存取的字段类型, 其他类型(如部分相机的ISO元组)每次重新读取"""
+    width, height, exposure_time, iso = value
+    return (all(v is None or isinstance(v, int) for v in (width, height))
+            and (exposure_time is None or isinstance(exposure_time, str))
+            and (iso is None or isinstance(iso, (int, str))))
+
+
+class MetadataIndex(SQLiteStore):
+    """图片元数据索引类, 线程安全, 每个线程持有独立的sqlite连接"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path          TEXT    PRIMARY KEY,
+            mtime_ns      INTEGER NOT NULL,
+            size          INTEGER NOT NULL,
+            ctime         REAL,
+            width         INTEGER,
+            height        INTEGER,
+            exposure_time TEXT,
+            iso,
+            last_access   REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_files_last_access ON files(last_access);
+        CREATE TABLE IF NOT EXISTS histograms (
+            path          TEXT    PRIMARY KEY,
+            mtime_ns      INTEGER NOT NULL,
+            size          INTEGER NOT NULL,
+            step          INTEGER NOT NULL,
+            data          BLOB    NOT NULL,
+            last_access   REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_histograms_last_access ON histograms(last_access);
+        CREATE TABLE IF NOT EXISTS video_index (
+            path          TEXT    PRIMARY KEY,
+            mtime_ns      INTEGER NOT NULL,
+            size          INTEGER NOT NULL,
+            pts_ms        BLOB    NOT NULL,
+            keyframes     BLOB    NOT NULL,
+            last_access   REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_video_index_last_access ON video_index(last_access);
+    """
+
+    def __init__(self, db_path, max_entries: int = 200000, max_histograms: int = 20000, max_video_indexes: int = 2000):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.max_histograms = max_histograms    # 每条直方图约4KB
+        self.max_video_indexes = max_video_indexes  # 每条视频索引每帧约8字节, 10分钟60fps的视频约300KB
+
+    def get_many(self, keys: Iterable[MetaKey]) -> Dict[str, MetaValue]:
+        """批量查询元数据, 返回 {文件路径: (宽, 高, 曝光时间, ISO)}, 只包含修改时间和大小都一致的条目"""
+        keys = list(keys)
+        result = {}
+        if not keys:
+            return result
+        try:
+            conn = self._conn()
+            wanted = set(keys)
+            for i in range(0, len(keys), self._QUERY_CHUNK):
+                chunk = keys[i:i + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT path, mtime_ns, size, width, height, exposure_time, iso FROM files WHERE path IN ({placeholders})",
+                    [k[0] for k in chunk]).fetchall()
+                for path, mtime_ns, size, width, height, exposure_time, iso in rows:
+                    if (path, mtime_ns, size) in wanted:
+                        result[path] = (width, height, exposure_time, iso)
+            # 更新命中条目的访问时间, 供淘汰使用
+            if result:
+                now = time.time()
+                with conn:
+                    conn.executemany("UPDATE files SET last_access=? WHERE path=?", [(now, p) for p in result])
+        except sqlite3.Error as e:
+            print(f"[MetadataIndex.get_many]-->error: 读取元数据索引失败: {e}")
+        return result
+
+    def put_many(self, items: List[Tuple[MetaKey, float, MetaValue]]) -> None:
+        """批量写入元数据, items 为 [(索引键, 创建时间, (宽, 高, 曝光时间, ISO))], 同一路径的旧记录被替换"""
+        rows = [(*key, ctime, *value) for key, ctime, value in items if is_cacheable_metadata(value)]
+        if not rows:
+            return
+        try:
+            conn = self._conn()
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size, ctime, width, height, exposure_time, iso, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(*row, now) for row in rows])
+            self.evict()
+        except sqlite3.Error as e:
+            print(f"[MetadataIndex.put_many]-->error: 写入元数据索引失败: {e}")
+
+    def get_histogram(self, key: MetaKey, step: int) -> Optional[np.ndarray]:
+        """查询直方图, 修改时间、大小及取样步长都一致时返回 4x256 的数组(亮度, R, G, B), 否则返回None"""
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT mtime_ns, size, step, data FROM histograms WHERE path=?", (key[0],)).fetchone()
+            if row is None or (row[0], row[1], row[2]) != (key[1], key[2], step):
+                return None
+            with conn:
+                conn.execute("UPDATE histograms SET last_access=? WHERE path=?", (time.time(), key[0]))
+            return np.frombuffer(row[3], dtype=np.int64).reshape(4, 256).copy()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[MetadataIndex.get_histogram]-->error: 读取直方图缓存失败: {e}")
+            return None
+
+    def put_histogram(self, key: MetaKey, step: int, hist: np.ndarray) -> None:
+        """写入直方图, 同一路径的旧记录被替换"""
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO histograms (path, mtime_ns, size, step, data, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, step, np.ascontiguousarray(hist, dtype=np.int64).tobytes(), time.time()))
+            self._evict_table("histograms", self.max_histograms)
+        except sqlite3.Error as e:
+            print(f"[MetadataIndex.put_histogram]-->error: 写入直方图缓存失败: {e}")
+
+    def get_video_index(self, key: MetaKey) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """查询视频索引, 修改时间和大小都一致时返回 (逐帧时间戳ms, 关键帧帧号), 否则返回None"""
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT mtime_ns, size, pts_ms, keyframes FROM video_index WHERE path=?", (key[0],)).fetchone()
+            if row is None or (row[0], row[1]) != (key[1], key[2]):
+                return None
+            with conn:
+                conn.execute("UPDATE video_index SET last_access=? WHERE path=?", (time.time(), key[0]))
+            return np.frombuffer(row[2], dtype=np.float64).copy(), np.frombuffer(row[3], dtype=np.int64).copy()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[MetadataIndex.get_video_index]-->error: 读取视频索引缓存失败: {e}")
+            return None
+
+    def put_video_index(self, key: MetaKey, pts_ms: np.ndarray, keyframes: np.ndarray) -> None:
+        """写入视频索引, 同一路径的旧记录被替换"""
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO video_index (path, mtime_ns, size, pts_ms, keyframes, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, np.ascontiguousarray(pts_ms, dtype=np.float64).tobytes(),
+                     np.ascontiguousarray(keyframes, dtype=np.int64).tobytes(), time.time()))
+            self._evict_table("video_index", self.max_video_indexes)
+        except sqlite3.Error as e:
+            print(f"[MetadataIndex.put_video_index]-->error: 写入视频索引缓存失败: {e}")
+
+    def _evict_table(self, table: str, max_entries: int) -> int:
+        """按最近访问时间淘汰表中超出 max_entries 的条目, 返回删除数量"""
+        conn = self._conn()
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        overflow = count - max_entries
+        if overflow <= 0:
+            return 0
+        with conn:
+            conn.execute(
+                f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,))
+        return overflow
+
+    def evict(self) -> int:
+        """按最近访问时间淘汰超出 max_entries 的条目, 返回删除数量"""
+        try:
+            return self._evict_table("files", self.max_entries)
+        except sqlite3.Error as e:
+            print(f"[MetadataIndex.evict]-->error: 淘汰元数据索引失败: {e}")
+            return 0
+
+    def count(self) -> int:
+        """返回当前索引的条目数"""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+# 全局元数据索引, 首次使用时创建
+_metadata_index = None
+_metadata_index_lock = threading.Lock()
+_metadata_index_file = BASEICONPATH / "cache" / "metadata.db"
+
+
+def get_metadata_index() -> MetadataIndex:
+    """获取全局元数据索引实例"""
+    global _metadata_index
+    with _metadata_index_lock:
+        if _metadata_index is None:
+            _metadata_index = MetadataIndex(_metadata_index_file)
+        return _metadata_index
+
+
+def close_metadata_index() -> None:
+    """关闭全局元数据索引的数据库连接, 清理缓存目录前调用"""
+    global _metadata_index
+    with _metadata_index_lock:
+        if _metadata_index is not None:
+            _metadata_index.close()
+            _metadata_index = None
+
@@ -4,22 +4,94 @@
 @Time         :2025/06/04 09:47:18
 @Author       :diamond_cz@163.com
 @Version      :1.0
-@Description  :
+@Description  :色彩空间转换, ICC转换器按(源配置文件, 目标配置文件, 渲染意图, 图像模式)缓存复用
+               engine 为 "numpy" 时矩阵/TRC配置文件之间的RGB转换改用 color_engine.py, 其余情况仍由LittleCMS转换
 '''
+import hashlib
+import threading
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
+from collections import OrderedDict
+import numpy as np
 from PIL import ImageOps,ImageCms,Image
+from src.utils.color_engine import MatrixTRCProfile, MatrixTRCTransform, UnsupportedProfileError
 
 # 设置项目根路径
 if True:
     BASEICONPATH = Path(__file__).parent.parent.parent
 
+# ICC转换器缓存数量上限
+TRANSFORM_CACHE_SIZE = 32
+
+# 渲染意图名称到ImageCms常量的映射
+INTENT_MAP = {
+    "Perceptual": ImageCms.Intent.PERCEPTUAL, # 感知，最常用的渲染意图，保持图像的视觉平衡
+    "Relative Colorimetric": ImageCms.Intent.RELATIVE_COLORIMETRIC, # 相对色度，保持图像的视觉平衡，但更注重颜色的准确性
+    "Saturation": ImageCms.Intent.SATURATION, # 饱和度，增强图像的饱和度，使颜色更鲜艳
+    "Absolute Colorimetric": ImageCms.Intent.ABSOLUTE_COLORIMETRIC # 绝对色度，保持图像的视觉平衡，但更注重颜色的准确性
+}
+
+# 可选的色域转换引擎: lcms 为LittleCMS(ImageCms), numpy 为矩阵+LUT的NumPy/OpenCV实现
+COLOR_ENGINES = ("lcms", "numpy")
+
+
+@lru_cache(maxsize=1)
+def _builtin_srgb_bytes():
+    """ImageCms内置sRGB配置文件的字节内容, 与LittleCMS转换时使用的sRGB完全一致"""
+    return ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+
+
+class TransformCache:
+    """
+    ICC转换器的LRU缓存, 多线程共享.
+    键为 (源配置文件哈希, 目标配置文件, 渲染意图, 图像模式), 同一文件夹的图片通常内嵌同一个相机ICC,
+    只在第一张图片时创建配置文件和转换器, 之后直接复用. maxsize 为0时不缓存, 每次都重新创建.
+    """
+    def __init__(self, maxsize=TRANSFORM_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._transforms = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """获取转换器, 未缓存时调用 build() 创建; 创建在锁外进行, 不阻塞其它线程使用已缓存的转换器"""
+        with self._lock:
+            transform = self._transforms.get(key)
+            if transform is not None:
+                self._transforms.move_to_end(key)
+                self.hits += 1
+                return transform
+            self.misses += 1
+        transform = build()
+        if self.maxsize > 0:
+            with self._lock:
+                self._transforms[key] = transform
+                self._transforms.move_to_end(key)
+                while len(self._transforms) > self.maxsize:
+                    self._transforms.popitem(last=False)
+        return transform
+
+    def clear(self):
+        """清空缓存及命中统计"""
+        with self._lock:
+            self._transforms.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._transforms)
+
 
 class ColorSpaceConverter:
-    def __init__(self):
+    # 所有实例共享的ICC转换器缓存
+    transform_cache = TransformCache()
+
+    def __init__(self, engine="lcms"):
         # 初始化变量
         self.current_profile = "sRGB"
         self.rendering_intent = "Perceptual"
+        self.engine = engine if engine in COLOR_ENGINES else "lcms"   # 色域转换引擎, 见 COLOR_ENGINES
         
         # 设置配置文件路径
         self.base_path = BASEICONPATH
@@ -75,47 +147,80 @@ class ColorSpaceConverter:
             print(f"错误: LittleCMS初始化失败 - {str(e)}")
             print("请确保已正确安装Pillow和littlecms库")
             
-    def convert_color_space(self, pil_image, target_profile, intent="Perceptual"):
+    @staticmethod
+    def _transform_mode(pil_image):
+        """转换器使用的图像模式, RGB/RGBA直接转换, 其它模式需先转换为RGB"""
+        return pil_image.mode if pil_image.mode in ("RGB", "RGBA") else "RGB"
+
+    @staticmethod
+    def _build_matrix_transform(profiles):
+        """创建矩阵/TRC转换器, 配置文件不支持时返回False(缓存False, 之后直接走LittleCMS)"""
+        try:
+            src, dst = profiles()
+            return MatrixTRCTransform(MatrixTRCProfile(src), MatrixTRCProfile(dst))
+        except UnsupportedProfileError as e:
+            print(f"[_build_matrix_transform]-->配置文件不支持numpy引擎, 使用LittleCMS转换: {str(e)}")
+            return False
+
+    def _matrix_transform(self, key, profiles, intent):
+        """
+        获取缓存的矩阵/TRC转换器, 未启用numpy引擎、绝对色度意图或配置文件不支持时返回None.
+        矩阵/TRC配置文件的感知、相对色度、饱和度意图在LittleCMS中都是同一个矩阵转换, 共用一个转换器.
+        """
+        if self.engine != "numpy" or intent == "Absolute Colorimetric":
+            return None
+        return self.transform_cache.get(key[:2] + ("numpy",), lambda: self._build_matrix_transform(profiles)) or None
+
+    def _apply_transform(self, pil_image, key, build, in_place, profiles=None):
+        """
+        获取缓存的转换器并应用, in_place为True时直接修改传入图像的像素, 不再分配新图像.
+        profiles 返回 (源配置文件字节, 目标配置文件字节), 启用numpy引擎时用于创建矩阵/TRC转换器.
+        """
+        mode = self._transform_mode(pil_image)
+        if pil_image.mode != mode:
+            pil_image, in_place = pil_image.convert(mode), True  # convert已生成新图像, 可以原地转换
+        matrix_transform = self._matrix_transform(key, profiles, key[2]) if profiles and mode == "RGB" else None
+        if matrix_transform is not None:
+            result = Image.fromarray(matrix_transform.apply(np.asarray(pil_image), parallel=True))
+            # 与LittleCMS转换结果一致: 保留原图的info(exif等), icc_profile替换为目标配置文件
+            result.info = {**pil_image.info, "icc_profile": profiles()[1]}
+            return result
+        transform = self.transform_cache.get(key + (mode,), lambda: build(mode))
+        if in_place:
+            ImageCms.applyTransform(pil_image, transform, inPlace=True)
+            return pil_image
+        result = ImageCms.applyTransform(pil_image, transform)
+        result.info = {**pil_image.info, **result.info}
+        return result
+
+    def convert_color_space(self, pil_image, target_profile, intent="Perceptual", in_place=False):
         """
         转换图像色彩空间
         Args:
             pil_image (PIL_image): PIL打开的图像
             target_profile (str): 目标色域名称
             intent (str): 渲染意图
+            in_place (bool): 是否直接修改pil_image, 传入的是临时副本时使用, 省去一次整图分配
         Returns:
-            QPixmap: 转换后的图像
+            Image.Image: 转换后的图像
         """
-        intent_map = {
-            "Perceptual": ImageCms.Intent.PERCEPTUAL, # 感知，最常用的渲染意图，保持图像的视觉平衡
-            "Relative Colorimetric": ImageCms.Intent.RELATIVE_COLORIMETRIC, # 相对色度，保持图像的视觉平衡，但更注重颜色的准确性
-            "Saturation": ImageCms.Intent.SATURATION, # 饱和度，增强图像的饱和度，使颜色更鲜艳
-            "Absolute Colorimetric": ImageCms.Intent.ABSOLUTE_COLORIMETRIC # 绝对色度，保持图像的视觉平衡，但更注重颜色的准确性
-        }
-        
         try:
-            # 设置源配置文件（假设为sRGB）
-            src_profile = ImageCms.createProfile("sRGB")
-            
             # 检查目标配置文件是否可用
             if target_profile not in self.icc_files or self.icc_files[target_profile] is None:
                 raise FileNotFoundError(f"未找到{target_profile}的ICC配置文件")
             
-            # 获取目标配置文件
+            # 获取目标配置文件，源配置文件假设为sRGB，转换器按(源, 目标, 渲染意图, 模式)缓存
             icc_path = self.icc_files[target_profile].as_posix()
-            dst_profile = ImageCms.getOpenProfile(icc_path)
-            
-            # 创建转换
-            transform = ImageCms.buildTransform(
-                src_profile, dst_profile,
-                "RGB", "RGB",
-                intent_map[intent]
-            )
-            
+            def build(mode):
+                return ImageCms.buildTransform(
+                    ImageCms.createProfile("sRGB"), ImageCms.getOpenProfile(icc_path),
+                    mode, mode,
+                    INTENT_MAP[intent]
+                )
+
             # 应用转换
-            converted_image = ImageCms.applyTransform(pil_image, transform)
-            
-            # 转换为pixmap
-            return converted_image
+            profiles = lambda: (_builtin_srgb_bytes(), Path(icc_path).read_bytes())
+            return self._apply_transform(pil_image, ("sRGB", icc_path, intent), build, in_place, profiles)
             
         except FileNotFoundError as e:
             print(f"ICC配置文件错误: {str(e)}")
@@ -125,11 +230,12 @@ class ColorSpaceConverter:
             return pil_image  # 返回原图
 
 
-    def get_pilimg_sRGB(self, pil_image):
+    def get_pilimg_sRGB(self, pil_image, in_place=False):
         """
         该函数主要是实现了一个将pil格式图片转换到sRGB色域空间的功能.
         Args:
             pil_image (Image.Image): pil_image = Image.open(path).
+            in_place (bool): 是否直接修改pil_image(方向校正及色域转换), 传入刚打开的图片时使用, 省去整图复制.
         Returns:
             Image.Image: 返回转换到sRGB色域的pil_image.
         """
@@ -139,31 +245,61 @@ class ColorSpaceConverter:
                 raise ValueError(f"传入的pil_image为None或者格式不对")
 
             # 设置自动校准图片方向信息    
-            pil_image = ImageOps.exif_transpose(pil_image)
+            if in_place:
+                ImageOps.exif_transpose(pil_image, in_place=True)
+            else:
+                pil_image, in_place = ImageOps.exif_transpose(pil_image), True
 
             # 尝试读取图片的ICC配置文件并转换到sRGB色域
             if 'icc_profile' in pil_image.info:
-                # 从图片中获取ICC配置文件
+                # 从图片中获取ICC配置文件，同一相机拍摄的图片内嵌的ICC相同，按内容哈希复用转换器
                 icc_profile = pil_image.info['icc_profile']
-                # 创建源色彩空间配置文件
-                src_profile = ImageCms.ImageCmsProfile(BytesIO(icc_profile))
-                # 创建sRGB色彩空间配置文件（作为中间转换空间）
-                srgb_profile = ImageCms.createProfile('sRGB')
-                # 创建从sRGB到源色彩空间的转换器
-                transform = ImageCms.buildTransform(
-                    src_profile,    # 源配置文件（原始ICC）
-                    srgb_profile,   # 目标配置文件（sRGB）
-                    'RGB',          # 输入模式
-                    'RGB'           # 输出模式
-                )
+                def build(mode):
+                    return ImageCms.buildTransform(
+                        ImageCms.ImageCmsProfile(BytesIO(icc_profile)),     # 源配置文件（原始ICC）
+                        ImageCms.createProfile('sRGB'),                     # 目标配置文件（sRGB）
+                        mode,   # 输入模式
+                        mode    # 输出模式
+                    )
 
                 # 应用转换
-                pil_image = ImageCms.applyTransform(pil_image, transform)
+                key = (hashlib.sha1(icc_profile).hexdigest(), "sRGB", "Perceptual")
+                profiles = lambda: (icc_profile, _builtin_srgb_bytes())
+                pil_image = self._apply_transform(pil_image, key, build, in_place, profiles)
 
             return pil_image
         except Exception as e:
             print(f"[get_pilimg_sRGB]-->error: {str(e)}")
+
+    def convert_rgb(self, rgb, target_profile, intent="Perceptual"):
+        """
+        将sRGB的 HxWx3 numpy数组转换到目标色域, 返回新的numpy数组.
+        启用numpy引擎时直接按行分块并行转换, 不经过PIL图像; 否则使用LittleCMS转换.
+        """
+        if self.icc_files.get(target_profile) is not None:
+            icc_path = self.icc_files[target_profile].as_posix()
+            profiles = lambda: (_builtin_srgb_bytes(), Path(icc_path).read_bytes())
+            matrix_transform = self._matrix_transform(("sRGB", icc_path, intent), profiles, intent)
+            if matrix_transform is not None:
+                return matrix_transform.apply(rgb, parallel=True)
+        converted = self.convert_color_space(Image.fromarray(rgb), target_profile, intent, in_place=True)
+        return np.asarray(converted.convert('RGB'))
             
 
         
-        
\ No newline at end of file
+        
+
+# 子进程中复用的转换器实例，避免每次转换都重新加载ICC文件
+_process_converter = None
+
+
+def convert_rgb_array(rgb, target_profile, intent="Perceptual"):
+    """
+    将sRGB的 HxWx3 numpy数组转换到目标色域, 返回转换后的numpy数组.
+    模块级函数, 可被pickle后交给进程池执行, 见 TaskScheduler.run_in_process().
+    子进程中固定使用LittleCMS引擎; numpy引擎计算时释放GIL, 直接在线程中转换, 不经过进程池.
+    """
+    global _process_converter
+    if _process_converter is None:
+        _process_converter = ColorSpaceConverter()
+    return _process_converter.convert_rgb(rgb, target_profile, intent)
@@ -0,0 +1,71 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :playback_clock.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频播放时钟, 按单调时钟和播放速度给出当前应显示的媒体时间(毫秒)
+
+原方案每个 FrameReader 以上次发送帧的时刻控制节奏, 解码耗时的抖动直接变成播放卡顿.
+播放时钟与解码无关: 媒体时间 = 起点 + (单调时钟 - 起始时刻) * 速度, 显示端按时间戳取帧,
+解码慢了只会丢帧, 不会拖慢整体进度.
+'''
+
+import time
+import threading
+
+
+class PlaybackClock:
+    """可暂停、可变速、可跳转的媒体时钟, 线程安全"""
+
+    def __init__(self, speed: float = 1.0):
+        self._lock = threading.Lock()
+        self._origin_media = 0.0            # 起始时刻的媒体时间(毫秒)
+        self._origin_wall = time.monotonic()
+        self._speed = speed
+        self._paused = True
+
+    def now(self) -> float:
+        """当前媒体时间(毫秒)"""
+        with self._lock:
+            return self._now()
+
+    def _now(self) -> float:
+        if self._paused:
+            return self._origin_media
+        return self._origin_media + (time.monotonic() - self._origin_wall) * 1000 * self._speed
+
+    def _rebase(self, media_ms: float) -> None:
+        self._origin_media = media_ms
+        self._origin_wall = time.monotonic()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    def set_time(self, media_ms: float) -> None:
+        """跳转到指定媒体时间, 不改变暂停状态"""
+        with self._lock:
+            self._rebase(float(media_ms))
+
+    def set_speed(self, speed: float) -> None:
+        """设置播放速度, 当前媒体时间保持不变"""
+        with self._lock:
+            self._rebase(self._now())
+            self._speed = float(speed)
+
+    def pause(self) -> None:
+        with self._lock:
+            if not self._paused:
+                self._rebase(self._now())
+                self._paused = True
+
+    def resume(self) -> None:
+        with self._lock:
+            if self._paused:
+                self._rebase(self._origin_media)
+                self._paused = False
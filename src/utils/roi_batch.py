@@ -0,0 +1,149 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :roi_batch.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :看图子界面多张图片ROI统计的批量计算与CSV导出
+
+ROI同步模式下一个ROI按归一化图像坐标映射到所有图片, 所有图片的统计信息在一次批量请求中计算:
+    - 所有图片的积分图都已构建时直接查询(每张图片 O(1)), 在主线程返回结果
+    - 否则提交一个任务并行构建积分图后查询, 同一时间只有一个任务在执行,
+      执行期间的新请求只保留最新的一个, 过期的结果直接丢弃
+'''
+
+import csv
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from src.utils.task_scheduler import get_scheduler, PRIORITY_VISIBLE
+
+# 导出CSV的表头, 每张图片一行
+CSV_HEADER = ["时间", "分组", "图片序号", "图片路径", "x1", "y1", "x2", "y2", "宽", "高",
+              "亮度", "对比度", "R", "G", "B", "L", "A", "B(LAB)", "R/G", "B/G"]
+
+
+def normalize_rect(rect, width, height):
+    """像素矩形 (x1, y1, x2, y2) 转换为相对图像宽高的归一化坐标"""
+    x1, y1, x2, y2 = rect
+    return x1 / width, y1 / height, x2 / width, y2 / height
+
+
+def denormalize_rect(norm_rect, width, height):
+    """归一化坐标转换为像素矩形 (x1, y1, x2, y2), 限制在图像范围内"""
+    nx1, ny1, nx2, ny2 = norm_rect
+    x1 = max(0, min(width - 1, int(round(nx1 * width))))
+    y1 = max(0, min(height - 1, int(round(ny1 * height))))
+    x2 = max(x1 + 1, min(width, int(round(nx2 * width))))
+    y2 = max(y1 + 1, min(height, int(round(ny2 * height))))
+    return x1, y1, x2, y2
+
+
+def _region_stats(item):
+    """单张图片的ROI统计, item 为 (DecodedImage, 像素矩形), 缺少图像时返回None"""
+    decoded, rect = item
+    if decoded is None or rect is None:
+        return None
+    return decoded.integral_stats().region_stats(*rect)
+
+
+class RoiStatsBatch:
+    """合并多张图片的ROI统计请求, 只回调最新一次请求的结果"""
+
+    def __init__(self, on_done: Callable[[int, list], None]):
+        """
+        Args:
+            on_done: 异步计算完成时在工作线程中调用 on_done(批次号, 结果列表), 调用方需自行切回主线程.
+        """
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = None        # 执行期间到达的最新请求 (批次号, items)
+        self._running = False
+
+    @property
+    def generation(self) -> int:
+        """最新请求的批次号, 结果的批次号与之不同时说明已过期"""
+        return self._generation
+
+    def request(self, items) -> Optional[list]:
+        """
+        提交一次批量统计请求.
+        Args:
+            items: [(DecodedImage, (x1, y1, x2, y2)), ...], 每张图片一项.
+        Returns:
+            list: 所有积分图都已构建时直接返回结果列表; 否则返回None, 结果通过 on_done 回调.
+        """
+        ready = all(decoded is None or decoded.has_integral_stats for decoded, _ in items)
+        with self._lock:
+            self._generation += 1
+            if not ready:
+                self._pending = (self._generation, items)
+                if self._running:
+                    return None
+                self._running = True
+        if ready:
+            return [_region_stats(item) for item in items]
+        self._launch()
+        return None
+
+    def cancel(self):
+        """丢弃尚未执行的请求, 正在执行的请求完成后结果也不再回调"""
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+
+    def _launch(self):
+        with self._lock:
+            if self._pending is None:
+                self._running = False
+                return
+            generation, items = self._pending
+            self._pending = None
+        future = get_scheduler().submit(self._run, items, priority=PRIORITY_VISIBLE)
+        future.add_done_callback(lambda f: self._finish(generation, f))
+
+    @staticmethod
+    def _run(items):
+        # 各图片的积分图并行构建
+        return get_scheduler().map(_region_stats, items, priority=PRIORITY_VISIBLE, caller_runs=True)
+
+    def _finish(self, generation, future):
+        try:
+            if not future.cancelled() and future.exception() is None and generation == self._generation:
+                self._on_done(generation, future.result())
+        except Exception as e:
+            print(f"[RoiStatsBatch]-->error: 回调ROI统计结果失败: {e}")
+        finally:
+            self._launch()
+
+
+def export_roi_csv(csv_path, group, rows):
+    """
+    追加导出ROI统计信息, 文件不存在时先写入BOM和表头, Excel可直接打开.
+    Args:
+        csv_path: CSV文件路径.
+        group: 图片组标识(如第一张图片的序号).
+        rows: [(图片序号, 图片路径, 像素矩形, 统计信息字典), ...].
+    Returns:
+        int: 写入的行数.
+    """
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    write_header = not os.path.exists(csv_path)
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    count = 0
+    # utf-8-sig 每次打开都会写入BOM, 只在新建文件时使用
+    with open(csv_path, 'a', newline='', encoding='utf-8-sig' if write_header else 'utf-8') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(CSV_HEADER)
+        for index, path, rect, stats in rows:
+            if not stats:
+                continue
+            writer.writerow([now, group, index, path, *rect, stats['width'], stats['height'],
+                             stats['avg_brightness'], stats['contrast'], *stats['avg_rgb'], *stats['avg_lab'],
+                             stats['R_G'], stats['B_G']])
+            count += 1
+    return count
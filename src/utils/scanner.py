@@ -0,0 +1,159 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :scanner.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :后台扫描文件夹, 按文件夹逐列发出结果, 支持取消
+
+非极简模式下需要读取每张图片的宽高、曝光时间、ISO, 在主线程执行会导致界面卡顿,
+FolderScanner 在线程池中执行扫描, 每扫描完一个文件夹就通过信号发出该列的结果,
+主界面据此逐列填充表格.
+读取到的图片信息写入元数据索引(metadata_index), 文件未修改时再次扫描直接读取索引.
+'''
+
+import os
+import threading
+
+from PyQt5.QtCore import QRunnable, QObject, pyqtSignal
+
+from src.utils.exif_header import read_metadata_batch
+from src.utils.metadata_index import get_metadata_index, make_meta_key
+from src.utils.sort import sort_by_custom
+
+
+class ScanCancelled(Exception):
+    """扫描被取消"""
+
+
+def scan_folder(folder, selected_option, sort_option, simple_mode, image_formats, video_formats,
+                progress_callback=None, cancel_event=None, workers=None):
+    """
+    该函数主要是实现了扫描单个文件夹并按选项过滤、排序文件的功能.
+    Args:
+        folder (str): 文件夹路径.
+        selected_option (str): 文件类型选项, 显示图片文件/显示视频文件/显示所有文件.
+        sort_option (str): 排序选项.
+        simple_mode (bool): 极简模式下不读取图片的宽高、曝光时间、ISO.
+        image_formats (tuple): 图片文件后缀.
+        video_formats (tuple): 视频文件后缀.
+        progress_callback (callable): 进度回调 progress_callback(当前, 总数).
+        cancel_event (threading.Event): 置位后抛出 ScanCancelled 结束扫描.
+        workers (int): 读取图片信息的线程数, 默认取CPU核心数且不超过8.
+    Returns:
+        tuple: (文件信息列表, 文件路径列表)
+        文件信息为 (文件名称, 创建时间, 修改时间, 文件大小, (宽, 高), 曝光时间, ISO, 文件路径)
+    """
+    files_and_dirs_with_mtime = []
+
+    # 使用 os.scandir() 获取文件夹中的条目，比os.listdir()更高效
+    with os.scandir(folder) as entries:
+        if selected_option == "显示图片文件":
+            matched = [entry for entry in entries if entry.is_file() and entry.name.lower().endswith(image_formats)]
+        elif selected_option == "显示视频文件":
+            matched = [entry for entry in entries if entry.is_file() and entry.name.lower().endswith(video_formats)]
+        elif selected_option == "显示所有文件":
+            matched = [entry for entry in entries if entry.is_file()]
+        else: # 没有选择任何选项就跳过
+            print("[scan_folder]-->selected_option没有选择任何选项,跳过")
+            matched = []
+
+    total = len(matched)
+    read_image_info = selected_option == "显示图片文件" and not simple_mode
+
+    # 每个文件只stat一次, 非极简模式下批量查询元数据索引, 命中的文件不再读取
+    entry_stats = [entry.stat() for entry in matched]
+    metadata = {}
+    if read_image_info:
+        meta_keys = [make_meta_key(entry.path, entry_stat) for entry, entry_stat in zip(matched, entry_stats)]
+        metadata = get_metadata_index().get_many(meta_keys)
+
+        # 索引未命中的文件多线程只读取文件头获取宽高、曝光时间、ISO
+        missed = [(key, entry_stat) for key, entry_stat in zip(meta_keys, entry_stats) if key[0] not in metadata]
+        if missed:
+            read = read_metadata_batch([key[0] for key, _ in missed], workers=workers, cancel_event=cancel_event,
+                                       progress_callback=progress_callback)
+            metadata.update(read)
+            # 已读取的元数据写入索引, 扫描被取消时也保留, 下次扫描无需重复读取
+            get_metadata_index().put_many([(key, entry_stat.st_ctime, read[key[0]])
+                                           for key, entry_stat in missed if key[0] in read])
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise ScanCancelled(folder)
+
+    for entry, entry_stat in zip(matched, entry_stats):
+        # 非极简模式下的图片宽度、高度、曝光时间、ISO
+        width, height, exposure_time, iso = metadata.get(entry.path, (None, None, None, None))
+
+        # 文件名称、创建时间、修改时间、文件大小、分辨率、曝光时间、ISO、文件路径
+        files_and_dirs_with_mtime.append((entry.name, entry_stat.st_ctime, entry_stat.st_mtime, entry_stat.st_size,
+                                          (width, height), exposure_time, iso, entry.path))
+
+    if progress_callback is not None:
+        progress_callback(total, total)
+
+    # 使用sort_by_custom函数进行排序
+    files_and_dirs_with_mtime = sort_by_custom(sort_option, files_and_dirs_with_mtime, simple_mode, selected_option)
+
+    # 获取文件路径列表，files_and_dirs_with_mtime的最后一列
+    file_paths = [item[-1] for item in files_and_dirs_with_mtime]
+
+    return files_and_dirs_with_mtime, file_paths
+
+
+class ScanSignals(QObject):
+    """文件夹扫描线程信号类"""
+    folder_scanned = pyqtSignal(list, list, str)  # 单个文件夹扫描完成 (文件信息列表, 文件路径列表, 文件夹名)
+    progress = pyqtSignal(int, int, str)          # 进度信号 (当前, 总数, 文件夹名)
+    finished = pyqtSignal()                       # 全部扫描完成信号, 取消时不发出
+    error = pyqtSignal(str)                       # 错误信号
+
+
+class FolderScanner(QRunnable):
+    """后台文件夹扫描线程, 按文件夹顺序逐个扫描并发出结果"""
+    def __init__(self, folders, selected_option, sort_option, simple_mode, image_formats, video_formats,
+                 emit_empty=False):
+        super().__init__()
+        self.folders = folders
+        self.selected_option = selected_option
+        self.sort_option = sort_option
+        self.simple_mode = simple_mode
+        self.image_formats = image_formats
+        self.video_formats = video_formats
+        self.emit_empty = emit_empty    # 增量刷新时文件夹被清空也需要发出结果
+        self.signals = ScanSignals()
+        self._cancel_event = threading.Event()
+
+    def stop(self):
+        """取消扫描, 当前文件处理完后退出"""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            for folder in self.folders:
+                if self._cancel_event.is_set():
+                    return
+                dir_name = os.path.basename(folder)
+                if not os.path.exists(folder):
+                    if self.emit_empty:
+                        self.signals.folder_scanned.emit([], [], dir_name)
+                    continue
+
+                file_infos, file_paths = scan_folder(
+                    folder, self.selected_option, self.sort_option, self.simple_mode,
+                    self.image_formats, self.video_formats,
+                    progress_callback=lambda current, total: self.signals.progress.emit(current, total, dir_name),
+                    cancel_event=self._cancel_event)
+
+                if self._cancel_event.is_set():
+                    return
+                self.signals.progress.emit(len(file_infos), len(file_infos), dir_name)
+                if file_infos or self.emit_empty:  # 默认只发出非空列表
+                    self.signals.folder_scanned.emit(file_infos, file_paths, dir_name)
+
+            self.signals.finished.emit()
+
+        except ScanCancelled:
+            return
+        except Exception as e:
+            self.signals.error.emit(str(e))
@@ -0,0 +1,53 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :sqlite_store.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :SQLite(WAL模式)单文件存储基类, 图标存储和元数据索引共用
+
+每个线程持有独立的sqlite连接, close()统一关闭所有线程的连接
+'''
+
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SQLiteStore:
+    """SQLite存储基类, 子类通过 _SCHEMA 定义表结构"""
+
+    _SCHEMA = ""
+    # sqlite单条语句绑定参数个数上限为999, 批量查询按该大小分块
+    _QUERY_CHUNK = 300
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接, 首次调用时创建并初始化表结构"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """关闭所有线程的数据库连接, 删除数据库文件前必须调用"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,207 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :task_scheduler.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :全局任务调度器, 固定数量的工作线程按优先级执行图片解码等任务, 支持按标签取消
+
+原方案中看图子界面每次 set_images 创建 min(n, cpu_count()-2) 个线程, 每张图片内部又嵌套创建线程池生成派生图,
+图标预加载、后台预取也各自创建线程池, 多个线程池叠加后线程数远超CPU核数; 2核机器上 cpu_count()-2 为0还会直接报错.
+TaskScheduler 在整个程序中只有一个实例(get_scheduler()), 所有任务进入同一个优先级队列:
+    - PRIORITY_VISIBLE: 当前显示的图片组, 最先执行
+    - PRIORITY_PREFETCH: 后台预取的相邻图片组
+    - PRIORITY_ICON: 表格图标预加载
+同一优先级按提交顺序执行. 提交任务时可指定标签(tag), 用户切换到其它图片组后调用 cancel(tag) 取消尚未开始的任务.
+ImageCms 等需要长时间持有GIL的计算可通过 run_in_process() 交给可选的进程池执行.
+'''
+
+import os
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Hashable, Iterable, Optional
+
+# 任务优先级, 数值越小越先执行
+PRIORITY_VISIBLE = 0
+PRIORITY_PREFETCH = 10
+PRIORITY_ICON = 20
+
+
+def default_workers() -> int:
+    """默认工作线程数, 保留一个核给界面线程, 至少为1"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class TaskScheduler:
+    """全局优先级任务调度器"""
+
+    def __init__(self, workers: Optional[int] = None, use_process_pool: bool = False):
+        """
+        Args:
+            workers: 工作线程数, 默认 default_workers().
+            use_process_pool: 是否启用进程池执行 run_in_process() 提交的任务.
+        """
+        self.workers = max(1, int(workers or default_workers()))
+        self._heap = []                     # [(优先级, 序号, Future, 函数, 参数, 关键字参数, 标签)]
+        self._counter = itertools.count()
+        self._tags = {}                     # {标签: set(Future)}, 只记录未结束的任务
+        self._cond = threading.Condition()
+        self._threads = []
+        self._local = threading.local()     # 标记当前线程是否为工作线程
+        self._shutdown = False
+        self._use_process_pool = use_process_pool
+        self._process_pool = None
+        self._process_lock = threading.Lock()
+
+    def _ensure_threads(self) -> None:
+        """按需启动工作线程, 调用方需持有锁"""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"task_scheduler_{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_VISIBLE, tag: Hashable = None, **kwargs) -> Future:
+        """提交任务, 返回 concurrent.futures.Future"""
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("TaskScheduler已关闭")
+            heapq.heappush(self._heap, (priority, next(self._counter), future, fn, args, kwargs, tag))
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(future)
+                future.add_done_callback(lambda f, tag=tag: self._forget(tag, f))
+            self._ensure_threads()
+            self._cond.notify()
+        return future
+
+    def map(self, fn: Callable, iterable: Iterable, priority: int = PRIORITY_VISIBLE, tag: Hashable = None,
+            caller_runs: bool = False) -> list:
+        """并行执行 fn(item) 并按顺序返回结果, 任一任务被取消时抛出 concurrent.futures.CancelledError
+
+        在工作线程中调用时直接顺序执行, 避免工作线程全部阻塞在等待子任务上导致死锁.
+        caller_runs 为True时调用线程也参与执行: 从后往前取出尚未被工作线程开始的任务直接执行,
+        工作线程都在执行耗时的低优先级任务时, 调用线程也不会一直等待; 调用线程只等待已经开始执行的任务,
+        因此在工作线程中也可以并行执行.
+        """
+        items = list(iterable)
+        if len(items) <= 1 or (self.in_worker() and not caller_runs):
+            return [fn(item) for item in items]
+        futures = [self.submit(fn, item, priority=priority, tag=tag) for item in items]
+        try:
+            inline = {}
+            if caller_runs:
+                for i in reversed(range(len(items))):
+                    if futures[i].cancel():
+                        inline[i] = fn(items[i])
+            return [inline[i] if i in inline else future.result() for i, future in enumerate(futures)]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def cancel(self, tag: Hashable) -> int:
+        """取消指定标签下尚未开始的任务, 返回取消的任务数; 已开始的任务会继续执行完"""
+        with self._cond:
+            futures = list(self._tags.get(tag, ()))
+        return sum(1 for future in futures if future.cancel())
+
+    def _forget(self, tag: Hashable, future: Future) -> None:
+        with self._cond:
+            if (futures := self._tags.get(tag)) is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._tags[tag]
+
+    def in_worker(self) -> bool:
+        """当前线程是否为调度器的工作线程"""
+        return getattr(self._local, "is_worker", False)
+
+    def _worker(self) -> None:
+        self._local.is_worker = True
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown and not self._heap:
+                    return
+                _, _, future, fn, args, kwargs, _ = heapq.heappop(self._heap)
+            # 已取消的任务直接跳过
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    @property
+    def uses_process_pool(self) -> bool:
+        return self._use_process_pool
+
+    def set_process_pool(self, enabled: bool) -> None:
+        """启用/关闭进程池, 关闭时释放已创建的子进程"""
+        with self._process_lock:
+            self._use_process_pool = bool(enabled)
+            if not enabled and self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+    def run_in_process(self, fn: Callable, *args):
+        """在进程池中执行 fn(*args) 并等待结果, 未启用进程池时在当前线程执行
+
+        fn 及参数需可被pickle, 适用于 ImageCms 等持有GIL的长时间计算.
+        """
+        with self._process_lock:
+            if self._use_process_pool and self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.workers)
+            pool = self._process_pool
+        if pool is None:
+            return fn(*args)
+        return pool.submit(fn, *args).result()
+
+    def shutdown(self) -> None:
+        """取消所有未开始的任务并停止工作线程, 不等待正在执行的任务"""
+        with self._cond:
+            self._shutdown = True
+            pending, self._heap = self._heap, []
+            self._cond.notify_all()
+        for item in pending:
+            item[2].cancel()
+        self.set_process_pool(False)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> TaskScheduler:
+    """获取全局任务调度器, 首次调用时创建"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = TaskScheduler()
+    return _scheduler
+
+
+def configure_scheduler(workers: Optional[int] = None, use_process_pool: bool = False) -> TaskScheduler:
+    """按设置调整全局任务调度器, 工作线程数只能在首次提交任务前调整"""
+    scheduler = get_scheduler()
+    with scheduler._cond:
+        if not scheduler._threads and workers:
+            scheduler.workers = max(1, int(workers))
+    scheduler.set_process_pool(use_process_pool)
+    return scheduler
+
+
+def shutdown_scheduler() -> None:
+    """程序退出时关闭全局任务调度器"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.shutdown()
+            _scheduler = None
+
@@ -0,0 +1,135 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :thumbnail.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :分级解码图标缩略图, 避免为48x48的图标完整解码整张大图
+
+解码顺序:
+1. embedded: 使用文件自带的缩略图(JPEG/TIFF的EXIF IFD1缩略图, HEIC的缩略图项)
+2. draft:    JPEG使用PIL的draft()在DCT阶段按1/2、1/4、1/8缩放解码
+3. 以上都失败时返回None, 由调用方继续使用QImageReader缩放读取或完整解码
+'''
+
+import io
+from pathlib import Path
+from typing import Optional, Tuple
+
+import piexif
+from PIL import Image, ImageOps
+
+
+# 解码级别名称
+TIER_EMBEDDED = "embedded"   # 内嵌缩略图
+TIER_DRAFT = "draft"         # JPEG DCT缩放解码
+TIER_READER = "reader"       # QImageReader缩放读取
+TIER_FULL = "full"           # 完整解码
+
+# 支持读取EXIF内嵌缩略图的格式
+EMBEDDED_THUMB_FORMATS = ('.jpg', '.jpeg', '.tif', '.tiff', '.webp')
+
+# EXIF方向值对应的旋转/翻转操作, 与ImageOps.exif_transpose保持一致
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def _apply_orientation(image: Image.Image, orientation: Optional[int]) -> Image.Image:
+    """按主图的EXIF方向值旋转缩略图, 内嵌缩略图本身不带方向信息"""
+    method = _ORIENTATION_TRANSPOSE.get(orientation)
+    return image.transpose(method) if method is not None else image
+
+
+def _fit(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """转换为RGB并等比例缩放到size以内"""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def _is_large_enough(image_size: Tuple[int, int], size: Tuple[int, int]) -> bool:
+    """缩略图的长边不小于目标尺寸的长边才使用, 避免图标被放大变糊"""
+    return max(image_size) >= max(size)
+
+
+def _load_exif_thumbnail(file_path: str, img: Image.Image, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """读取JPEG/TIFF/WebP的EXIF IFD1内嵌缩略图"""
+    try:
+        # JPEG/WebP的EXIF在打开文件头时已读取, TIFF需要piexif自行解析文件
+        exif_bytes = img.info.get("exif")
+        exif_dict = piexif.load(exif_bytes if exif_bytes else file_path)
+    except Exception:
+        return None
+
+    thumb_bytes = exif_dict.get("thumbnail")
+    if not thumb_bytes:
+        return None
+
+    thumb = Image.open(io.BytesIO(thumb_bytes))
+    if not _is_large_enough(thumb.size, size):
+        return None
+    thumb.load()
+    orientation = exif_dict.get("0th", {}).get(piexif.ImageIFD.Orientation)
+    return _fit(_apply_orientation(thumb, orientation), size)
+
+
+def _load_heic_thumbnail(file_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """读取HEIC文件中的缩略图项, HEIC缩略图已按主图方向存储"""
+    try:
+        from pillow_heif import open_heif
+        heif_file = open_heif(file_path)
+        if not heif_file.info.get("thumbnails"):
+            return None
+        thumb = heif_file[heif_file.primary_index].get_thumbnail(0).to_pillow()
+    except Exception:
+        return None
+
+    if not _is_large_enough(thumb.size, size):
+        return None
+    return _fit(thumb, size)
+
+
+def _load_jpeg_draft(img: Image.Image, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """JPEG在DCT阶段按比例缩小解码, 解码尺寸不小于目标尺寸"""
+    if img.format != 'JPEG':
+        return None
+    img.draft('RGB', size)
+    img.load()
+    return _fit(ImageOps.exif_transpose(img), size)
+
+
+def load_icon_image(file_path: str, size: Tuple[int, int] = (48, 48)) -> Tuple[Optional[Image.Image], Optional[str]]:
+    """
+    该函数主要是实现了按代价从低到高分级解码图标的功能.
+    Args:
+        file_path (str): 传入文件绝对路径.
+        size (tuple): 图标最大尺寸 (width, height).
+    Returns:
+        tuple: (PIL图像, 解码级别), 快速路径都不可用时返回 (None, None)
+    """
+    file_ext = Path(file_path).suffix.lower()
+    try:
+        if file_ext == '.heic':
+            if (image := _load_heic_thumbnail(file_path, size)) is not None:
+                return image, TIER_EMBEDDED
+            return None, None
+
+        with Image.open(file_path) as img:
+            if file_ext in EMBEDDED_THUMB_FORMATS:
+                if (image := _load_exif_thumbnail(file_path, img, size)) is not None:
+                    return image, TIER_EMBEDDED
+            if (image := _load_jpeg_draft(img, size)) is not None:
+                return image, TIER_DRAFT
+
+    except Exception as e:
+        print(f"[load_icon_image]-->warning: 快速解码图标失败--{file_path}: {e}")
+
+    return None, None
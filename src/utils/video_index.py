@@ -0,0 +1,125 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :video_index.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频关键帧/时间戳索引, 在后台构建并按 (路径, 修改时间, 文件大小) 缓存到元数据索引
+
+FrameReader.seek/seek_time 和 FrameFinderThread 原先依赖 CAP_PROP_POS_FRAMES/CAP_PROP_POS_MSEC 定位,
+长GOP的H.264/HEVC上既慢又不准, 失败后还会从第0帧顺序读取. VideoIndex:
+    - 以原始数据包模式(CAP_PROP_FORMAT=-1, 不解码)读取一遍视频, 记录每帧的时间戳及是否为关键帧, 1800帧约15ms
+    - 时间戳排序后即为显示顺序, 帧号与时间戳一一对应, 可变帧率的视频也能按时间准确换算帧号
+    - FrameSource 定位时跳到目标帧之前最近的关键帧, 以解码后第一帧的时间戳在索引中查出实际帧号,
+      再顺序解码到目标帧, 帧号准确且延迟不超过一个GOP的解码时间
+'''
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from src.utils.metadata_index import get_metadata_index, make_meta_key
+from src.utils.task_scheduler import get_scheduler, PRIORITY_PREFETCH
+
+
+class VideoIndex:
+    """视频逐帧时间戳及关键帧帧号, 帧号按显示顺序从0开始"""
+
+    def __init__(self, pts_ms: np.ndarray, keyframes: np.ndarray):
+        """
+        Args:
+            pts_ms: 按显示顺序排列的逐帧时间戳(毫秒), 严格递增.
+            keyframes: 关键帧的帧号, 升序且包含0.
+        """
+        self.pts_ms = pts_ms
+        self.keyframes = keyframes
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts_ms)
+
+    def _clamp(self, index) -> int:
+        return max(0, min(self.frame_count - 1, int(index)))
+
+    def time_ms(self, index: int) -> float:
+        """帧号对应的时间(毫秒), 以第一帧为0"""
+        return float(self.pts_ms[self._clamp(index)] - self.pts_ms[0])
+
+    def index_at(self, time_ms: float) -> int:
+        """时间(毫秒, 以第一帧为0)处正在显示的帧号"""
+        return self.index_of_pts(time_ms + self.pts_ms[0])
+
+    def index_of_pts(self, pts_ms: float) -> int:
+        """解码器报告的时间戳(CAP_PROP_POS_MSEC)对应的帧号, 容许半毫秒的舍入误差"""
+        return self._clamp(np.searchsorted(self.pts_ms, pts_ms + 0.5, side='right') - 1)
+
+    def keyframe_before(self, index: int) -> int:
+        """index 及之前最近的关键帧帧号"""
+        return int(self.keyframes[max(0, np.searchsorted(self.keyframes, index, side='right') - 1)])
+
+
+def scan_video_index(video_path) -> Optional[VideoIndex]:
+    """以原始数据包模式扫描视频, 容器没有可用时间戳时返回None"""
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    if not cap.isOpened():
+        print(f"[scan_video_index]-->error: 无法以原始数据包模式打开视频: {video_path}")
+        return None
+    pts, keys = [], []
+    try:
+        while cap.grab():
+            pts.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+            keys.append(cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME) > 0)
+    finally:
+        cap.release()
+    if not pts:
+        return None
+    # 数据包按解码顺序排列, 有B帧时按时间戳排序得到显示顺序
+    pts = np.asarray(pts, dtype=np.float64)
+    order = np.argsort(pts, kind='stable')
+    pts = pts[order]
+    if len(pts) > 1 and not np.all(np.diff(pts) > 0):
+        print(f"[scan_video_index]-->warning: 视频时间戳不可用, 不建立索引: {video_path}")
+        return None
+    keyframes = np.flatnonzero(np.asarray(keys)[order]).astype(np.int64)
+    if keyframes.size == 0 or keyframes[0] != 0:
+        keyframes = np.concatenate(([0], keyframes)).astype(np.int64)
+    return VideoIndex(pts, keyframes)
+
+
+def load_video_index(video_path) -> Optional[VideoIndex]:
+    """获取视频索引, 元数据索引中有 (路径, 修改时间, 文件大小) 一致的记录时直接返回, 否则扫描后写入"""
+    try:
+        key = make_meta_key(video_path, os.stat(video_path))
+    except OSError as e:
+        print(f"[load_video_index]-->error: 读取文件信息失败--{video_path}: {e}")
+        return None
+    if (cached := get_metadata_index().get_video_index(key)) is not None:
+        return VideoIndex(*cached)
+    index = scan_video_index(video_path)
+    if index is not None:
+        get_metadata_index().put_video_index(key, index.pts_ms, index.keyframes)
+    return index
+
+
+_pending = {}               # {视频路径: Future}, 同一视频只构建一次
+_pending_lock = threading.Lock()
+
+
+def request_video_index(video_path) -> Future:
+    """在后台构建视频索引, 返回结果为 VideoIndex 或None的 Future; 同一视频正在构建时返回同一个 Future"""
+    with _pending_lock:
+        if (future := _pending.get(video_path)) is not None:
+            return future
+        future = get_scheduler().submit(load_video_index, video_path, priority=PRIORITY_PREFETCH)
+        _pending[video_path] = future
+
+    def forget(f):
+        with _pending_lock:
+            if _pending.get(video_path) is f:
+                del _pending[video_path]
+    future.add_done_callback(forget)
+    return future
@@ -18,8 +18,6 @@ import time
 import json
 import pathlib
 import threading
-from multiprocessing import cpu_count
-from concurrent.futures import ThreadPoolExecutor
 
 """导入python第三方模块"""
 import cv2
@@ -29,16 +27,17 @@ import matplotlib.pyplot as plt
 from lxml import etree as ETT
 from PIL import Image, ImageOps
 from PyQt5.QtGui import QIcon, QColor, QPixmap, QKeySequence, QPainter, QCursor, QTransform, QImage, QPen, QBrush
-from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal, QThreadPool, QRunnable
+from PyQt5.QtCore import Qt, QTimer, QEvent, QRectF, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QHeaderView, QShortcut, QGraphicsView, QAction,
-    QGraphicsScene, QGraphicsPixmapItem, QMessageBox, QProgressBar, QGraphicsRectItem, QMenu,
+    QGraphicsScene, QMessageBox, QProgressBar, QGraphicsRectItem, QMenu,
     QGraphicsItem, QDialog)
 
 """导入自定义模块"""
 from src.components.ui_sub_image import Ui_MainWindow                   # 看图子界面，导入界面UI
 from src.components.custom_qMbox_showinfo import show_message_box       # 导入消息框类
 from src.components.custom_qdialog_problems import ProblemsDialog       # 导入问题对话框类
+from src.components.custom_qGraphicsItem_tiled import TiledImageItem    # 导入分块多分辨率图片项
 from src.common.settings_ColorAndExif import (load_exif_settings,       # 导入json配置模块
     load_color_settings)                                                
 from src.common.font_manager import SingleFontManager                   # 看图子界面，导入字体管理器
@@ -47,6 +46,13 @@ from src.utils.hisnot import WScreenshot                                # 看图
 from src.utils.aeboxlink import check_process_running, get_api_data     # 导入与AEBOX通信的模块函数
 from src.utils.heic import extract_jpg_from_heic                        # 导入heic图片转换为jpg图片的模块
 from src.utils.p3_converter import ColorSpaceConverter                  # 导入色彩空间转换配置类
+from src.utils.compare_prefetch import GroupPrefetcher, make_group_key  # 导入图片组预取缓存类
+from src.utils.decoded_image import DecodedImage, format_nbytes, decode_preview  # 导入共享内存的解码图像容器及预览图解码函数
+from src.utils.task_scheduler import get_scheduler, PRIORITY_VISIBLE, PRIORITY_PREFETCH  # 导入全局任务调度器
+from src.utils.histogram import cached_histograms, HISTOGRAM_STEP, MAX_HISTOGRAM_STEP  # 导入缓存的亮度及RGB直方图计算
+from src.utils.roi_batch import (RoiStatsBatch, normalize_rect,           # 导入多图ROI统计的批量计算及CSV导出
+                                 denormalize_rect, export_roi_csv)
+from src.utils.p3_converter import convert_rgb_array                    # 导入可在子进程中执行的色域转换函数
 from src.utils.decorator import CC_TimeDec                              # 导入自定义装饰器
 from src.utils.rectangleprogress import RectangleProgress               # 导入自定义进度条
 
@@ -355,25 +361,113 @@ class CustomGraphicsRectItem(QGraphicsRectItem):
     
 
 
-""""后台线程计算矩形框亮度等统计信息, 使用线程池管理"""
-class StatsTask(QRunnable):
-    def __init__(self, roi, callback):
-        super().__init__()
-        self.roi = roi
-        self.callback = callback
+"""单张图片的派生图像, 首次使用时生成并缓存"""
+class ImageVariants:
+    """
+    灰度图、Display-P3色域图、亮度统计信息、直方图按需生成, 每项只生成一次.
+    set_images只生成当前界面状态需要的项(当前色域、勾选的直方图/ROI信息), 其余在切换时再生成.
+    所有派生项都从同一个DecodedImage生成, 不再额外保留PIL图像和cv_img副本;
+    显示用的原图/灰度图/p3色域图均为QImage, 由TiledImageItem分块绘制, 不再上传整张QPixmap.
+    """
+    def __init__(self, decoded, p3_converter, histogram_func, path=None):
+        self.decoded = decoded
+        self.image = decoded.qimage()   # 直接包装解码内存的原图QImage
+        self.p3_converter = p3_converter
+        self.histogram_func = histogram_func
+        self.path = path                # 图片文件路径，直方图按路径及修改时间缓存
+        self._values = {}
+        self._locks = {}    # 每个派生项一把锁, 不同派生项可以并行生成
+
+    def _get(self, name, factory):
+        """获取派生项, 不存在时调用factory生成, 多线程同时请求时只生成一次"""
+        if name in self._values:
+            return self._values[name]
+        with self._locks.setdefault(name, threading.Lock()):
+            if name not in self._values:
+                self._values[name] = factory()
+            return self._values[name]
+
+    def is_ready(self, name):
+        return name in self._values
+
+    def gray_image(self):
+        def generate():
+            try:
+                # 直接包装灰度图内存，灰度图与直方图共用
+                return self.decoded.gray_qimage()
+            except Exception as e:
+                print(f"sGray转换失败: {str(e)}")
+                return self.image
+        return self._get('gray_image', generate)
 
-    def run(self):
-        """线程执行函数，计算统计信息"""
-        try:
-            stats = calculate_image_stats(self.roi, resize_factor=1)
-            self.callback(stats)
-        except Exception as e:
-            print(f"计算统计信息时出错: {e}")
-            self.callback({})
+    def p3_decoded(self):
+        """Display-P3色域的解码图像, 转换失败时返回原图"""
+        def generate():
+            try:
+                # 使用LittleCMS且启用进程池时在子进程中转换，避免ImageCms长时间占用GIL
+                scheduler = get_scheduler()
+                if scheduler.uses_process_pool and self.p3_converter.engine == "lcms":
+                    return DecodedImage(scheduler.run_in_process(
+                        convert_rgb_array, self.decoded.rgb, "Display-P3", "Relative Colorimetric"), self.decoded.exif)
+                # numpy引擎直接转换共享内存，计算时释放GIL并按行分块并行
+                return DecodedImage(self.p3_converter.convert_rgb(self.decoded.rgb, "Display-P3", intent="Relative Colorimetric"),
+                                    self.decoded.exif)
+            except Exception as e:
+                print(f"display-p3转换失败: {str(e)}")
+                return self.decoded
+        return self._get('p3_image', generate)
+
+    def p3_image(self):
+        return self.p3_decoded().qimage()
+
+    def stats(self):
+        """整图亮度统计信息, 先缩小再转换为BGR, 不复制整图"""
+        def generate():
+            try:
+                return calculate_image_stats(cv2.cvtColor(self.decoded.resized(0.1), cv2.COLOR_RGB2BGR), resize_factor=1)
+            except Exception as e:
+                print(f"亮度统计信息计算失败: {str(e)}")
+                return None
+        return self._get('stats', generate)
+
+    def stats_text(self):
+        """亮度统计信息文本, 末尾附带该图片当前占用的内存"""
+        memory = f"内存: {format_nbytes(self.nbytes())}"
+        if not (stats := self.stats()):
+            return memory
+        return f"亮度: {stats['avg_brightness']}\n对比度(L值标准差): {stats['contrast']}" \
+            f"\nLAB: {stats['avg_lab']}\nRGB: {stats['avg_rgb']}\nR/G: {stats['R_G']}  B/G: {stats['B_G']}\n{memory}"
+
+    def histogram(self):
+        def generate():
+            try:
+                return self.histogram_func(self.decoded, self.path)
+            except Exception as e:
+                print(f"直方图计算失败: {str(e)}")
+                return None
+        return self._get('histogram', generate)
+
+    def image_for(self, color_space_index):
+        """按色彩空间下拉框索引(0:sRGB、1:灰度图、2:p3色域图)获取显示用的QImage"""
+        if color_space_index == 1:
+            return self.gray_image()
+        if color_space_index == 2:
+            return self.p3_image()
+        return self.image
+
+    def nbytes(self):
+        """解码缓冲区及已生成的派生项占用的内存字节数"""
+        total = self.decoded.nbytes
+        if (p3 := self._values.get('p3_image')) is not None and p3 is not self.decoded:
+            total += p3.nbytes
+        return total
 
 
 """图片视图类"""
 class MyGraphicsView(QGraphicsView):
+    # ROI统计信息计算完成信号，工作线程中计算完成后回到主线程更新标签
+    roi_stats_ready = pyqtSignal(object)
+
     def __init__(self, scene, exif_text=None, stats_text=None, *args, **kwargs):
         super(MyGraphicsView, self).__init__(scene, *args, **kwargs)
         self.setRenderHint(QPainter.Antialiasing)
@@ -427,21 +521,25 @@ class MyGraphicsView(QGraphicsView):
 
         # 添加ROI矩形框相关属性
         self.selection_rect = None
-        self.original_image = None  # 存储原始OpenCV图像数据
+        self.decoded_image = None  # 存储解码图像(DecodedImage)，ROI统计时只复制框选区域
         self.selection_visible = False
         self.last_pos = None  # 记录鼠标右键拖动的起始位置
         self.move_step = 1.0  # 动态设置矩形框跟随鼠标移动步长
 
-        # 初始化线程池，用于计算ROI矩形框的统计信息
-        self.thread_pool = QThreadPool.globalInstance()
+        # ROI矩形框的统计信息由解码图像的积分图查询，积分图在全局任务调度器中构建，不占用Qt全局线程池(QImage平滑缩放等内部也会使用)
+        self._roi_stats_future = None   # 积分图构建完成前提交的ROI统计任务
+        self._roi_stats_dirty = False   # 任务执行期间ROI矩形框又发生了变化，完成后需重新统计
+        self.roi_stats_ready.connect(self._on_roi_stats_ready)
 
         # 初始更新标签位置
         self.update_labels_position()
         
 
-    def set_cv_image(self, cv_img):
-        """设置原始OpenCV图像用于统计计算"""
-        self.original_image = cv_img
+    def set_decoded_image(self, decoded):
+        """设置解码图像(DecodedImage)用于统计计算，ROI矩形框显示时提前构建积分图"""
+        self.decoded_image = decoded
+        if self.selection_visible and decoded is not None and not decoded.has_integral_stats:
+            get_scheduler().submit(decoded.integral_stats, priority=PRIORITY_VISIBLE)
 
     def toggle_selection_rect(self, visible):
         """切换选择框的显示状态"""
@@ -488,45 +586,100 @@ class MyGraphicsView(QGraphicsView):
 
     def update_roi_stats(self):
         """更新ROI区域的统计信息"""
-        if not self.selection_rect or self.original_image is None:
+        if not self.selection_rect or self.decoded_image is None:
             print("update_roi_stats error!")
             return
-        # 使用 QTimer 延迟调用，避免频繁计算
-        QTimer.singleShot(100, self._calculate_roi_stats)
+        # ROI同步模式下由看图界面按归一化坐标同步所有视图的ROI并批量统计
+        main_window = self.window()
+        if isinstance(main_window, SubMainWindow) and main_window.roi_sync_active:
+            main_window.request_roi_sync(self)
+            return
+        # 积分图已构建时直接查询，跟随拖动实时更新；否则使用 QTimer 延迟调用，避免频繁提交任务
+        if self.decoded_image.has_integral_stats:
+            self._calculate_roi_stats()
+        else:
+            QTimer.singleShot(100, self._calculate_roi_stats)
 
 
     def _calculate_roi_stats(self):
-        """提取 ROI 区域并启动线程计算统计信息"""
+        """查询 ROI 区域的统计信息，积分图未构建时在工作线程中构建后查询"""
         try:
-            if not self.selection_rect or self.original_image is None:
-                return
-
-            # 获取选择框在场景中的位置和大小
-            scene_rect = self.selection_rect.sceneBoundingRect()
-            
-            # 获取原始图像尺寸
-            img_h, img_w = self.original_image.shape[:2]
-            
-            # 转换场景坐标到图像坐标
-            x1 = max(0, min(img_w-1, int(scene_rect.left())))
-            y1 = max(0, min(img_h-1, int(scene_rect.top())))
-            x2 = max(0, min(img_w, int(scene_rect.right())))
-            y2 = max(0, min(img_h, int(scene_rect.bottom())))
-            
             # 确保有效的 ROI 区域
-            if x2 > x1 and y2 > y1:
-                # 提取 ROI 区域
-                roi = self.original_image[y1:y2, x1:x2]
-                
-                # 创建并启动新的任务
-                task = StatsTask(roi, self._update_stats_display)
+            if (rect := self.roi_pixel_rect()) is not None:
+                x1, y1, x2, y2 = rect
+                decoded = self.decoded_image
+                if decoded.has_integral_stats:
+                    self._update_stats_display(decoded.integral_stats().region_stats(x1, y1, x2, y2))
+                    return
+
+                # 已有任务在构建积分图时只记录变化，任务完成后按最新位置重新统计
+                if self._roi_stats_future is not None and not self._roi_stats_future.done():
+                    self._roi_stats_dirty = True
+                    return
 
-                self.thread_pool.start(task)
+                # 提交计算任务，在工作线程中不能直接更新标签，完成后通过信号回到主线程
+                self._roi_stats_future = get_scheduler().submit(
+                    lambda: decoded.integral_stats().region_stats(x1, y1, x2, y2), priority=PRIORITY_VISIBLE)
+                self._roi_stats_future.add_done_callback(self._on_roi_stats_done)
         except Exception as e:
             print(f"提取 ROI 区域时出错: {e}")
 
-    def _update_stats_display(self, stats):
-        """更新统计信息显示"""
+    def roi_pixel_rect(self):
+        """ROI矩形框在图像中的像素区域 (x1, y1, x2, y2)，没有ROI或区域无效时返回None"""
+        if not self.selection_rect or self.decoded_image is None:
+            return None
+
+        # 获取选择框在场景中的位置和大小，不含画笔宽度，与 set_roi_pixel_rect 设置的区域一致
+        scene_rect = self.selection_rect.mapRectToScene(self.selection_rect.rect())
+
+        # 获取原始图像尺寸
+        img_h, img_w = self.decoded_image.shape[:2]
+
+        # 转换场景坐标到图像坐标
+        x1 = max(0, min(img_w-1, int(scene_rect.left())))
+        y1 = max(0, min(img_h-1, int(scene_rect.top())))
+        x2 = max(0, min(img_w, int(scene_rect.right())))
+        y2 = max(0, min(img_h, int(scene_rect.bottom())))
+        return (x1, y1, x2, y2) if x2 > x1 and y2 > y1 else None
+
+    def set_roi_pixel_rect(self, rect):
+        """按像素区域设置ROI矩形框，不触发变化回调(ROI同步时由看图界面统一统计)"""
+        if not self.selection_rect:
+            return
+        x1, y1, x2, y2 = rect
+        callback, self.selection_rect.change_callback = self.selection_rect.change_callback, None
+        try:
+            self.selection_rect.setTransform(QTransform())
+            self.selection_rect.setPos(0, 0)
+            self.selection_rect.setRect(QRectF(x1, y1, x2 - x1, y2 - y1))
+        finally:
+            self.selection_rect.change_callback = callback
+
+    def _roi_peer_views(self):
+        """移动/缩放ROI时需要同样操作的其它视图，ROI同步模式下由看图界面按归一化坐标同步，返回空列表"""
+        main_window = self.window()
+        if not isinstance(main_window, SubMainWindow) or main_window.roi_sync_active:
+            return []
+        return [view for view in main_window.graphics_views if view and view is not self and view.selection_rect]
+
+    def _on_roi_stats_done(self, future):
+        """ROI统计任务完成(工作线程中调用)，发送信号到主线程更新显示"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self.roi_stats_ready.emit(future.result())
+        except RuntimeError:
+            pass  # 视图已被销毁
+
+    def _on_roi_stats_ready(self, stats):
+        """工作线程中的ROI统计完成(主线程)，期间矩形框变化过则按最新位置重新统计"""
+        self._update_stats_display(stats)
+        if self._roi_stats_dirty:
+            self._roi_stats_dirty = False
+            self._calculate_roi_stats()
+
+    def _update_stats_display(self, stats, reference=None):
+        """更新统计信息显示，reference 为ROI同步模式下第一张图片的统计信息，用于显示差值"""
         if not stats:
             return
 
@@ -542,6 +695,11 @@ class MyGraphicsView(QGraphicsView):
             f"(roi:{stats['width']}x{stats['height']})"
             # f"区域大小: {stats['width']}x{stats['height']}"
         )
+        if reference:
+            roi_stats += (
+                f"\n(对比图1 Δ亮度:{stats['avg_brightness'] - reference['avg_brightness']:+.1f} "
+                f"ΔR/G:{stats['R_G'] - reference['R_G']:+.5f} ΔB/G:{stats['B_G'] - reference['B_G']:+.5f})"
+            )
         self.set_stats_data(roi_stats)
 
 
@@ -599,12 +757,9 @@ class MyGraphicsView(QGraphicsView):
                 self.selection_rect.setY(scene_rect.bottom() - new_rect.height())
             
             # 同步其他视图的ROI大小和位置
-            main_window = self.window()
-            if isinstance(main_window, SubMainWindow):
-                for view in main_window.graphics_views:
-                    if view and view != self and view.selection_rect:
-                        view.selection_rect.setTransform(transform, True)
-                        view.update_roi_stats()
+            for view in self._roi_peer_views():
+                view.selection_rect.setTransform(transform, True)
+                view.update_roi_stats()
             
             # 更新当前视图的ROI统计信息
             self.update_roi_stats()
@@ -636,7 +791,7 @@ class MyGraphicsView(QGraphicsView):
 
 
     def set_histogram_data(self, histogram):
-        """设置直方图数据"""
+        """设置直方图数据，支持256项的亮度直方图或4x256的亮度及R/G/B直方图"""
         if histogram is None:
             self.histogram_label.setText("无直方图数据")
             return
@@ -644,13 +799,15 @@ class MyGraphicsView(QGraphicsView):
         try:
             plt.figure(figsize=(3, 2), dpi=100, facecolor='none', edgecolor='none')  # 设置背景透明
             ax = plt.gca()
-            # 计算相对频率
-            total_pixels = sum(histogram)
-            relative_frequency = [count / total_pixels for count in histogram]
-            ax.plot(range(len(relative_frequency)), relative_frequency, color='skyblue', linewidth=1)
-            ax.fill_between(range(len(relative_frequency)), relative_frequency, color='skyblue', alpha=0.7)            
+            # 计算相对频率，亮度直方图填充显示，R/G/B直方图用细线叠加
+            histograms = np.asarray(histogram, dtype=np.float64).reshape(-1, 256)
+            relative_frequency = histograms / max(histograms[0].sum(), 1)
+            ax.plot(range(256), relative_frequency[0], color='skyblue', linewidth=1)
+            ax.fill_between(range(256), relative_frequency[0], color='skyblue', alpha=0.7)
+            for channel, color in zip(relative_frequency[1:], ('red', 'limegreen', 'dodgerblue')):
+                ax.plot(range(256), channel, color=color, linewidth=0.8, alpha=0.9)
             ax.set_xlim(0, 255)
-            ax.set_ylim(0, max(relative_frequency)*1.1)
+            ax.set_ylim(0, max(relative_frequency.max(), 1e-6)*1.1)
             ax.yaxis.set_visible(False)  # 隐藏 Y 轴
             ax.xaxis.set_tick_params(labelsize=8)
             plt.tight_layout()
@@ -698,6 +855,14 @@ class MyGraphicsView(QGraphicsView):
         self.update_labels_position()
 
 
+    def set_exif_data(self, text: str = ""):
+        """设置EXIF信息的数据"""
+        self.exif_label.setText(text)
+        self.exif_label.adjustSize()  # 根据内容调整大小
+
+        self.update_labels_position()
+
+
     def set_stats_data(self, text: str = ""):
         """设置亮度统计信息的数据"""
         self.stats_label.setText(text)
@@ -777,12 +942,9 @@ class MyGraphicsView(QGraphicsView):
                     self.selection_rect.setPos(new_pos)
                     
                     # 同步其他视图的矩形框位置
-                    main_window = self.window()
-                    if isinstance(main_window, SubMainWindow):
-                        for view in main_window.graphics_views:
-                            if view and view != self and view.selection_rect:
-                                view.selection_rect.setPos(new_pos)
-                                view.update_roi_stats()
+                    for view in self._roi_peer_views():
+                        view.selection_rect.setPos(new_pos)
+                        view.update_roi_stats()
                     
                     event.accept()
                     return
@@ -812,11 +974,9 @@ class MyGraphicsView(QGraphicsView):
                     # Alt+左键移动，同步所有视图的ROI矩形框
                     delta = (event.pos() - self.last_pos)*self.move_step
                     self.last_pos = event.pos()
-                    main_window = self.window()
-                    if isinstance(main_window, SubMainWindow):
-                        for view in main_window.graphics_views:
-                            if view and view.selection_rect:
-                                view.selection_rect.moveBy(delta.x(), delta.y())
+                    for view in [self] + self._roi_peer_views():
+                        if view.selection_rect:
+                            view.selection_rect.moveBy(delta.x(), delta.y())
                     event.accept()
                 elif event.buttons() & Qt.RightButton and self.last_pos is not None:
                     # Alt+右键移动，只移动当前视图的ROI矩形框
@@ -882,6 +1042,8 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
     closed = pyqtSignal()
     ai_response_signal = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
+    image_processed = pyqtSignal(int, int, object)  # 后台完整处理完一张图片(加载批次, 图片序号, 处理结果)
+    roi_batch_ready = pyqtSignal(int, object)       # ROI同步模式下批量统计完成(批次号, 各图片的统计信息)
 
     def __init__(self, images_path_list, index_list=None, parent=None):
         super(SubMainWindow, self).__init__(parent)
@@ -922,26 +1084,51 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         """初始化相关类以及变量"""
 
         # 初始化p3_converter.py中的ColorSpaceConverter实例
-        self.p3_converter = ColorSpaceConverter()
+        self.p3_converter = ColorSpaceConverter(
+            engine=getattr(self.parent_window, "color_engine", "lcms") if self.parent_window else "lcms")
+
+        # 直方图取样步长，读取主界面设置，1为统计全部像素
+        step = getattr(self.parent_window, "histogram_step", HISTOGRAM_STEP) if self.parent_window else HISTOGRAM_STEP
+        self.histogram_step = max(1, min(MAX_HISTOGRAM_STEP, int(step)))
+
+        # 初始化上一组/下一组图片的预取缓存，内存预算读取主界面设置
+        prefetch_mb = getattr(self.parent_window, "compare_prefetch_mb", 1024) if self.parent_window else 0
+        self.group_prefetcher = GroupPrefetcher(
+            self._process_group, self._estimate_group_bytes, budget_bytes=prefetch_mb * 1024 * 1024,
+            cancel=get_scheduler().cancel)
 
         # 初始化SubMainWindow类中的一些列表属性
         self.exif_texts = []
         self.histograms = []
         self.original_rotation = []
         self.graphics_views = []
-        self.original_pixmaps = []
-        self.gray_pixmaps = []
-        self.p3_pixmaps = []
-        self.cv_imgs = []
-        self.pil_imgs = []
+        self.original_images = []
+        self.gray_images = []
+        self.p3_images = []
+        self.image_variants = []    # 每张图片的派生项(ImageVariants)，按需生成
         self.base_scales = []
         self._scales_min = []
 
+        # 初始化渐进加载状态：加载批次(切换图片组后丢弃旧批次的结果)、目标尺寸、各图片的处理结果及未完成数量
+        self._load_generation = 0
+        self._load_key = None
+        self._load_start_time = time.time()
+        self._target_dimensions = (1, 1, 1.0)
+        self._load_results = []
+        self._load_pending = 0
+
+        # 初始化ROI同步模式的批量统计：待同步的源视图、各视图的ROI像素区域及最新统计结果
+        self.roi_batch = RoiStatsBatch(self._on_roi_batch_done)
+        self._roi_sync_source = None
+        self._roi_rects = []
+        self._roi_results = []
+
         # 设置表格的宽高初始大小
         self.table_width_heigth_default = [2534,1376]
 
         # 初始化roi亮度等信息统计框标志位；全屏显示标志位; 看图界面更新状态标志位
         self.roi_selection_active = False 
+        self.roi_sync_active = False        # ROI同步模式：一个ROI按归一化坐标同步到所有图片并批量统计，在load_settings中配置
         self.is_fullscreen = False         
         self.is_updating = False          
 
@@ -1022,6 +1209,12 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         self.shortcut_rotate_left = QShortcut(QKeySequence("Ctrl+T"), self)
         self.shortcut_rotate_left.activated.connect(self.on_ctrl_t_pressed)
 
+        # 添加Ctrl+P键切换ROI同步模式，Ctrl+E键导出ROI统计信息到CSV
+        self.shortcut_ctrl_p = QShortcut(QKeySequence("Ctrl+P"), self)
+        self.shortcut_ctrl_p.activated.connect(self.on_ctrl_p_pressed)
+        self.shortcut_ctrl_e = QShortcut(QKeySequence("Ctrl+E"), self)
+        self.shortcut_ctrl_e.activated.connect(self.on_ctrl_e_pressed)
+
         """2. 连接复选框信号到槽函数"""
         # 连接复选框信号到槽函数
         self.checkBox_1.stateChanged.connect(self.toggle_histogram_info)  # 新增直方图显示
@@ -1045,6 +1238,12 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         # 连接进度条更新信号到槽函数
         if hasattr(self, 'progress_updated'):
             self.progress_updated.connect(self.update_progress)
+
+        # 连接后台图片处理完成信号到槽函数，逐张替换预览图
+        self.image_processed.connect(self._on_image_processed)
+
+        # 连接ROI批量统计完成信号到槽函数
+        self.roi_batch_ready.connect(self._on_roi_batch_ready)
         
             
     def set_stylesheet(self):
@@ -1237,8 +1436,8 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 qcolor = rgb_str_to_qcolor(self.background_color_table)
                 view.scene().setBackgroundBrush(QBrush(qcolor))
                 
-                # 更新EXIF标签
-                if hasattr(view, 'exif_label') and hasattr(view, 'exif_text'):
+                # 更新EXIF标签，仍在加载的视图在完整处理完成后更新
+                if hasattr(view, 'exif_label') and getattr(view, 'exif_text', None) is not None:
                     exif_info = self.process_exif_info(self.dict_exif_info_visibility, view.exif_text, False)
                     view.exif_label.setText(exif_info if exif_info else "解析不出exif信息!")
                     view.exif_label.setStyleSheet(f"color: {self.font_color_exif}; background-color: transparent; font-weight: 400;")
@@ -1334,9 +1533,13 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 print("[set_images]-->waring:主界面传入到看图子界面的图片路径和图片索引为None")
                 return False
 
+            # 用户在上一组完整加载完成前切换图片组时，按标签取消上一组尚未开始的任务，其结果也不再显示
+            self._cancel_loading()
+
             # 设置正在更新标志位，设置传入的图片数量
             print("开始更新图片...")
             self.is_updating, num_images = True, len(image_paths)
+            self._load_start_time = start_time_set_images
              
             # 更新当前显示的图片路径列表
             self.images_path_list, self.index_list = image_paths, index_list
@@ -1363,11 +1566,10 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 self.histograms = [None] * num_images
                 self.original_rotation = [None] * num_images
                 self.graphics_views = [None] * num_images
-                self.original_pixmaps = [None] * num_images  
-                self.gray_pixmaps = [None] * num_images  
-                self.p3_pixmaps = [None] * num_images
-                self.cv_imgs = [None] * num_images 
-                self.pil_imgs = [None] * num_images 
+                self.original_images = [None] * num_images  
+                self.gray_images = [None] * num_images  
+                self.p3_images = [None] * num_images
+                self.image_variants = [None] * num_images
                 self.base_scales = [None] * num_images
                 self._scales_min = [None] * num_images
 
@@ -1382,103 +1584,239 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 self.tableWidget_medium.setHorizontalHeaderLabels(folder_names) 
 
 
-                # 3. 使用线程池并行处理图片
-                self.progress_updated.emit(50)
-                # 使用并行解析图片的pil格式图、cv_img、histogram、pixmap、gray_pixmap、p3_pixmap以及exif等信息
-                with ThreadPoolExecutor(max_workers=min(len(image_paths), cpu_count() - 2)) as executor:
-                    futures = list(executor.map(self._process_image, enumerate(image_paths)))
-
-                # 4. 计算目标尺寸
-                target_width, target_height, avg_aspect_ratio = self._calculate_target_dimensions(futures)
-                
-
-                # 5. 批量更新UI, 更新进度条
-                self.progress_updated.emit(100)
-                for index, result in enumerate(futures):
-                    if result and result[1]:
-                        # 获取图片处理结果
-                        data = result[1]
-
-                        # 根据下拉框索引判断pixmap类型(0:原始图、1:灰度图、2:p3色域图)
-                        pixmap = data['pixmap']
-                        if self.comboBox_2.currentIndex() == 1:
-                            pixmap = data['gray_pixmap']
-                        if self.comboBox_2.currentIndex() == 2:
-                            pixmap = data['p3_pixmap']
-
-                        # 创建并设置场景，设置场景颜色为读取的背景色
-                        scene = QGraphicsScene(self)
-                        qcolor = rgb_str_to_qcolor(self.background_color_table)
-                        scene.setBackgroundBrush(QBrush(qcolor)) 
-
-                        # 创建图片项
-                        pixmap_item = QGraphicsPixmapItem(pixmap)
-                        pixmap_item.setTransformOriginPoint(pixmap.rect().center())
-                        scene.addItem(pixmap_item)
-                        
-                        # 创建并设置视图
-                        view = MyGraphicsView(scene, data['exif_info'], data['stats'], self)
-                        view.pixmap_items = [pixmap_item]
-                        
-                        # 设置视图的缩放，先计算基础缩放比例，再计算最终缩放比例，最后应用缩放
-                        w, h = pixmap.width(), pixmap.height()
-                        final_scale = min(target_width / w, target_height / h) * self.set_zoom_scale(avg_aspect_ratio, target_width, target_height)
-                        view.scale(final_scale, final_scale)
-                        
-                        # 设置直方图、EXIF、亮度统计信息、cv_img
-                        view.set_histogram_visibility(self.checkBox_1.isChecked())
-                        view.set_exif_visibility(self.checkBox_2.isChecked(), self.font_color_exif)
-                        view.set_stats_visibility(self.stats_visible) 
-                        view.set_histogram_data(data['histogram']) if data['histogram'] is not None else ...
-                        view.set_cv_image(data['cv_img']) if data['cv_img'] is not None else ...
-
-                        # 保存数据
-                        self.graphics_views[index] = view
-                        self.original_rotation[index] = pixmap_item.rotation()
-                        self.original_pixmaps[index] = data['pixmap']
-                        self.gray_pixmaps[index] = data['gray_pixmap']
-                        self.p3_pixmaps[index] = data['p3_pixmap']
-                        self.cv_imgs[index] = data['cv_img']
-                        self.pil_imgs[index] = data['pil_image']
-                        self.exif_texts[index] = data['exif_info']
-                        self.histograms[index] = data['histogram']
-                        self.base_scales[index] = final_scale
-                        self._scales_min[index] = final_scale
-
-                        # 更新表格
-                        # self.tableWidget_medium.setCellWidget(0, index, view)
-
-                # 启动表格自动刷新，批量更新表格内容
+                # 3. 优先使用预取的处理结果；未命中时先快速解码缩略预览图，完整处理在后台进行
+                # 派生项(灰度图、p3色域图、直方图及亮度统计信息)只生成当前界面状态需要的，其余在首次使用时生成
+                needs = self._required_variants()
+                group_key = make_group_key(image_paths, index_list, self._prefetch_settings_key())
+                self.group_prefetcher.set_displayed(group_key)
+                prefetched = self.group_prefetcher.peek(group_key)
+                results, previews = None, [None] * num_images
+                if prefetched is not None and prefetched.done() and not prefetched.cancelled() and prefetched.exception() is None:
+                    print("[set_images]-->命中预取的图片组")
+                    results = prefetched.result()
+                    sizes = [(r[1]['image'].width(), r[1]['image'].height()) if r and r[1] else None for r in results]
+                else:
+                    # 调用线程也参与解码，工作线程正忙于预取任务时预览图也能立即显示
+                    previews = get_scheduler().map(self._decode_preview, image_paths, priority=PRIORITY_VISIBLE,
+                                                   tag=self._load_tag(), caller_runs=True)
+                    sizes = [preview[1:] if preview else None for preview in previews]
+
+                # 4. 计算目标尺寸，预览图的宽高为原图尺寸，布局与完整图片一致
+                self._target_dimensions = self._calculate_target_dimensions(sizes)
+
+                # 5. 按最终的布局和缩放比例创建视图，先显示预览图，启动表格自动刷新，批量更新表格内容
+                for index, size in enumerate(sizes):
+                    if size:
+                        self._create_view(index, size[0], size[1], previews[index][0] if previews[index] else None)
                 self.tableWidget_medium.setUpdatesEnabled(True)
                 for index, view in enumerate(self.graphics_views):
                     if view is not None:
                         self.tableWidget_medium.setCellWidget(0, index, view)
+                print(f"首次显示耗时: {(time.time() - start_time_set_images):.2f} 秒")
+
+                # 预览图显示后即恢复界面操作，完整图片在后台继续处理，期间可以继续切换图片组
+                self.is_updating = False
+
+                # 6. 完整图片、直方图、亮度统计及EXIF信息每处理完一张就替换到对应视图中，全部完成后结束更新状态
+                self._load_key = group_key
+                self._load_results, self._load_pending = [None] * num_images, num_images
+                generation = self._load_generation
+                if results is not None:
+                    for index, data in results:
+                        self._on_image_processed(generation, index, data)
+                elif prefetched is not None:
+                    # 该组正在后台预取，等待预取完成，避免重复处理
+                    prefetched.add_done_callback(
+                        lambda f: self._on_prefetched_group_done(generation, f, image_paths, index_list, needs))
+                else:
+                    self._submit_group_loading(generation, image_paths, index_list, needs)
 
                 return True
             except Exception as e:
                 print(f"更新图片时发生错误: {e}")
+                self._finish_loading()
                 return False
-            finally:
-                # 完成后恢复确定模式
-                self.progress_bar.setVisible(False)  # 隐藏进度条
-                self.is_updating = False
 
-                # 释放futures
-                futures = None
+        except Exception as e:
+            print(f"❌ [set_images]-->处理图片时发生错误: {e}")
+            return False
 
-                # 记录结束时间并计算耗时
-                print(f"处理图片总耗时: {(time.time() - start_time_set_images):.2f} 秒")
+    def _decode_preview(self, path):
+        """快速解码预览图，返回 (预览图, 原图宽, 原图高)，失败返回None"""
+        try:
+            if path.endswith(".heic"):
+                if new_path := extract_jpg_from_heic(path):
+                    path = new_path
+            return decode_preview(path)
+        except Exception as e:
+            print(f"[_decode_preview]-->error: 解码预览图失败 {path}: {e}")
+            return None
+
+    def _create_view(self, index, width, height, preview=None):
+        """按目标尺寸创建第index张图片的视图，preview为预览图(DecodedImage)，完整图片由_apply_image_result替换"""
+        target_width, target_height, avg_aspect_ratio = self._target_dimensions
+
+        # 创建并设置场景，设置场景颜色为读取的背景色
+        scene = QGraphicsScene(self)
+        qcolor = rgb_str_to_qcolor(self.background_color_table)
+        scene.setBackgroundBrush(QBrush(qcolor)) 
+
+        # 创建分块多分辨率图片项，尺寸为原图尺寸，完整图片处理完成前显示预览图
+        pixmap_item = TiledImageItem()
+        pixmap_item.setPreview(preview.qimage() if preview else None, width, height, preview)
+        pixmap_item.setTransformOriginPoint(pixmap_item.boundingRect().center())
+        scene.addItem(pixmap_item)
+
+        # 创建并设置视图，EXIF及亮度统计信息在完整处理完成后更新
+        view = MyGraphicsView(scene, None, None, self)
+        view.pixmap_items = [pixmap_item]
+        view.set_exif_data("正在解析exif信息...")
+        view.set_stats_data("正在计算亮度统计信息...")
+
+        # 设置视图的缩放，先计算基础缩放比例，再计算最终缩放比例，最后应用缩放
+        final_scale = min(target_width / width, target_height / height) * self.set_zoom_scale(avg_aspect_ratio, target_width, target_height)
+        view.scale(final_scale, final_scale)
+
+        # 设置直方图、EXIF、亮度统计信息的可见性
+        view.set_histogram_visibility(self.checkBox_1.isChecked())
+        view.set_exif_visibility(self.checkBox_2.isChecked(), self.font_color_exif)
+        view.set_stats_visibility(self.stats_visible) 
+
+        # 保存数据
+        self.graphics_views[index] = view
+        self.original_rotation[index] = pixmap_item.rotation()
+        self.base_scales[index] = final_scale
+        self._scales_min[index] = final_scale
+        return view
+
+    def _apply_image_result(self, index, data):
+        """将第index张图片的完整处理结果替换到视图中"""
+        variants = data['variants']
+        view = self.graphics_views[index]
+        if view is None:
+            # 预览图解码失败时按完整图片的尺寸创建视图
+            view = self._create_view(index, variants.image.width(), variants.image.height())
+            self.tableWidget_medium.setCellWidget(0, index, view)
+
+        # 需要的派生项已由_on_image_processed在工作线程中补齐，这里只取用，不在界面线程中计算
+        # 根据下拉框索引判断显示的图像类型(0:原始图、1:灰度图、2:p3色域图)，只有原图与预览图内容一致，可继续用预览图绘制缩小画面
+        needs = self._required_variants()
+        color_space_index = self.comboBox_2.currentIndex()
+        pixmap_item = view.pixmap_items[0]
+        pixmap_item.setImage(variants.image_for(color_space_index), variants, keep_preview=color_space_index == 0)
+
+        # 设置直方图、EXIF、亮度统计信息、ROI统计使用的解码图像
+        view.exif_text = data['exif_info']
+        view.set_exif_data(view.exif_text if view.exif_text else "解析不出exif信息!")
+        view.stats_text = variants.stats_text() if 'stats' in needs else None
+        view.set_stats_data(view.stats_text if view.stats_text else "不存在亮度统计信息!")
+        if 'histogram' in needs:
+            view.set_histogram_data(variants.histogram())
+        view.set_decoded_image(variants.decoded)
+
+        # 保存数据
+        self.original_images[index] = variants.image
+        self.image_variants[index] = variants
+        self.gray_images[index] = variants.gray_image() if 'gray_image' in needs else None
+        self.p3_images[index] = variants.p3_image() if 'p3_image' in needs else None
+        self.exif_texts[index] = data['exif_info']
+        self.histograms[index] = variants.histogram() if 'histogram' in needs else None
+
+    def _submit_group_loading(self, generation, image_paths, index_list, needs):
+        """在全局任务调度器中逐张处理图片，每张处理完成后通过信号回到主线程替换显示"""
+        def load(args):
+            index, data = self._process_image(args, index_list)
+            if data:
+                self._generate_group_variants([data['variants']], needs)
+            return index, data
+
+        def done(future, index):
+            data = None if future.cancelled() or future.exception() else future.result()[1]
+            try:
+                self.image_processed.emit(generation, index, data)
+            except RuntimeError:
+                pass  # 看图子界面已被销毁
+
+        for index, path in enumerate(image_paths):
+            future = get_scheduler().submit(load, (index, path), priority=PRIORITY_VISIBLE, tag=(self, generation))
+            future.add_done_callback(lambda f, index=index: done(f, index))
+
+    def _on_prefetched_group_done(self, generation, future, image_paths, index_list, needs):
+        """等待的预取图片组完成(在预取线程中调用)，失败或被取消时改为逐张处理"""
+        if future.cancelled() or future.exception() is not None:
+            self._submit_group_loading(generation, image_paths, index_list, needs)
+            return
+        for index, data in future.result():
+            try:
+                self.image_processed.emit(generation, index, data)
+            except RuntimeError:
+                return  # 看图子界面已被销毁
 
+    def _on_image_processed(self, generation, index, data):
+        """一张图片完整处理完成(主线程)，替换预览图并更新进度，全部完成后缓存该组并预取相邻组"""
+        if generation != self._load_generation or index >= len(self._load_results):
+            return
+        # 加载期间界面状态可能改变，预取的组也可能按不同的需求生成，缺少的派生项补齐后再替换显示
+        if data and self._submit_missing_variants(generation, index, data):
+            return
+        try:
+            self._load_results[index] = (index, data)
+            if data:
+                self._apply_image_result(index, data)
         except Exception as e:
-            print(f"❌ [set_images]-->处理图片时发生错误: {e}")
+            print(f"❌ [_on_image_processed]-->替换第{index}张图片失败: {e}")
+        self._load_pending -= 1
+        num_images = len(self._load_results)
+        self.progress_updated.emit(int(100 * (num_images - self._load_pending) / num_images))
+        if self._load_pending > 0:
+            return
+        # 缓存当前组，并在后台预取上一组/下一组图片
+        self.group_prefetcher.put(self._load_key, self._load_results)
+        QTimer.singleShot(0, self.prefetch_adjacent_groups)
+        self._finish_loading()
+
+    def _load_tag(self):
+        """当前加载代次的任务标签"""
+        return (self, self._load_generation)
+
+    def _cancel_loading(self):
+        """丢弃正在加载的图片组，按标签取消其尚未开始的预览图解码、完整处理及派生项任务"""
+        get_scheduler().cancel(self._load_tag())
+        self._load_generation += 1
+
+    def _submit_missing_variants(self, generation, index, data):
+        """在全局任务调度器中补齐当前界面状态需要的派生项，完成后重新发送image_processed；已齐全时返回False"""
+        needs = self._required_variants()
+        variants = data['variants']
+        if all(variants.is_ready(name) for name in needs):
             return False
 
-    def _calculate_target_dimensions(self, futures, aspect_threshold=1.2):
+        def done(future):
+            failed = future.cancelled() or future.exception() is not None
+            try:
+                self.image_processed.emit(generation, index, None if failed else data)
+            except RuntimeError:
+                pass  # 看图子界面已被销毁
+
+        future = get_scheduler().submit(self._generate_group_variants, [variants], needs,
+                                        priority=PRIORITY_VISIBLE, tag=(self, generation))
+        future.add_done_callback(done)
+        return True
+
+    def _finish_loading(self):
+        """结束当前组的加载，隐藏进度条并恢复界面操作"""
+        self.progress_bar.setVisible(False)  # 隐藏进度条
+        self.is_updating = False
+        self._load_results, self._load_pending = [], 0
+        # 记录结束时间并计算耗时
+        print(f"处理图片总耗时: {(time.time() - self._load_start_time):.2f} 秒")
+
+    def _calculate_target_dimensions(self, sizes, aspect_threshold=1.2):
         """
         计算多张图片的目标尺寸
 
         Args:
-            futures: 包含图片处理结果的future列表
+            sizes: 每张图片的原图尺寸(宽, 高)列表，处理失败的图片为None
             aspect_threshold: 宽高比阈值, 默认1.2
 
         Returns:
@@ -1491,18 +1829,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         """
         try:
             # 使用列表推导获取有效的宽高数据，同时进行数据验证
-            dimensions = []
-            for result in futures:
-                if not result or not result[1] or not result[1].get('pixmap'):
-                    continue
-                try:
-                    width = result[1]['pixmap'].width()
-                    height = result[1]['pixmap'].height()
-                    if width <= 0 or height <= 0:
-                        continue
-                    dimensions.append((width, height))
-                except (AttributeError, KeyError):
-                    continue
+            dimensions = [(width, height) for width, height in filter(None, sizes) if width > 0 and height > 0]
 
             if not dimensions:
                 raise ValueError("没有有效的图片尺寸数据")
@@ -1553,21 +1880,76 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             print(f"计算目标尺寸时出现未预期错误: {e}")
             return 1, 1, 1.0
 
-    def _process_image(self, args):
+    def _process_group(self, image_paths, index_list, needs=(), priority=PRIORITY_VISIBLE, tag=None):
+        """
+        在全局任务调度器中并行处理一组图片，返回 [(index, data)] 列表，供set_images和后台预取共用.
+        先并行解码每张图片，再并行生成需要的派生项，同时执行的任务数由调度器统一限制；
+        预取时本函数在调度器的工作线程中执行，该线程也参与执行子任务(caller_runs)，不阻塞等待.
+        Args:
+            priority: 任务优先级，当前显示的组为PRIORITY_VISIBLE，后台预取为PRIORITY_PREFETCH
+            tag: 任务标签，调用 get_scheduler().cancel(tag) 可取消尚未开始的任务
+        """
+        results = get_scheduler().map(lambda args: self._process_image(args, index_list), enumerate(image_paths),
+                                      priority=priority, tag=tag, caller_runs=True)
+        self._generate_group_variants([data['variants'] for _, data in results if data], needs, priority, tag)
+        return results
+
+    def _generate_group_variants(self, results, needs, priority=PRIORITY_VISIBLE, tag=None):
+        """并行补齐一组图片中尚未生成的派生项，用于命中预取结果或切换界面状态时"""
+        generators = {
+            'gray_image': ImageVariants.gray_image,
+            'p3_image': ImageVariants.p3_decoded,
+            'stats': ImageVariants.stats,
+            'histogram': ImageVariants.histogram,
+        }
+        tasks = [(generators[name], variants) for variants in results if variants is not None
+                 for name in needs if name in generators and not variants.is_ready(name)]
+        get_scheduler().map(lambda task: task[0](task[1]), tasks, priority=priority, tag=tag, caller_runs=True)
+
+    def _estimate_group_bytes(self, results):
+        """估算一组图片处理结果占用的内存字节数"""
+        total = 0
+        for result in results or []:
+            if not result or not result[1]:
+                continue
+            if (variants := result[1].get('variants')) is not None:
+                total += variants.nbytes()
+        return total
+
+    def _prefetch_settings_key(self):
+        """影响图片处理结果的设置，设置变化后预取的结果失效"""
+        return json.dumps(self.dict_exif_info_visibility, sort_keys=True, ensure_ascii=False)
+
+    def prefetch_adjacent_groups(self):
+        """根据主界面的选中状态预测下一组/上一组图片，在后台预取其处理结果"""
+        try:
+            if not self.parent_window or not self.group_prefetcher.enabled or not self.isVisible():
+                return
+            adjacent = []
+            for key_type in ('space', 'b'):
+                paths, indexs = self.parent_window.predict_space_and_b_file_paths(key_type)
+                # 只预取纯图片组，视频组由视频子界面处理
+                if not paths or not all(path.lower().endswith(self.parent_window.IMAGE_FORMATS) for path in paths):
+                    continue
+                adjacent.append((make_group_key(paths, indexs, self._prefetch_settings_key()), paths, indexs))
+            # 取消不再相邻的组尚未完成的预取任务
+            self.group_prefetcher.retain([key for key, _, _ in adjacent])
+            for key, paths, indexs in adjacent:
+                self.group_prefetcher.request(key, paths, indexs, self._required_variants(), PRIORITY_PREFETCH, key)
+        except Exception as e:
+            print(f"❌ [prefetch_adjacent_groups]-->预取图片组失败: {e}")
+
+    def _process_image(self, args, index_list=None):
         """
         该函数主要是实现了图片基础信息提取功能.
         Args:
             args: 包含 (index, path) 的元组
+            index_list: 图片索引列表, 预取时传入待显示组的索引, 默认使用当前显示组的索引
         Returns:
             index, {
-                'pil_image': img,            # PIL图像
-                'cv_img': cv_img,            # OpenCV图像
-                'histogram': histogram,      # 直方图信息
-                'pixmap': pixmap,            # 原始pixmap格式图
-                'gray_pixmap': gray_pixmap,  # pixmap格式灰度图
-                'p3_pixmap': p3_pixmap,      # pixmap格式p3色域图
+                'image': image,              # 原图QImage, 直接包装解码内存
+                'variants': variants,        # 解码图像及灰度图/p3色域图/亮度统计信息/直方图, 按需生成
                 'exif_info': exif_info,      # exif信息
-                'stats': stats_text,         # 添加亮度/RGB/LAB等信息
             }
         Note:
             注意事项，列出任何重要的假设、限制或前置条件.
@@ -1587,17 +1969,17 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
 
             # 使用PIL获取所需的图像信息
             with Image.open(path) as img:
-                """1. 获取pil_img的格式,确保函数get_exif_info能正确加载信息; 生成sRGB色域的pil_img和pixmap--------------------------------"""
+                """1. 获取pil_img的格式,确保函数get_exif_info能正确加载信息; 解码为sRGB色域的共享内存图像------------------------------"""
                 img_format = img.format
-                pixmap = pil_to_pixmap((img := self.p3_converter.get_pilimg_sRGB(img)))
+                decoded = DecodedImage.from_pil(self.p3_converter.get_pilimg_sRGB(img, in_place=True))
 
-                """2. 使用线程池并行生成，获取histogram, cv_img, stats, gray_pixmap, p3_pixmap等图像信息---------------------------------"""
-                histogram, cv_img, stats, gray_pixmap, p3_pixmap = self._generate_pixmaps_parallel(img)
-                # print(f"色域转换耗时: {(time.time() - start_time_process_image):.2f} 秒")
+            """2. 派生项(色域图、直方图及亮度统计信息)由 _process_group 在解码完成后统一并行生成-----------------------------------------"""
+            variants = ImageVariants(decoded, self.p3_converter, self.calculate_brightness_histogram, path)
+            image = variants.image
 
             """3. EXIF信息提取-------------------------------------------------------------------------------------------------------""" 
             # 提取图片的基础信息
-            basic_info = self.get_pic_basic_info(path, img, pixmap, self.index_list[index])
+            basic_info = self.get_pic_basic_info(path, decoded.exif, image, (index_list or self.index_list)[index])
 
             # piexf解析曝光时间光圈值ISO等复杂的EXIF信息
             exif_info = self.get_exif_info(path, img_format) + basic_info
@@ -1612,19 +1994,10 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             # 处理EXIF信息，根据可见性字典更新
             exif_info = self.process_exif_info(self.dict_exif_info_visibility, exif_info, hdr_flag)
 
-            # 拼接亮度统计信息，计算亮度统计信息方法calculate_image_stats放到并行函数_generate_pixmaps_parallel中执行
-            stats_text = f"亮度: {stats['avg_brightness']}\n对比度(L值标准差): {stats['contrast']}" \
-            f"\nLAB: {stats['avg_lab']}\nRGB: {stats['avg_rgb']}\nR/G: {stats['R_G']}  B/G: {stats['B_G']}"
-
             return index, {
-                'pil_image': img,            # PIL图像
-                'cv_img': cv_img,            # OpenCV图像
-                'histogram': histogram,      # 直方图信息
-                'pixmap': pixmap,            # 原始pixmap格式图
-                'gray_pixmap': gray_pixmap,  # pixmap格式灰度图
-                'p3_pixmap': p3_pixmap,      # pixmap格式p3色域图
+                'image': image,              # 原图QImage, 直接包装解码内存
+                'variants': variants,        # 解码图像及按需生成的派生项
                 'exif_info': exif_info,      # exif信息
-                'stats': stats_text,         # 添加亮度/RGB/LAB等信息
             }
         except Exception as e:
             print(f"[process_image]-->error: 处理图片失败 {path}: {e}")
@@ -1634,78 +2007,19 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             print(f"处理图片{index}_{os.path.basename(path)} 耗时: {(time.time() - start_time_process_image):.2f} 秒")
 
 
-    def _generate_pixmaps_parallel(self, img):
-        """
-        该函数主要是实现了一个线程池并行生成不同色域的pixmap.
-        Args:
-            img (Image.Image): PIL Image.
-        Returns:
-            histogram, cv_img, stats, gray_pixmap, p3_pixmap.
-        Note:
-            # 获取cv_img
-            cv_img = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-            # 获取亮度统计信息
-            stats = calculate_image_stats(cv_img, resize_factor=0.1)
-            # 获取直方图
-            histogram = self.calculate_brightness_histogram(img) 
-            # 获取sRGB色域图
-            gray_image = img.convert('L')
-            gray_pixmap = pil_to_pixmap(gray_image)
-            # 获取display-p3色域图
-            p3_image = self.p3_converter.convert_color_space(img, "Display-P3", intent="Relative Colorimetric")
-            p3_pixmap = pil_to_pixmap(p3_image)
-        """
-        
-        """并行生成不同色域的pixmap"""
-        def generate_gray():
-            try:
-                # 先转换为灰度区间pil_img，然后转换为pixmap
-                gray_pixmap = pil_to_pixmap(img.convert('L'))
-
-                return gray_pixmap
-            except Exception as e:
-                print(f"sGray转换失败: {str(e)}")
-                return pil_to_pixmap(img)
-            
-        def generate_p3():
-            try:
-                p3_image = self.p3_converter.convert_color_space(img, "Display-P3", intent="Relative Colorimetric")
-                return pil_to_pixmap(p3_image)
-            except Exception as e:
-                print(f"display-p3转换失败: {str(e)}")
-                return pil_to_pixmap(img)
-
-        def generate_cv_img():
-            try:
-                cv_img = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-                stats = calculate_image_stats(cv_img, resize_factor=0.1)
-                return cv_img, stats
-            except Exception as e:
-                print(f"cv_img转换失败: {str(e)}")
-                return None, None
-
-        def generate_histogram():
-            try:
-                return self.calculate_brightness_histogram(img)
-            except Exception as e:
-                print(f"cv_img转换失败: {str(e)}")
-                return None
-            
-        # 使用线程池并行处理 min(4, cpu_count()) ，设置最大线程数
-        with ThreadPoolExecutor(max_workers=min(5, cpu_count())) as executor:
-            # 提交所有任务
-            gray_future = executor.submit(generate_gray)
-            p3_future = executor.submit(generate_p3)
-            cv_future = executor.submit(generate_cv_img)
-            histogram_future = executor.submit(generate_histogram)
-
-            # 获取结果
-            gray_pixmap = gray_future.result()
-            p3_pixmap = p3_future.result()
-            cv_img, stats =  cv_future.result()
-            histogram =  histogram_future.result()
-
-        return histogram, cv_img, stats, gray_pixmap, p3_pixmap
+    def _required_variants(self):
+        """根据当前界面状态(色域下拉框、直方图复选框、ROI信息复选框)返回加载时需要生成的派生项"""
+        needs = set()
+        color_space_index = self.comboBox_2.currentIndex()
+        if color_space_index == 1:
+            needs.add('gray_image')
+        elif color_space_index == 2:
+            needs.add('p3_image')
+        if self.checkBox_1.isChecked():
+            needs.add('histogram')
+        if self.stats_visible:
+            needs.add('stats')
+        return needs
 
     def sync_image_index_with_aebox(self, images_path_list, index_list):
         """同步当前图片索引到aebox应用"""
@@ -1825,6 +2139,14 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
     def cleanup(self):
         """清理所有资源"""
         try:
+            # 丢弃正在加载的图片组，取消尚未开始的处理任务
+            self._cancel_loading()
+
+            # 丢弃未完成的ROI批量统计
+            self.roi_batch.cancel()
+            self._roi_sync_source = None
+            self._roi_rects, self._roi_results = [], []
+
             # 清理表格
             self.tableWidget_medium.clearContents()
             self.tableWidget_medium.setRowCount(0)
@@ -1836,6 +2158,8 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                     if view.scene():
                         view.scene().clear()
                     view.setScene(None)
+                    # ROI矩形框已随场景删除，丢弃引用，避免排队中的ROI统计访问已删除的对象
+                    view.selection_rect = None
 
             if self.roi_selection_active: # 切换图片自动清除ROI信息框
                 self.roi_selection_active = False
@@ -1845,11 +2169,10 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             self.histograms.clear()
             self.original_rotation.clear()
             self.graphics_views.clear()
-            self.original_pixmaps.clear()
-            self.gray_pixmaps.clear()
-            self.p3_pixmaps.clear()
-            self.cv_imgs.clear()
-            self.pil_imgs.clear()
+            self.original_images.clear()
+            self.gray_images.clear()
+            self.p3_images.clear()
+            self.image_variants.clear()
             self.base_scales.clear()
             self._scales_min.clear()
 
@@ -1983,6 +2306,31 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             self.comboBox_2.setItemText(i, text)
     
 
+    def ensure_variants(self, name):
+        """确保当前显示的所有图片都已生成指定的派生项，并同步到视图及对应列表中"""
+        if not name:
+            return
+        try:
+            self._generate_group_variants(self.image_variants, {name})
+            for i, variants in enumerate(self.image_variants):
+                view = self.graphics_views[i] if i < len(self.graphics_views) else None
+                if variants is None or view is None:
+                    continue
+                if name == 'gray_image':
+                    self.gray_images[i] = variants.gray_image()
+                elif name == 'p3_image':
+                    self.p3_images[i] = variants.p3_image()
+                elif name == 'histogram' and self.histograms[i] is None:
+                    self.histograms[i] = variants.histogram()
+                    if self.histograms[i] is not None:
+                        view.set_histogram_data(self.histograms[i])
+                # 亮度统计信息中附带图片占用的内存，生成新的派生项后同步更新
+                if name == 'stats' or (variants.is_ready('stats') and not view.selection_visible):
+                    view.stats_text = variants.stats_text()
+                    view.set_stats_data(view.stats_text if view.stats_text else "不存在亮度统计信息!")
+        except Exception as e:
+            print(f"❌ [ensure_variants]-->生成派生项{name}失败: {e}")
+
     def clean_color_space(self,):
         """清除颜色空间的显示标志位"""
         self.srgb_color_space = False
@@ -1994,11 +2342,15 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         """图像色彩显示空间下拉框self.comboBox_2内容改变时触发事件
         ["✅sRGB色域", "✅sGray色域", "✅Display-P3色域"]
         """
+        # 首次切换到灰度图/p3色域时并行生成所有图片的对应图像
+        self.ensure_variants({1: 'gray_image', 2: 'p3_image'}.get(index))
+
         # 更新所有图形视图的场景视图
         for i, view in enumerate(self.graphics_views):
-            if view and view.scene() :
+            # 仍在显示预览图的视图跳过，完整图片处理完成后按当前色彩空间显示
+            if view and view.scene() and self.image_variants[i] is not None:
                 try:
-                    original_pixmap = self.original_pixmaps[i]
+                    original_image = self.original_images[i]
                     current_rotation = view.pixmap_items[0].rotation() if view.pixmap_items else 0
                     
                     # 根据选择的色彩空间转换图像
@@ -2008,27 +2360,27 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                         self.srgb_color_space = True
                         self.update_comboBox2()
 
-                        # 调用列表self.original_pixmaps[i]中存储的原始图pixmap
-                        converted_pixmap = original_pixmap
-                    elif index == 1 and self.gray_pixmaps[i] is not None:  # 灰度图色域
+                        # 调用列表self.original_images[i]中存储的原始图
+                        converted_image = original_image
+                    elif index == 1 and self.gray_images[i] is not None:  # 灰度图色域
                         # 设置当前启用的图像色彩显示空间
                         self.clean_color_space()
                         self.gray_color_space = True
                         self.update_comboBox2()
 
-                        # 调用列表self.gray_pixmaps[i]中存储的灰度图pixmap
-                        converted_pixmap = self.gray_pixmaps[i]
-                    elif index == 2 and self.p3_pixmaps[i] is not None:  # p3色域
+                        # 调用列表self.gray_images[i]中存储的灰度图
+                        converted_image = self.gray_images[i]
+                    elif index == 2 and self.p3_images[i] is not None:  # p3色域
                         # 设置当前启用的图像色彩显示空间
                         self.clean_color_space()
                         self.p3_color_space = True
                         self.update_comboBox2()
 
-                        # 调用列表self.p3_pixmaps[i]中存储的p3色域图pixmap
-                        converted_pixmap = self.p3_pixmaps[i]
+                        # 调用列表self.p3_images[i]中存储的p3色域图
+                        converted_image = self.p3_images[i]
 
                     # 更新视图显示
-                    view.pixmap_items[0].setPixmap(converted_pixmap)
+                    view.pixmap_items[0].setImage(converted_image, self.image_variants[i])
                     view.pixmap_items[0].setRotation(current_rotation)
                     view.centerOn(view.mapToScene(view.viewport().rect().center()))
                     
@@ -2057,6 +2409,9 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
     def toggle_histogram_info(self, state):
         print(f"切换直方图信息: {'显示' if state == Qt.Checked else '隐藏'}")
         try:
+            # 首次显示时生成直方图
+            if state == Qt.Checked:
+                self.ensure_variants('histogram')
             for view, histogram in zip(self.graphics_views, self.histograms):
                 if histogram:
                     view.set_histogram_visibility(state == Qt.Checked)
@@ -2076,36 +2431,26 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             print(f"❌ [ai_tips_info]-->处理ai_tips_info函数时发生错误: {e}")
 
-    def calculate_brightness_histogram(self, img):
-        """传入PIL图像img,将其转换为灰度图, 输出直方图和灰度pixmap"""
+    def calculate_brightness_histogram(self, img, path=None):
+        """传入DecodedImage或PIL图像img, 输出直方图; DecodedImage输出4x256的亮度及R/G/B直方图, 按path缓存"""
         try:
+            # 处理共享内存的解码图像，按取样步长统计亮度及R/G/B直方图，未修改的图片直接读取元数据索引中的缓存
+            if isinstance(img, DecodedImage):
+                return cached_histograms(path, img, self.histogram_step)
             # 处理PIL图像对象
             if isinstance(img, Image.Image):  
-                # 转换为灰度图
-                gray_img = img.convert('L')
-                
-                # 将灰度图转换为RGB模式（QPixmap需要RGB格式）
-                # gray_rgb = gray_img.convert('RGB')
-                
-                # 转换为pixmap
-                # gray_pixmap = pil_to_pixmap(gray_rgb)
-                
-                # 使用numpy计算直方图
-                histogram = np.array(gray_img).flatten()
-                _hist_counts = np.bincount(histogram, minlength=256)
-                histogram = _hist_counts.tolist()
-
-                return histogram
+                # 转换为灰度图后使用PIL统计直方图
+                return img.convert('L').histogram()
             else:
                 print(f"❌ [calculate_brightness_histogram]-->无法加载图像")
-                return None, None
+                return None
 
         except Exception as e:
             print(f"❌ [calculate_brightness_histogram]-->计算直方图失败\n错误: {e}")
-            return None, None
+            return None
         
     
-    def get_pic_basic_info(self, path, pil_img, pixmap, index):
+    def get_pic_basic_info(self, path, exif_dict, image, index):
         """
         该函数主要是实现了提取图片基础的exif信息的功能.
         Args:
@@ -2127,14 +2472,14 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             else:
                 size_str = f"{file_size / (1024 ** 2):.2f} MB"
 
-            # 图片尺寸，pixmap是旋转后的图像，尺寸会更准确
-            width, height = pixmap.width(), pixmap.height()
+            # 图片尺寸，image是旋转后的图像，尺寸会更准确
+            width, height = image.width(), image.height()
 
             basic_info = f"图片名称: {pic_name}\n图片大小: {size_str}\n图片尺寸: {width} x {height}\n图片张数: {index}"
 
             # 针对小米相机拍图会写入hdr和zoom增加额外信息
             ultra_info = ''  # 初始化空字符串
-            if pil_img and (exif_dict := pil_img.getexif()) is not None and (info := exif_dict.get(39321,None)) is not None:
+            if exif_dict is not None and (info := exif_dict.get(39321,None)) is not None:
                 if info and isinstance(info,str):
                     # 使用json将字符串解析为字典，提取hdr和zoom字段
                     data = json.loads(info)
@@ -2431,6 +2776,9 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         if len(self.images_path_list) != 2:
             QMessageBox.warning(self, "警告", "只有两张图片时才能使用覆盖比较功能。")
             return
+        # 图片还在加载中(可能仍显示预览图)，不进行覆盖
+        if self.is_updating or self._load_pending:
+            return
         
         try:    
             def create_unified_overlay(source_view, target_view):
@@ -2438,18 +2786,18 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 try:
                     source_pixmap_item = source_view.pixmap_items[0]
 
-                    source_pixmap = source_pixmap_item.pixmap()
+                    source_image = source_pixmap_item.image()
 
                     target_display_size = target_view.pixmap_items[0].boundingRect().size().toSize()
 
                     # 使用忽略宽高比的缩放方式
-                    scaled_pixmap = source_pixmap.scaled(
+                    scaled_image = source_image.scaled(
                         target_display_size,
                         Qt.IgnoreAspectRatio,
                         Qt.SmoothTransformation
                     )
 
-                    return scaled_pixmap
+                    return scaled_image
                 except Exception as e:
                     print(f"❌ [create_unified_overlay]-->创建统一覆盖图像失败: {str(e)}")
                     return None
@@ -2460,7 +2808,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 if source_view and target_view and source_view.pixmap_items and target_view.pixmap_items:
                     scaled = create_unified_overlay(source_view, target_view)
                     source_rotation = self.original_rotation[1]
-                    target_view.pixmap_items[0].setPixmap(scaled)
+                    target_view.pixmap_items[0].setImage(scaled)
                     target_view.pixmap_items[0].setRotation(source_rotation)
                     target_view.centerOn(target_view.mapToScene(target_view.viewport().rect().center()))
             elif key == 'w':
@@ -2469,7 +2817,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 if source_view and target_view and source_view.pixmap_items and target_view.pixmap_items:
                     scaled = create_unified_overlay(source_view, target_view)     
                     source_rotation = self.original_rotation[0]
-                    target_view.pixmap_items[0].setPixmap(scaled)
+                    target_view.pixmap_items[0].setImage(scaled)
                     target_view.pixmap_items[0].setRotation(source_rotation)
                     target_view.centerOn(target_view.mapToScene(target_view.viewport().rect().center()))
 
@@ -2491,25 +2839,25 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 return
 
             target_view = self.graphics_views[index]
-            original_pixmap = self.original_pixmaps[index]
+            original_image = self.original_images[index]
             original_rotation = self.original_rotation[index]
 
 
-            if not target_view or not target_view.pixmap_items or not original_pixmap:
+            if not target_view or not target_view.pixmap_items or original_image is None or original_image.isNull():
                 return
 
             # 获取当前显示尺寸
             current_display_size = target_view.pixmap_items[0].boundingRect().size().toSize()
 
             # 重新缩放原始图像到当前显示尺寸
-            scaled = original_pixmap.scaled(
+            scaled = original_image.scaled(
                 current_display_size,
                 Qt.IgnoreAspectRatio,
                 Qt.SmoothTransformation
             )
 
             # 直接设置缩放后的图像到目标视图
-            target_view.pixmap_items[0].setPixmap(scaled)
+            target_view.pixmap_items[0].setImage(scaled, self.image_variants[index])
             target_view.pixmap_items[0].setRotation(original_rotation)  
             target_view.centerOn(target_view.mapToScene(target_view.viewport().rect().center()))
         except Exception as e:
@@ -2594,9 +2942,110 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             print(f"❌ [on_ctrl_t_pressed]-->处理Ctrl+T键事件失败:{e}")
 
+    def on_ctrl_p_pressed(self):
+        """处理Ctrl+P键事件，切换ROI同步模式"""
+        self.roi_sync_active = not self.roi_sync_active
+        print(f"[on_ctrl_p_pressed]-->ROI同步模式: {'开启' if self.roi_sync_active else '关闭'}")
+        show_message_box(f"ROI同步模式已{'开启' if self.roi_sync_active else '关闭'}", "提示", 800)
+        if not self.roi_selection_active:
+            return
+        if self.roi_sync_active:
+            # 以第一个视图的ROI为准同步到其它视图
+            if source := next((view for view in self.graphics_views if view and view.selection_rect), None):
+                self.request_roi_sync(source)
+        else:
+            self.roi_batch.cancel()
+            for view in self.graphics_views:
+                if view and view.selection_rect:
+                    view.update_roi_stats()
+
+    def request_roi_sync(self, source_view):
+        """ROI同步模式下source_view的ROI发生变化，同一轮事件循环中的多次变化合并为一次同步"""
+        if self._roi_sync_source is None:
+            QTimer.singleShot(0, self._flush_roi_sync)
+        self._roi_sync_source = source_view
+
+    def _flush_roi_sync(self):
+        """按源视图ROI的归一化坐标设置所有视图的ROI，并批量统计所有图片"""
+        source, self._roi_sync_source = self._roi_sync_source, None
+        try:
+            if source not in self.graphics_views or (rect := source.roi_pixel_rect()) is None:
+                return
+            norm_rect = normalize_rect(rect, source.decoded_image.width, source.decoded_image.height)
+
+            items = []
+            for view in self.graphics_views:
+                view_rect = None
+                if view and view.selection_rect and view.decoded_image is not None:
+                    decoded = view.decoded_image
+                    view_rect = rect if view is source else denormalize_rect(norm_rect, decoded.width, decoded.height)
+                    if view is not source:
+                        view.set_roi_pixel_rect(view_rect)
+                items.append((view.decoded_image if view_rect else None, view_rect))
+
+            # 积分图都已构建时直接返回结果，否则在后台构建完成后通过信号更新
+            self._roi_rects = [view_rect for _, view_rect in items]
+            if (results := self.roi_batch.request(items)) is not None:
+                self._show_roi_results(results)
+        except Exception as e:
+            print(f"❌ [_flush_roi_sync]-->同步ROI失败: {e}")
+
+    def _on_roi_batch_done(self, generation, results):
+        """ROI批量统计完成(工作线程中调用)，发送信号到主线程更新显示"""
+        try:
+            self.roi_batch_ready.emit(generation, results)
+        except RuntimeError:
+            pass  # 看图界面已被销毁
+
+    def _on_roi_batch_ready(self, generation, results):
+        """丢弃过期的批量统计结果，显示最新结果"""
+        if generation == self.roi_batch.generation and self.roi_selection_active and self.roi_sync_active:
+            self._show_roi_results(results)
+
+    def _show_roi_results(self, results):
+        """各视图并排显示ROI统计信息，第二张起附带与第一张图片的差值"""
+        self._roi_results = results
+        reference = results[0] if results else None
+        for i, (view, stats) in enumerate(zip(self.graphics_views, results)):
+            if view and stats:
+                view._update_stats_display(stats, reference if i > 0 else None)
+
+    def on_ctrl_e_pressed(self):
+        """处理Ctrl+E键事件，将当前各图片的ROI统计信息追加导出到CSV，每张图片一行"""
+        try:
+            if not self.roi_selection_active:
+                show_message_box("请先按P键打开ROI信息统计框", "提示", 1000)
+                return
+
+            # 同步模式使用最新的批量统计结果，否则按各视图当前的ROI直接统计，不经过批量请求以免在各视图显示差值
+            if self.roi_sync_active:
+                if not self._roi_results:
+                    show_message_box("ROI统计信息计算中，请稍后再导出", "提示", 1000)
+                    return
+                rects, results = self._roi_rects, self._roi_results
+            else:
+                rects, results = [], []
+                for view in self.graphics_views:
+                    rect = view.roi_pixel_rect() if view else None
+                    rects.append(rect)
+                    results.append(view.decoded_image.integral_stats().region_stats(*rect) if rect else None)
+
+            index_list = self.index_list or [str(i + 1) for i in range(len(self.images_path_list))]
+            rows = [(index_list[i], self.images_path_list[i], rects[i], stats)
+                    for i, stats in enumerate(results) if stats and rects[i]]
+            csv_path = os.path.join(BasePath, "cache", "roi_stats.csv")
+            count = export_roi_csv(csv_path, index_list[0] if index_list else "", rows)
+            print(f"[on_ctrl_e_pressed]-->已导出 {count} 行ROI统计信息到 {csv_path}")
+            show_message_box(f"已导出 {count} 张图片的ROI统计信息到\n{csv_path}", "提示", 1500)
+        except Exception as e:
+            print(f"❌ [on_ctrl_e_pressed]-->导出ROI统计信息失败: {e}")
+
     def roi_stats_checkbox(self):
         try:
             self.stats_visible = not self.stats_visible # 控制显示开关
+            # 首次显示时生成亮度统计信息
+            if self.stats_visible:
+                self.ensure_variants('stats')
             for view in self.graphics_views:
                 if view:
                     view.set_stats_visibility(self.stats_visible)
@@ -2824,6 +3273,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             return
         try:
             self.save_settings()        # 保存设置
+            self.group_prefetcher.shutdown()  # 停止预取，释放缓存的图片组
             self.cleanup()              # 清理资源
             self.closed.emit()          # 发送关闭信号
             self.closed.disconnect()    # 发送后立即断开连接
@@ -2878,6 +3328,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
             # 设置亮度统计信息的标志位；初始化ai提示标注位为False 
             self.stats_visible = self.dict_label_info_visibility.get("roi_info", False)         
             self.ai_tips_flag = self.dict_label_info_visibility.get("ai_tips", False)          
+            self.roi_sync_active = self.dict_label_info_visibility.get("roi_sync", False)
 
         except Exception as e:
             print(f"❌[load_settings]-->error: 加载设置失败: {e}")
@@ -2916,6 +3367,7 @@ class SubMainWindow(QMainWindow, Ui_MainWindow):
                 "exif_info": self.checkBox_2.isChecked(),
                 "roi_info": self.checkBox_3.isChecked(),
                 "ai_tips": self.checkBox_4.isChecked(),
+                "roi_sync": self.roi_sync_active,
                 "srgb_color_space":self.srgb_color_space,
                 "p3_color_space":self.p3_color_space,
                 "gray_color_space":self.gray_color_space,
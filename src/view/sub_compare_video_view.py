@@ -6,6 +6,7 @@ import time
 import json
 import pathlib
 import threading
+from collections import deque
 
 """导入python第三方模块"""
 import cv2
@@ -21,6 +22,10 @@ from PyQt5.QtWidgets import (
 """导入自定义模块"""
 from src.common.font_manager import SingleFontManager 
 from src.common.settings_ColorAndExif import load_color_settings 
+from src.utils.frame_source import FrameSource
+from src.utils.video_index import load_video_index, request_video_index
+from src.utils.playback_clock import PlaybackClock
+from src.utils.frame_align import frame_signature, find_best_matches
 
 """设置本项目的入口路径,全局变量BasePath"""
 # 方法一：手动找寻上级目录，获取项目入口路径，支持单独运行该模块
@@ -30,6 +35,12 @@ if True:
 if False: # 暂时禁用，不支持单独运行该模块
     BasePath = os.path.dirname(os.path.abspath(sys.argv[0]))  
 
+# 显示端按播放时钟取帧的间隔(毫秒), 小于一帧时长才能按时间戳准确显示
+PRESENT_INTERVAL_MS = 5
+# 显示的帧落后主时钟超过该时长(毫秒)时直接定位到主时钟位置, 两次定位至少间隔 RESYNC_COOLDOWN_S 秒
+RESYNC_MS = 500
+RESYNC_COOLDOWN_S = 1.0
+
 
 """"自定义类"""
 class FrameFinderThread(QThread):
@@ -64,36 +75,17 @@ class FrameFinderThread(QThread):
                 baseline_cap.release()
                 return
 
-            # 转换为灰度图，提取特征
-            baseline_gray = cv2.cvtColor(baseline_frame, cv2.COLOR_BGR2GRAY)
+            # 提取基准帧的比较特征(归一化的灰度缩略图)
+            baseline_signature = frame_signature(baseline_frame)
             baseline_cap.release()
 
-            # 为每个目标视频找到最佳匹配帧
+            # 跳过基准视频自身，所有目标视频并行查找最佳匹配帧
+            target_paths = [path for path in self.target_video_paths if path != self.baseline_video_path]
             best_frame_indices = {}
-            for target_path in self.target_video_paths:
-                try:
-                    # 跳过基准视频自身
-                    if target_path == self.baseline_video_path:
-                        continue
-
-                    # 打开目标视频
-                    target_cap = cv2.VideoCapture(target_path)
-                    if not target_cap.isOpened():
-                        print(f"无法打开目标视频: {target_path}")
-                        continue
-
-                    total_frames = int(target_cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                    best_match_index, best_match_score = self.find_best_match(
-                        target_cap, baseline_gray, total_frames
-                    )
-
-                    target_cap.release()
-
-                    if best_match_index != -1:
-                        best_frame_indices[target_path] = best_match_index
-                except Exception as e:
-                    print(f"处理视频 {target_path} 时出错: {str(e)}")
-                    continue
+            for target_path, (best_match_index, best_match_score) in find_best_matches(target_paths, baseline_signature).items():
+                if best_match_index != -1:
+                    print(f"视频 {os.path.basename(target_path)} 最佳匹配帧: {best_match_index}, 差异: {best_match_score:.4f}")
+                    best_frame_indices[target_path] = best_match_index
 
             self.result_ready.emit(best_frame_indices)
 
@@ -101,81 +93,40 @@ class FrameFinderThread(QThread):
             self.error_occurred.emit(str(e))
 
     def safe_read_frame(self, cap, frame_index):
-        """安全读取指定帧，使用多种方法尝试"""
+        """安全读取指定帧，从之前最近的关键帧解码到目标帧，帧号由关键帧索引校验"""
         try:
-            # 方法1：使用set() + read()
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-            ret, frame = cap.read()
-            if ret:
-                return frame
-                
-            # 方法2：重新打开视频，逐帧读取
-            cap.release()
-            cap = cv2.VideoCapture(self.baseline_video_path)
-            current_frame = 0
-            while current_frame < frame_index:
-                ret, _ = cap.read()
-                if not ret:
-                    return None
-                current_frame += 1
-            
-            ret, frame = cap.read()
-            return frame if ret else None
+            source = FrameSource(cap, index=load_video_index(self.baseline_video_path))
+            return source.frame_at(frame_index)
             
         except Exception as e:
             print(f"安全读取帧失败: {str(e)}")
             return None
 
-    def find_best_match(self, cap, baseline_gray, total_frames):
-        """在目标视频中查找与基准帧最相似的帧"""
-        best_score = float("inf")  # 较小的差异值表示更好的匹配
-        best_index = -1
-        
-        # 逐帧采样策略，避免处理过多帧
-        sample_step = max(1, total_frames // 100)  # 最多采样100帧
-        
-        for i in range(0, total_frames, sample_step):
-            try:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = cap.read()
-                if not ret:
-                    continue
-                
-                # 转换为灰度并计算差异
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # 确保尺寸匹配
-                if gray.shape != baseline_gray.shape:
-                    gray = cv2.resize(
-                        gray, (baseline_gray.shape[1], baseline_gray.shape[0])
-                    )
+class FrameReader(QThread):
+    """解码线程: 按顺序解码到有界队列中, 显示端按播放时钟的时间戳取帧
 
-                # 使用平均绝对差异(MAD)来比较相似度
-                diff = cv2.absdiff(gray, baseline_gray)
-                score = np.mean(diff)
-                
-                if score < best_score:
-                    best_score = score
-                    best_index = i
-                    
-            except Exception as e:
-                print(f"比较帧 {i} 时出错: {str(e)}")
-                continue
-                
-        return best_index, best_score
+    原方案在锁内逐帧读取、忙等控制节奏并通过信号发送 frame.copy(), 解码耗时的抖动直接表现为播放卡顿.
+    现在解码线程只负责保持队列中有 max_queue_size 帧(同时受 QUEUE_BUDGET_BYTES 限制)预解码的帧,
+    显示端调用 frame_for(媒体时间) 取出时间戳已到的最新一帧, 更早的帧直接丢弃; 解码落后于播放时钟时,
+    解码线程对已经过时的帧只 grab() 不转换颜色. 显示过的帧保留在解码源的环形缓冲区中, 逐帧后退和拖动进度条时直接命中.
+    """
+    QUEUE_BUDGET_BYTES = 128 * 1024 * 1024      # 预解码队列的内存上限, 4K视频约5帧
+    index_ready = pyqtSignal()                  # 视频索引构建完成, 帧号与时间戳的对应关系可能改变
 
-class FrameReader(QThread):
-    frame_ready = pyqtSignal(int, object, int)  # 添加信号: 帧号, 帧数据, 时间戳
-    
     def __init__(self, video_path, max_queue_size=30):
         super().__init__()
         self.video_path = video_path
         self.max_queue_size = max_queue_size
         self.running = True
         self.paused = False
-        self.lock = threading.Lock()
-        self.last_emit_time = time.time()  # 添加上次发射信号的时间
-        self.playback_speed = 1.0  # 添加播放速度变量
+        self.lock = threading.Lock()            # 保护解码源, 解码一帧期间持有
+        self._cond = threading.Condition()      # 保护预解码队列, 显示端取帧时不等待解码
+        self._queue = deque()                   # [(帧号, 时间戳ms, 帧)]
+        self._generation = 0                    # 定位后递增, 丢弃定位前解码的帧
+        self._late_before_ms = -1.0             # 时间戳早于该值的帧已经过时, 解码时跳过
+        self._at_eof = False                    # 已解码到视频结尾
+        self._seek_request = None               # 显示端请求的定位帧号, 由解码线程执行, 见 request_seek()
+        self.dropped_frames = 0
         
         # 尝试不同的后端打开视频
         self.cap = None
@@ -189,11 +140,17 @@ class FrameReader(QThread):
         self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         self.frame_time = 1000 / self.fps if self.fps > 0 else 33.33
         print(f"视频帧率: {self.fps}, 每帧时长: {self.frame_time}ms")
+
+        # 解码器保持打开, 逐帧前进/后退及定位都通过解码源完成
+        self.source = FrameSource(self.cap, self.fps)
+        # 关键帧索引在后台构建, 完成后定位从关键帧开始并校验帧号
+        request_video_index(video_path).add_done_callback(self._on_index_ready)
         
-        # 预读一帧确认格式
-        ret, test_frame = self.cap.read()
-        if ret:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # 重置到开始
+        # 预读一帧确认格式, 第0帧保存在解码源的缓冲区中
+        test_frame = self.source.frame_at(0)
+        if test_frame is not None:
+            self.source.seek(0)  # 重置到开始
+            self.queue_capacity = max(2, min(self.max_queue_size, self.QUEUE_BUDGET_BYTES // test_frame.nbytes))
             print(
                 f"视频 {video_path} 打开成功，分辨率: {test_frame.shape[1]}x{test_frame.shape[0]}"
             )
@@ -224,79 +181,155 @@ class FrameReader(QThread):
         # 最后尝试原始路径，不指定后端
         self.cap = cv2.VideoCapture(self.video_path)
         
-    def set_playback_speed(self, speed):
-        """设置播放速度"""
-        self.playback_speed = speed
-        print(f"帧读取器播放速度设置为: {speed}")
-    
+    def _on_index_ready(self, future):
+        """视频索引构建完成, 在工作线程中回调"""
+        if future.cancelled() or future.exception() is not None or (index := future.result()) is None:
+            return
+        with self.lock:
+            self.source.set_index(index)
+        try:
+            self.index_ready.emit()
+        except RuntimeError:
+            pass  # 帧读取线程已被销毁
+
     def run(self):
+        """解码线程, 队列已满、暂停或到达结尾时等待"""
         while self.running:
-            if self.paused:
-                time.sleep(0.01)  # 暂停时降低CPU使用
-                continue
-            
-            # 控制帧发送频率，根据视频帧率和播放速度调整
-            current_time = time.time()
-            elapsed = current_time - self.last_emit_time
-            target_frame_time = (
-                (1.0 / self.fps) / self.playback_speed
-                if self.fps > 0
-                else 0.033 / self.playback_speed
-            )  # 秒
-
-            if elapsed < target_frame_time:
-                # 等待直到达到正确的时间间隔再发送下一帧
-                sleep_time = target_frame_time - elapsed
-                time.sleep(sleep_time / 2)  # 除以2避免过度睡眠
-                continue
-                
+            with self._cond:
+                while self.running and (self.paused or self._at_eof or len(self._queue) >= self.queue_capacity):
+                    self._cond.wait(0.1)
+                if not self.running:
+                    break
+                generation, late_before_ms = self._generation, self._late_before_ms
+                seek_request, self._seek_request = self._seek_request, None
+
+            skipped, frame = False, None
             with self.lock:
-                ret, frame = self.cap.read()
-                if ret:
-                    self.current_frame_number = int(
-                        self.cap.get(cv2.CAP_PROP_POS_FRAMES)
-                    )
-                    self.current_time_ms = int(self.cap.get(cv2.CAP_PROP_POS_MSEC))
-                    
-                    # 记录发送时间
-                    self.last_emit_time = time.time()
-                    
-                    # 发送信号
-                    self.frame_ready.emit(
-                        self.current_frame_number, frame.copy(), self.current_time_ms
-                    )
+                if generation != self._generation:
+                    continue
+                if seek_request is not None:
+                    self.source.seek(seek_request)
+                frame_number = self.source.position
+                if self.source.time_ms(frame_number) < late_before_ms:
+                    # 已经过时的帧不转换颜色, 尽快追上播放时钟
+                    skipped = self.source.skip()
                 else:
-                    # 视频结束时重置到开始
-                    print(f"视频 {self.video_path} 播放完毕，重置到开始")
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    self.current_time_ms = 0
-                    self.current_frame_number = 0
-                    time.sleep(0.5)  # 添加小延迟防止立即循环
-            
+                    frame_number, frame = self.source.read()
+
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                if skipped:
+                    self.dropped_frames += 1
+                elif frame is None:
+                    self._at_eof = True
+                else:
+                    self._queue.append((frame_number, self.source.time_ms(frame_number), frame))
+                self._cond.notify_all()
+
+    def frame_for(self, time_ms):
+        """
+        取出时间戳不晚于 time_ms 的最新一帧, 更早的帧作为过时帧丢弃.
+        Returns:
+            tuple: (帧号, 时间戳ms, 帧), 下一帧还没到显示时间或尚未解码时返回None.
+        """
+        with self._cond:
+            self._late_before_ms = time_ms - self.frame_time
+            item = None
+            while self._queue and self._queue[0][1] <= time_ms:
+                if item is not None:
+                    self.dropped_frames += 1
+                item = self._queue.popleft()
+            if item is None:
+                return None
+            self.current_frame_number, self.current_time_ms = item[0], item[1]
+            self._cond.notify_all()
+            return item
+
+    def at_end(self):
+        """已解码到视频结尾且队列中的帧都已取出"""
+        with self._cond:
+            return self._at_eof and not self._queue
+
+    def _restart(self):
+        """解码位置改变后清空预解码队列, 调用方持有 self.lock"""
+        with self._cond:
+            self._generation += 1
+            self._queue.clear()
+            self._late_before_ms = -1.0
+            self._at_eof = False
+            self._seek_request = None
+            self._cond.notify_all()
+
+    def request_seek(self, frame_number):
+        """
+        请求从 frame_number 开始解码, 不等待 self.lock, 由解码线程在下一次解码前执行.
+        主时钟回调中重新定位时使用, 避免等待正在解码的帧; 之后的 seek()/frame_at() 会覆盖该请求.
+        """
+        if frame_number < 0:
+            return
+        with self._cond:
+            self._generation += 1
+            self._queue.clear()
+            self._late_before_ms = -1.0
+            self._at_eof = False
+            self._seek_request = frame_number
+            self.current_frame_number = frame_number
+            self.current_time_ms = self.source.time_ms(frame_number)
+            self._cond.notify_all()
+
     def seek(self, frame_number):
         with self.lock:
             if frame_number >= 0:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                self.source.seek(frame_number)
                 self.current_frame_number = frame_number
-                self.current_time_ms = int(frame_number * self.frame_time)
+                self.current_time_ms = self.source.time_ms(frame_number)
+                self._restart()
             
+    # 视频索引设置后不再修改, 帧号与时间戳的换算不需要持有 self.lock, 显示端调用时不等待解码
+    def time_ms(self, frame_number):
+        """帧号对应的时间戳(毫秒)"""
+        return self.source.time_ms(frame_number)
+
+    def index_at(self, time_ms):
+        """时间戳(毫秒)对应的帧号"""
+        return self.source.index_at(time_ms)
+
     def seek_time(self, time_ms):
-        """按时间戳定位视频位置"""
+        """按时间戳定位视频位置, 返回该时间正在显示的帧号"""
         with self.lock:
             if time_ms >= 0:
-                self.cap.set(cv2.CAP_PROP_POS_MSEC, time_ms)
+                self.current_frame_number = self.source.index_at(time_ms)
                 self.current_time_ms = time_ms
-                self.current_frame_number = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+                self.source.seek(self.current_frame_number)
+                self._restart()
+            return self.current_frame_number
+
+    def frame_at(self, frame_number):
+        """读取指定帧, 之后从其下一帧继续解码; 刚显示过或已预解码的帧直接从缓冲区返回"""
+        with self.lock:
+            frame = self.source.frame_at(frame_number)
+            if frame is not None:
+                self.current_frame_number = frame_number
+                self.current_time_ms = self.source.time_ms(frame_number)
+                self._restart()
+            return frame
             
     def pause(self):
         self.paused = True
         
     def resume(self):
-        self.paused = False
+        with self._cond:
+            self.paused = False
+            self._cond.notify_all()
         
     def stop(self):
-        self.running = False
+        with self._cond:
+            self.running = False
+            self._queue.clear()
+            self._cond.notify_all()
         self.wait()
+        self.source.clear()
         if self.cap:
             self.cap.release()
 
@@ -311,11 +344,11 @@ class VideoPlayer(QWidget):
         # 初始化字体管理器
         self.font_manager = SingleFontManager.get_font(10)
         self.font_manager_small = SingleFontManager.get_font(10)
+        self._offset_ms = 0     # 跳帧数对应的时间, 见 offset_ms
         
         try:
-            # 初始化帧读取线程，使用信号槽代替队列
+            # 初始化帧读取线程，解码到预解码队列，显示端按播放时钟取帧
             self.frame_reader = FrameReader(video_path)
-            self.frame_reader.frame_ready.connect(self.on_frame_ready)
             
             # 临时打开视频获取基本信息(总帧数、帧率、尺寸、时长)
             cap = cv2.VideoCapture(video_path)
@@ -375,6 +408,13 @@ class VideoPlayer(QWidget):
             self.destroyed.connect(self.cleanup)
             self.is_cleaning_up = False  # 添加清理标志
             
+            # 由 VideoWall 的主时钟驱动显示, 记录上次因落后主时钟而重新定位的时刻
+            self.last_resync_time = 0.0
+
+            # 视频索引构建完成后帧号对应的时间戳可能改变, 重新计算偏移
+            self.frame_reader.index_ready.connect(self._update_offset)
+            self._update_offset()
+
             # 启动帧读取线程
             self.frame_reader.start()
 
@@ -393,6 +433,59 @@ class VideoPlayer(QWidget):
         ms = int((total_seconds - int(total_seconds)) * 1000)
         return f"{minutes:02d}:{seconds:02d}.{ms:03d}"
 
+    @property
+    def offset_ms(self):
+        """本视频相对 VideoWall 主时钟的偏移(毫秒), 即跳帧数对应的时间"""
+        return self._offset_ms
+
+    def _update_offset(self):
+        """跳帧数或视频索引改变后重新计算 offset_ms, 主时钟回调中直接读取缓存的偏移"""
+        self._offset_ms = self.frame_reader.time_ms(self.frame_skip)
+
+    def present_frame(self, time_ms):
+        """
+        VideoWall 主时钟的回调, 显示本视频 time_ms 时刻应显示的帧.
+        解码落后主时钟超过 RESYNC_MS 时直接定位到 time_ms, 纠正累积的偏差.
+        Returns:
+            bool: 本视频是否已播放到结尾.
+        """
+        if self.is_cleaning_up or not hasattr(self, 'frame_reader'):
+            return True
+        item = self.frame_reader.frame_for(time_ms)
+        if item is not None:
+            frame_number, frame_time_ms, frame = item
+            self.on_frame_ready(frame_number, frame, frame_time_ms)
+        if self.frame_reader.at_end():
+            return True
+        # 与帧读取器的位置比较, 刚定位还没解码出第一帧时不会误判为落后
+        lag_ms = time_ms - self.frame_reader.current_time_ms
+        now = time.monotonic()
+        if lag_ms > RESYNC_MS and now - self.last_resync_time > RESYNC_COOLDOWN_S:
+            print(f"视频 {os.path.basename(self.video_path)} 落后主时钟 {lag_ms:.0f}ms, 重新定位")
+            self.last_resync_time = now
+            self.frame_reader.request_seek(self.frame_reader.index_at(time_ms))
+        return False
+
+    def seek_to_time(self, time_ms):
+        """定位到本视频的 time_ms 时刻, 暂停时立即显示该帧; 由 VideoWall 统一调用, 不改变主时钟"""
+        if not hasattr(self, 'frame_reader'):
+            return
+        frame_number = self.frame_reader.index_at(max(0, time_ms))
+        if self.is_paused:
+            frame = self.frame_reader.frame_at(frame_number)
+            if frame is not None:
+                self.on_frame_ready(frame_number, frame, self.frame_reader.current_time_ms)
+        else:
+            self.frame_reader.seek(frame_number)
+
+    def set_paused(self, paused):
+        """设置暂停状态并更新按钮图标, 由 VideoWall 统一调用"""
+        self.is_paused = paused
+        icon_name = "pause.ico" if paused else "play.ico"
+        self.play_button.setIcon(QIcon(os.path.abspath(os.path.join(BasePath, "resource", "icons", icon_name))))
+        if not paused:
+            self.last_update_time = time.time()  # 重置时间基准
+
     def on_frame_ready(self, frame_number, frame, time_ms):
         """当帧准备好时，显示它并更新状态"""
         try:
@@ -844,52 +937,43 @@ class VideoPlayer(QWidget):
             print(f"显示帧时出错: {str(e)}")
 
     def play_pause(self):
-        if self.is_paused:
-            self.is_paused = False
-            self.frame_reader.resume()
-            self.last_update_time = time.time()  # 重置时间基准
-            play_icon_path = os.path.abspath(os.path.join(BasePath, "resource", "icons", "play.ico"))
-            self.play_button.setIcon(QIcon(play_icon_path))
-        else:
-            self.is_paused = True
-            self.frame_reader.pause()
-            pause_icon_path = os.path.abspath(os.path.join(BasePath, "resource", "icons", "pause.ico"))
-            self.play_button.setIcon(QIcon(pause_icon_path))
+        """所有视频共用主时钟, 播放/暂停作用于整个视频墙"""
+        self.video_wall.play_pause_all_videos()
 
     def replay(self):
-        self.current_time = 0
-        self.current_frame = 0
-        self.frame_reader.seek_time(0)
-        self.slider.setValue(0)
-        
-        if self.is_paused:
-            self.play_pause()  # 如果是暂停状态，切换为播放
+        self.video_wall.replay_all_videos()
 
     def set_speed(self, value):
-        """设置播放速度，影响帧读取器的行为"""
-        old_speed = self.playback_speed
-        self.playback_speed = value
-        
-        # 将播放速度传递给帧读取器
-        if hasattr(self, "frame_reader"):
-            self.frame_reader.set_playback_speed(value)
-            
-        print(f"播放速度从 {old_speed} 更改为 {value}")
+        """设置播放速度，所有视频共用主时钟的速度"""
+        if abs(self.video_wall.clock.speed - value) > 1e-6:
+            self.video_wall.set_speed_all_videos(value)
 
     def set_frame_skip(self, value):
+        """跳帧数决定本视频相对主时钟的偏移, 修改后按新的偏移定位到主时钟当前位置"""
         self.frame_skip = value
+        self._update_offset()
         if self.frame_skip < self.total_frames:
-            time_ms = int(self.frame_skip * (1000 / self.fps))
-            self.current_time = time_ms
-            self.frame_reader.seek_time(time_ms)
-            self.current_frame = self.frame_skip
+            self.seek_to_time(self.video_wall.clock.now() + self.offset_ms)
             self.last_update_time = time.time()  # 重置时间基准
 
+    def step_frame(self, delta):
+        """前进/后退 delta 帧, 由帧读取器的解码源读取, 不重新打开视频; 由 VideoWall 暂停后统一调用"""
+        if not hasattr(self, 'frame_reader'):
+            return
+
+        target_frame = min(self.total_frames - 1, max(0, self.current_frame + delta))
+        frame = self.frame_reader.frame_at(target_frame)
+        if frame is None:
+            print(f"读取视频 {os.path.basename(self.video_path)} 的帧 {target_frame} 失败")
+            return
+        # 与播放时相同的显示流程, 同时更新最新帧、进度条和帧信息
+        self.on_frame_ready(target_frame, frame, self.frame_reader.current_time_ms)
+
     def seek_position(self, position):
         # 根据百分比计算目标时间
         target_time = int((position / 100) * self.duration_ms)
-        self.current_time = target_time
-        self.frame_reader.seek_time(target_time)
+        # 所有视频按各自的偏移同步跳转, 暂停时立即显示对应帧
+        self.video_wall.seek_all_videos(target_time - self.offset_ms)
         self.last_update_time = time.time()  # 重置时间基准
 
     def handle_slider_pressed(self):
@@ -1119,6 +1203,13 @@ class VideoWall(QWidget):
         # 添加节流变量，防止频繁缩放
         self.last_scale_time = 0
         self.scale_throttle_ms = 100  # 缩放操作间隔(毫秒)
+
+        # 所有视频共用的主时钟, 每个视频显示 主时钟时间 + 跳帧偏移 处的帧,
+        # 播放/暂停、跳转、变速都只改变主时钟, 整个视频墙同时生效, 不会各自漂移
+        self.clock = PlaybackClock()
+        self.present_timer = QTimer(self)
+        self.present_timer.setTimerType(Qt.PreciseTimer)
+        self.present_timer.timeout.connect(self.present_all_videos)
 		
         # 初始化相关组件
         self.init_ui()
@@ -1137,6 +1228,10 @@ class VideoWall(QWidget):
                     self.players.append(player)
             self.refresh_layout()
 
+        # 启动主时钟
+        self.clock.resume()
+        self.present_timer.start(PRESENT_INTERVAL_MS)
+
         # 将窗口移动到鼠标所在的屏幕
         self.move_to_current_screen()
         self.resize(1400, 1000)
@@ -1267,6 +1362,9 @@ class VideoWall(QWidget):
             if file_path.lower().endswith(video_extensions):
                 player = VideoPlayer(file_path, parent=self)  # 将 self 作为父级传递
                 self.players.append(player)
+                # 新加入的视频与主时钟对齐
+                player.set_paused(self.clock.paused)
+                player.seek_to_time(self.clock.now() + player.offset_ms)
                 self.refresh_layout()
         
 
@@ -1341,178 +1439,91 @@ class VideoWall(QWidget):
         except Exception as e:
             print(f"清空视频时发生错误: {str(e)}")
 
+    def present_all_videos(self):
+        """主时钟定时器回调, 同一时刻的主时钟时间分发给所有视频; 所有视频都播放到结尾后从头循环"""
+        if self.clock.paused or not self.players:
+            return
+        master_ms = self.clock.now()
+        finished = [player.present_frame(master_ms + player.offset_ms) for player in self.players]
+        if all(finished):
+            print("所有视频播放完毕，重置到开始")
+            self.seek_all_videos(0)
+
+    def seek_all_videos(self, master_ms):
+        """主时钟跳转到 master_ms, 所有视频定位到 master_ms + 各自的偏移"""
+        self.clock.set_time(master_ms)
+        for player in self.players:
+            try:
+                player.seek_to_time(master_ms + player.offset_ms)
+            except Exception as e:
+                print(f"跳转视频 {os.path.basename(player.video_path)} 时出错: {str(e)}")
+
     def play_pause_all_videos(self):
+        """主时钟播放/暂停, 所有视频同时生效"""
+        paused = not self.clock.paused
+        if paused:
+            self.clock.pause()
         for player in self.players:
-            player.play_pause()
+            player.set_paused(paused)
+        if not paused:
+            self.clock.resume()
 
     def replay_all_videos(self):
+        self.seek_all_videos(0)
+        if self.clock.paused:
+            self.play_pause_all_videos()  # 如果是暂停状态，切换为播放
+
+    def set_speed_all_videos(self, speed):
+        """设置主时钟的播放速度, 同步所有视频的速度输入框"""
+        speed = min(max(speed, 0.1), 10.0)  # 限制速度范围为0.1~10.0
+        print(f"播放速度从 {self.clock.speed:.1f} 更改为 {speed:.1f}")
+        self.clock.set_speed(speed)
         for player in self.players:
-            player.replay()
+            player.playback_speed = speed
+            if hasattr(player, 'speed_spinbox'):
+                player.speed_spinbox.blockSignals(True)
+                player.speed_spinbox.setValue(speed)  # 同步更新spinbox的值
+                player.speed_spinbox.blockSignals(False)
 
     def speed_up_all_videos(self):
-        for player in self.players:
-            new_speed = min(player.playback_speed + 0.1, 10.0)  # 限制最大速度为10.0
-            player.set_speed(new_speed)
-            player.speed_spinbox.setValue(new_speed)  # 同步更新spinbox的值
+        self.set_speed_all_videos(self.clock.speed + 0.1)
 
     def slow_down_all_videos(self):
-        for player in self.players:
-            new_speed = max(player.playback_speed - 0.1, 0.1)  # 限制最小速度为0.1
-            player.set_speed(new_speed)
-            player.speed_spinbox.setValue(new_speed)  # 同步更新spinbox的值
+        self.set_speed_all_videos(self.clock.speed - 0.1)
 
     def jump_to_frame_all_videos(self):
-        """从每个视频的跳帧数开始播放所有视频"""
+        """从每个视频的跳帧数开始播放所有视频: 主时钟归零, 各视频按跳帧偏移对齐"""
+        self.seek_all_videos(0)
+        for player in self.players:
+            print(f"视频 {os.path.basename(player.video_path)} 跳转到帧: {player.frame_skip}")
+        # 如果视频当前是暂停状态，则恢复播放
+        if self.clock.paused:
+            self.play_pause_all_videos()
+
+    def step_all_videos(self, delta):
+        """暂停后所有视频前进/后退 delta 帧, 主时钟对齐到第一个视频的当前帧"""
+        if not self.clock.paused:
+            self.play_pause_all_videos()
         for player in self.players:
             try:
-                # 获取跳帧数
-                frame_skip = player.frame_skip_spin.value()
-                
-                if frame_skip < player.total_frames:
-                    # 将视频定位到指定帧
-                    if hasattr(player, "frame_reader"):
-                        # 计算帧对应的时间(毫秒)
-                        time_ms = int(frame_skip * (1000 / player.fps))
-                        
-                        # 先暂停视频读取器
-                        player.frame_reader.pause()
-                        
-                        # 跳转到指定时间
-                        player.frame_reader.seek_time(time_ms)
-                        
-                        # 更新播放器状态
-                        player.current_frame = frame_skip
-                        player.current_time = time_ms
-                        
-                        # 如果视频当前是暂停状态，则恢复播放
-                        if player.is_paused:
-                            player.is_paused = False
-                            player.last_update_time = time.time()  # 重置时间基准
-                            
-                            # 更新播放/暂停按钮图标
-                            play_icon_path = os.path.abspath(os.path.join(BasePath, "resource", "icons", "play.ico"))   
-                            player.play_button.setIcon(QIcon(play_icon_path))
-                        
-                        # 恢复视频读取器运行
-                        player.frame_reader.resume()
-
-                        print(
-                            f"视频 {os.path.basename(player.video_path)} 跳转到帧: {frame_skip}"
-                        )
+                player.step_frame(delta)
             except Exception as e:
-                print(f"跳转到帧时出错: {str(e)}")
+                print(f"{'前进' if delta > 0 else '后退'}一帧时出错: {str(e)}")
+        if self.players:
+            reference = self.players[0]
+            self.clock.set_time(reference.current_time - reference.offset_ms)
 
     def frame_forward_all_videos(self):
         """所有视频前进一帧"""
-        try:
-            for player in self.players:
-                if hasattr(player, 'frame_reader'):
-                    # 计算下一帧的时间
-                    next_frame = min(player.total_frames - 1, player.current_frame + 1)
-                    
-                    # 暂停视频（如果正在播放）
-                    if not player.is_paused:
-                        player.play_pause()
-                    
-                    # 使用临时的视频捕获器来准确读取帧
-                    cap = cv2.VideoCapture(player.video_path)
-                    
-                    # 使用逐帧读取的方式获取目标帧
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    current = 0
-                    frame = None
-                    ret = False
-                    
-                    # 读取到目标帧
-                    while current <= next_frame:
-                        ret, temp_frame = cap.read()
-                        if not ret:
-                            break
-                        frame = temp_frame
-                        current += 1
-                    
-                    cap.release()
-                    
-                    if frame is not None:
-                        # 更新播放器状态
-                        player.current_frame = next_frame
-                        player.current_time = int(next_frame * (1000 / player.fps))
-                        
-                        # 应用旋转（如果有）
-                        if player.rotation_angle != 0:
-                            frame = player.rotate_image(frame, player.rotation_angle)
-                            
-                        # 显示帧
-                        player.display_frame(frame)
-                        
-                        # 更新进度条
-                        if player.duration_ms > 0:
-                            progress = (player.current_time / player.duration_ms) * 100
-                            player.slider.setValue(int(progress))
-                            
-                        # 更新帧读取器的位置
-                        player.frame_reader.seek(next_frame)
-                
-        except Exception as e:
-            print(f"前进一帧时出错: {str(e)}")
+        self.step_all_videos(1)
 
     def frame_backward_all_videos(self):
         """所有视频后退一帧"""
-        
-        try:
-            for player in self.players:
-                if hasattr(player, 'frame_reader'):
-                    # 计算上一帧的时间
-                    prev_frame = max(0, player.current_frame - 1)
-                    
-                    # 暂停视频（如果正在播放）
-                    if not player.is_paused:
-                        player.play_pause()
-                    
-                    # 使用临时的视频捕获器来准确读取帧
-                    cap = cv2.VideoCapture(player.video_path)
-                    
-                    # 使用逐帧读取的方式获取目标帧
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    current = 0
-                    frame = None
-                    ret = False
-                    
-                    # 读取到目标帧
-                    while current <= prev_frame:
-                        ret, temp_frame = cap.read()
-                        if not ret:
-                            break
-                        frame = temp_frame
-                        current += 1
-                    
-                    cap.release()
-                    
-                    if frame is not None:
-                        # 更新播放器状态
-                        player.current_frame = prev_frame
-                        player.current_time = int(prev_frame * (1000 / player.fps))
-                        
-                        # 应用旋转（如果有）
-                        if player.rotation_angle != 0:
-                            frame = player.rotate_image(frame, player.rotation_angle)
-                            
-                        # 显示帧
-                        player.display_frame(frame)
-                        
-                        # 更新进度条
-                        if player.duration_ms > 0:
-                            progress = (player.current_time / player.duration_ms) * 100
-                            player.slider.setValue(int(progress))
-                            
-                        # 更新帧读取器的位置
-                        player.frame_reader.seek(prev_frame)
-                
-        except Exception as e:
-            print(f"后退一帧时出错: {str(e)}")
+        self.step_all_videos(-1)
 
     def closeEvent(self, event):
         """程序关闭时的清理"""
+        self.present_timer.stop()
         for player in self.players:
             player.cleanup()
 
@@ -1,5 +1,5 @@
 # -*- encoding: utf-8 -*-
-'''
+r'''
 @File         :__init__.py
 @Time         :2025/06/03 15:09:05
 @Author       :diamond_cz@163.com
@@ -0,0 +1,94 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :benchmark_exif_header.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :对比 ImageProcessor 逐个读取与 read_metadata_batch 多线程读取文件头的耗时, 并校验结果一致
+
+用法:
+    python test/benchmark_exif_header.py             # 在临时目录生成3000张带EXIF的JPEG测试
+    python test/benchmark_exif_header.py D:/photos   # 使用指定文件夹中的JPEG测试
+'''
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import piexif
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.image import ImageProcessor
+from src.utils.exif_header import read_metadata_batch
+
+
+def make_test_images(folder, count=3000):
+    """生成带曝光时间、ISO、内嵌缩略图的测试JPEG, 部分图片不带EXIF"""
+    base = Image.new("RGB", (1600, 1200), (120, 80, 40))
+    thumb = Image.new("RGB", (160, 120), (120, 80, 40))
+    thumb_path = os.path.join(folder, "_thumb.jpg")
+    thumb.save(thumb_path, quality=80)
+    with open(thumb_path, "rb") as f:
+        thumb_bytes = f.read()
+    os.remove(thumb_path)
+
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"IMG_{i:05d}.jpg")
+        if i % 10 == 0:
+            base.save(path, quality=85)
+        else:
+            exif_dict = {
+                "0th": {piexif.ImageIFD.Make: b"hiviewer", piexif.ImageIFD.Orientation: 1},
+                "Exif": {piexif.ExifIFD.ExposureTime: (1, 25 + i % 4000),
+                         piexif.ExifIFD.ISOSpeedRatings: 50 + i % 6400},
+                "1st": {piexif.ImageIFD.JPEGInterchangeFormat: 0, piexif.ImageIFD.JPEGInterchangeFormatLength: 0},
+                "thumbnail": thumb_bytes,
+            }
+            base.save(path, quality=85, exif=piexif.dump(exif_dict))
+        paths.append(path)
+    return paths
+
+
+def read_with_image_processor(paths):
+    """原方案: 逐个创建 ImageProcessor 读取"""
+    result = {}
+    for path in paths:
+        with ImageProcessor(path) as img:
+            result[path] = (img.width, img.height, img.exposure_time, img.iso)
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        folder = sys.argv[1]
+        paths = [str(p) for p in Path(folder).iterdir() if p.suffix.lower() in ('.jpg', '.jpeg')]
+        tmp = None
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        print("生成测试图片...")
+        paths = make_test_images(tmp.name)
+
+    print(f"图片数量: {len(paths)}")
+
+    start = time.perf_counter()
+    expected = read_with_image_processor(paths)
+    serial_time = time.perf_counter() - start
+    print(f"ImageProcessor 逐个读取: {serial_time:.3f}s")
+
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        result = read_metadata_batch(paths, workers=workers)
+        batch_time = time.perf_counter() - start
+        print(f"read_metadata_batch(workers={workers}): {batch_time:.3f}s, 加速 {serial_time / batch_time:.1f}x")
+
+    mismatched = [p for p in paths if result.get(p) != expected[p]]
+    print(f"结果不一致的文件数: {len(mismatched)}")
+    for path in mismatched[:10]:
+        print(f"  {path}: {result.get(path)} != {expected[path]}")
+
+    if tmp is not None:
+        tmp.cleanup()
@@ -0,0 +1,99 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :benchmark_icc_transform.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :对比 ColorSpaceConverter 每次新建ICC转换器与缓存转换器+原地转换的单张耗时, 并校验结果一致
+
+用法:
+    python test/benchmark_icc_transform.py             # 在临时目录生成40张内嵌Display-P3配置文件的JPEG测试
+    python test/benchmark_icc_transform.py D:/photos   # 使用指定文件夹中的JPEG测试(手机拍摄的P3照片)
+'''
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.p3_converter import ColorSpaceConverter, TransformCache, BASEICONPATH
+
+
+def make_test_images(folder, count=40, size=(2000, 1500)):
+    """生成内嵌Display-P3配置文件的测试JPEG, 模拟同一手机拍摄的一组照片"""
+    icc_profile = (BASEICONPATH / "resource" / "icc" / "DisplayP3-v4.icc").read_bytes()
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, size[0], dtype=np.float32)[None, :, None]
+    paths = []
+    for i in range(count):
+        noise = rng.normal(0, 20, (size[1], size[0], 3)).astype(np.float32)
+        pixels = np.clip(gradient + noise + i, 0, 255).astype(np.uint8)
+        path = os.path.join(folder, f"IMG_{i:05d}.jpg")
+        Image.fromarray(pixels).save(path, quality=90, icc_profile=icc_profile)
+        paths.append(path)
+    return paths
+
+
+def load_images(paths):
+    """预先解码图片, 计时只包含色域转换"""
+    images = []
+    for path in paths:
+        with Image.open(path) as img:
+            img.load()
+            images.append(img.copy())
+    return images
+
+
+def run(converter, images, in_place):
+    """依次转换到sRGB再转换到Display-P3, 返回 (单张平均耗时, 转换结果)"""
+    results = []
+    elapsed = 0.0
+    for img in images:
+        # 原地转换会修改图像, 副本在计时外生成, 对应实际使用时刚打开的图片
+        work = img.copy() if in_place else img
+        start = time.perf_counter()
+        srgb = converter.get_pilimg_sRGB(work, in_place=in_place)
+        p3 = converter.convert_color_space(srgb, "Display-P3", intent="Relative Colorimetric", in_place=in_place)
+        elapsed += time.perf_counter() - start
+        results.append(np.asarray(p3))
+    return elapsed / len(images), results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        folder = sys.argv[1]
+        paths = [str(p) for p in Path(folder).iterdir() if p.suffix.lower() in ('.jpg', '.jpeg')]
+        tmp = None
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        print("生成测试图片...")
+        paths = make_test_images(tmp.name)
+
+    images = load_images(paths)
+    print(f"图片数量: {len(images)}, 内嵌ICC的图片数量: {sum('icc_profile' in img.info for img in images)}")
+    converter = ColorSpaceConverter()
+
+    # 原方案: 每次转换都重新创建配置文件和转换器, 转换结果写入新图像
+    converter.transform_cache = TransformCache(maxsize=0)
+    before, expected = run(converter, images, in_place=False)
+    print(f"每次新建转换器: {before * 1000:.1f} ms/张")
+
+    # 新方案: 按(源配置文件哈希, 目标, 渲染意图, 模式)缓存转换器, 原地转换
+    converter.transform_cache = TransformCache()
+    after, result = run(converter, images, in_place=True)
+    cache = converter.transform_cache
+    print(f"缓存转换器+原地转换: {after * 1000:.1f} ms/张, 加速 {before / after:.2f}x, "
+          f"缓存命中 {cache.hits}/{cache.hits + cache.misses}")
+
+    mismatched = [path for path, a, b in zip(paths, expected, result) if not np.array_equal(a, b)]
+    print(f"结果不一致的文件数: {len(mismatched)}")
+    for path in mismatched[:10]:
+        print(f"  {path}")
+
+    if tmp is not None:
+        tmp.cleanup()
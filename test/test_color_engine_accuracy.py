@@ -0,0 +1,97 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_color_engine_accuracy.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :对比 numpy 色域转换引擎与 LittleCMS(ImageCms) 的转换结果及耗时
+
+覆盖 resource/icc 中的矩阵/TRC配置文件: 内置sRGB -> Display-P3/DCI-P3/Rec2020, 以及相机内嵌Display-P3 -> sRGB.
+测试像素包含每通道17级的颜色网格、随机颜色及每通道的0~255渐变.
+基准为关闭优化(cmsFLAGS_NOOPTIMIZE)的LittleCMS全精度转换, 相差不超过 MAX_DIFF 个色阶时通过.
+同时输出与默认LittleCMS转换的差异: 默认转换走8位矩阵/TRC优化路径, 输出曲线按线性值14位量化,
+伽马2.6(DCI-P3)在接近黑色处一个量化步长约6个色阶, 这部分差异来自LittleCMS自身.
+
+用法:
+    python test/test_color_engine_accuracy.py
+'''
+
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageCms
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.color_engine import MatrixTRCProfile, MatrixTRCTransform
+from src.utils.p3_converter import ColorSpaceConverter, BASEICONPATH, INTENT_MAP, _builtin_srgb_bytes
+
+MAX_DIFF = 1            # 允许与LittleCMS全精度转换相差的最大色阶
+NOOPTIMIZE = 0x0100     # cmsFLAGS_NOOPTIMIZE, 关闭LittleCMS的8位优化路径
+ICC_DIR = BASEICONPATH / "resource" / "icc"
+
+
+def make_test_pixels():
+    """生成测试像素: 每通道17级的网格(含0和255)、随机颜色以及每通道的完整渐变"""
+    levels = np.linspace(0, 255, 17).astype(np.uint8)
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    rng = np.random.default_rng(0)
+    random = rng.integers(0, 256, (200000, 3), dtype=np.uint8)
+    ramp = np.arange(256, dtype=np.uint8)
+    zeros = np.zeros(256, dtype=np.uint8)
+    ramps = np.concatenate([np.stack([ramp, zeros, zeros], -1), np.stack([zeros, ramp, zeros], -1),
+                            np.stack([zeros, zeros, ramp], -1), np.stack([ramp, ramp, ramp], -1)])
+    pixels = np.concatenate([grid, random, ramps])
+    return pixels.reshape(1, -1, 3)
+
+
+def lcms_convert(rgb, src_bytes, dst_bytes, intent, flags=0):
+    """LittleCMS转换结果, 作为基准"""
+    transform = ImageCms.buildTransform(ImageCms.ImageCmsProfile(BytesIO(src_bytes)),
+                                        ImageCms.ImageCmsProfile(BytesIO(dst_bytes)), "RGB", "RGB",
+                                        INTENT_MAP[intent], flags=flags)
+    return np.asarray(ImageCms.applyTransform(Image.fromarray(rgb), transform)).astype(np.int16)
+
+
+def check_accuracy(name, src_bytes, dst_bytes, intent, pixels):
+    """返回是否通过, 打印与全精度及默认LittleCMS转换的最大及平均误差"""
+    result = MatrixTRCTransform(MatrixTRCProfile(src_bytes), MatrixTRCProfile(dst_bytes)).apply(pixels).astype(np.int16)
+    precise = np.abs(result - lcms_convert(pixels, src_bytes, dst_bytes, intent, NOOPTIMIZE))
+    default = np.abs(result - lcms_convert(pixels, src_bytes, dst_bytes, intent))
+    passed = precise.max() <= MAX_DIFF
+    print(f"{'✅' if passed else '❌'} {name:<26} {intent:<22} "
+          f"全精度 最大误差: {precise.max()} 平均误差: {precise.mean():.4f} | "
+          f"默认 最大误差: {default.max()} 平均误差: {default.mean():.4f}")
+    return passed
+
+
+def benchmark(size=(6000, 4000), repeat=3):
+    """对比两种引擎将一张sRGB图片转换到Display-P3的耗时"""
+    rng = np.random.default_rng(1)
+    rgb = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    for engine in ("lcms", "numpy"):
+        converter = ColorSpaceConverter(engine=engine)
+        converter.convert_rgb(rgb[:16], "Display-P3", "Relative Colorimetric")     # 预先创建转换器
+        start = time.perf_counter()
+        for _ in range(repeat):
+            converter.convert_rgb(rgb, "Display-P3", "Relative Colorimetric")
+        print(f"{engine:<6} {size[0]}x{size[1]} sRGB->Display-P3: {(time.perf_counter() - start) / repeat * 1000:.1f} ms/张")
+
+
+if __name__ == "__main__":
+    pixels = make_test_pixels()
+    srgb = _builtin_srgb_bytes()
+    cases = [
+        ("sRGB -> Display-P3", srgb, (ICC_DIR / "DisplayP3-v4.icc").read_bytes()),
+        ("sRGB -> DCI-P3", srgb, (ICC_DIR / "DCI-P3-v4.icc").read_bytes()),
+        ("sRGB -> Rec2020", srgb, (ICC_DIR / "Rec2020-v4.icc").read_bytes()),
+        ("sRGB-v4 -> sRGB", (ICC_DIR / "sRGB-v4.icc").read_bytes(), srgb),
+        ("Display-P3(内嵌) -> sRGB", (ICC_DIR / "DisplayP3-v4.icc").read_bytes(), srgb),
+    ]
+    results = [check_accuracy(name, src, dst, intent, pixels)
+               for name, src, dst in cases for intent in ("Perceptual", "Relative Colorimetric")]
+    print(f"通过 {sum(results)}/{len(results)}")
+    benchmark()
+    sys.exit(0 if all(results) else 1)
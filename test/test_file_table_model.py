@@ -0,0 +1,86 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_file_table_model.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :主界面文件表格模型(FileTableModel)的逐列填充及增量替换测试
+
+用法:
+    python -m pytest test/test_file_table_model.py
+'''
+
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QIcon, QPixmap
+
+from src.components.custom_qTableView_files import FileTableModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def make_info(name, mtime=1, size=100, folder="/a"):
+    """文件信息元组: (文件名称, 创建时间, 修改时间, 文件大小, (宽, 高), 曝光时间, ISO, 文件路径)"""
+    return (name, 0, mtime, size, (None, None), None, None, f"{folder}/{name}")
+
+
+def make_icon():
+    pixmap = QPixmap(4, 4)
+    pixmap.fill()
+    return QIcon(pixmap)
+
+
+def test_append_column_extends_rows(app):
+    model = FileTableModel()
+    model.append_column([make_info("1.jpg")], "a")
+    model.append_column([make_info("1.jpg", folder="/b"), make_info("2.jpg", folder="/b")], "b")
+    assert (model.rowCount(), model.columnCount()) == (2, 2)
+    assert model.file_info(1, 0) is None
+    assert model.find_path("/b/2.jpg") == (1, 1)
+
+
+def test_replace_column_keeps_icons_of_unchanged_files(app):
+    model = FileTableModel()
+    model.set_files([[make_info("1.jpg"), make_info("2.jpg"), make_info("3.jpg")]], ["a"])
+    icons = [make_icon() for _ in range(3)]
+    for row, icon in enumerate(icons):
+        model.set_cell_icon(row, 0, icon)
+
+    # 删除1.jpg, 修改3.jpg, 新增4.jpg
+    reload_paths = model.replace_column(0, [make_info("2.jpg"), make_info("3.jpg", mtime=2), make_info("4.jpg")])
+
+    assert reload_paths == ["/a/3.jpg", "/a/4.jpg"]
+    assert model.cell_icon(0, 0) is icons[1]
+    assert model.cell_icon(1, 0) is None and model.cell_icon(2, 0) is None
+    assert model.find_path("/a/1.jpg") is None and model.find_path("/a/2.jpg") == (0, 0)
+
+
+def test_replace_column_shrinks_rows(app):
+    model = FileTableModel()
+    model.set_files([[make_info("1.jpg"), make_info("2.jpg")], [make_info("1.jpg", folder="/b")]], ["a", "b"])
+    model.set_cell_icon(0, 1, make_icon())
+    model.replace_column(0, [make_info("1.jpg")])
+    assert model.rowCount() == 1
+    # 其它列的图标不受影响
+    assert model.cell_icon(0, 1) is not None
+
+
+def test_failed_icons_are_not_reloaded_until_modified(app):
+    model = FileTableModel()
+    model.set_files([[make_info("1.jpg")]], ["a"])
+    model.mark_icon_failed(0, 0)
+    assert not model.needs_icon(0, 0)
+    assert model.replace_column(0, [make_info("1.jpg")]) == []
+    assert not model.needs_icon(0, 0)
+    assert model.replace_column(0, [make_info("1.jpg", size=200)]) == ["/a/1.jpg"]
+    assert model.needs_icon(0, 0)
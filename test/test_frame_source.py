@@ -0,0 +1,99 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_frame_source.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频逐帧解码源(FrameSource)的随机访问、逐帧后退及顺序读取测试
+
+用法:
+    python -m pytest test/test_frame_source.py
+'''
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.frame_source import FrameSource
+
+FRAME_COUNT = 90
+
+
+def write_video(path, count=FRAME_COUNT, fourcc='mp4v'):
+    """写入每帧亮度不同的测试视频, 编码器不可用时跳过测试"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), 25, (64, 48))
+    if not writer.isOpened():
+        pytest.skip(f"OpenCV 不支持 {fourcc} 编码")
+    for i in range(count):
+        writer.write(np.full((48, 64, 3), i * 2, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def frame_id(frame):
+    return int(round(float(frame.mean())))
+
+
+def sequential_ids(path):
+    """顺序解码得到的逐帧标识, 作为随机访问结果的参照"""
+    cap = cv2.VideoCapture(path)
+    ids = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        ids.append(frame_id(frame))
+    cap.release()
+    return ids
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = write_video(tmp_path / "test.mp4")
+    cap = cv2.VideoCapture(path)
+    yield FrameSource(cap, 25), sequential_ids(path)
+    cap.release()
+
+
+def test_random_access_matches_sequential_decode(video):
+    source, expected = video
+    for index in (0, 1, 75, 40, 39, 38, 10, 89, 5):
+        assert frame_id(source.frame_at(index)) == expected[index]
+
+
+def test_step_backward_hits_ring_buffer(video):
+    source, expected = video
+    source.frame_at(70)
+    for index in range(69, 60, -1):
+        assert frame_id(source.frame_at(index)) == expected[index]
+    # 小幅后退时已经顺序解码填满缓冲区, 继续后退不再解码
+    decoder_index = source._decoder_index
+    assert frame_id(source.frame_at(60)) == expected[60]
+    assert source._decoder_index == decoder_index
+
+
+def test_read_and_skip_continue_after_frame_at(video):
+    source, expected = video
+    source.frame_at(20)
+    assert source.read()[0] == 21
+    assert source.skip()
+    index, frame = source.read()
+    assert index == 23 and frame_id(frame) == expected[23]
+
+
+def test_out_of_range(video):
+    source, _ = video
+    assert source.frame_at(-1) is None
+    assert source.frame_at(FRAME_COUNT) is None
+    source.seek(FRAME_COUNT)
+    assert source.read() == (None, None)
+
+
+def test_time_and_index_without_video_index(video):
+    source, _ = video
+    assert source.time_ms(10) == 400
+    assert source.index_at(400) == 10 and source.index_at(419) == 10 and source.index_at(-5) == 0
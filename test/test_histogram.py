@@ -0,0 +1,56 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_histogram.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :亮度及R/G/B直方图(compute_histograms)的逐像素统计及取样步长测试
+
+用法:
+    python -m pytest test/test_histogram.py
+'''
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.histogram import compute_histograms
+
+
+def random_image(height=123, width=157, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def bincount(values):
+    return np.bincount(values.ravel(), minlength=256)
+
+
+def test_full_histograms_match_pixel_counts():
+    rgb = random_image()
+    hist = compute_histograms(rgb)
+    assert hist.shape == (4, 256) and hist.dtype == np.int64
+    assert np.array_equal(hist[0], bincount(cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)))
+    for channel in range(3):
+        assert np.array_equal(hist[channel + 1], bincount(rgb[:, :, channel]))
+
+
+def test_step_samples_every_nth_row_and_column():
+    rgb = random_image()
+    hist = compute_histograms(rgb, step=4)
+    sample = rgb[::4, ::4]
+    assert hist[0].sum() == sample.shape[0] * sample.shape[1]
+    for channel in range(3):
+        assert np.array_equal(hist[channel + 1], bincount(sample[:, :, channel]))
+
+
+def test_cached_gray_is_used_only_at_full_resolution():
+    rgb = random_image()
+    gray = np.zeros(rgb.shape[:2], dtype=np.uint8)
+    # step 为1时直接统计传入的灰度图
+    assert compute_histograms(rgb, gray=gray)[0][0] == gray.size
+    # 取样时灰度图尺寸不一致, 由取样后的RGB重新转换
+    assert np.array_equal(compute_histograms(rgb, step=2, gray=gray)[0],
+                          bincount(cv2.cvtColor(np.ascontiguousarray(rgb[::2, ::2]), cv2.COLOR_RGB2GRAY)))
@@ -0,0 +1,65 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_icon_store.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :图标存储(IconStore)的LRU淘汰及 (路径, 修改时间, 文件大小) 失效测试
+
+用法:
+    python -m pytest test/test_icon_store.py
+'''
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.icon_store import IconStore, make_icon_key
+
+
+def test_get_many_returns_only_hits(tmp_path):
+    store = IconStore(tmp_path / "icons.db")
+    store.put_many([(("a.jpg", 1, 10), b"a"), (("b.jpg", 1, 10), b"b")])
+    assert store.get_many([("a.jpg", 1, 10), ("b.jpg", 1, 10), ("c.jpg", 1, 10)]) == {
+        ("a.jpg", 1, 10): b"a", ("b.jpg", 1, 10): b"b"}
+    store.close()
+
+
+def test_modified_file_invalidates_and_replaces_entry(tmp_path):
+    store = IconStore(tmp_path / "icons.db")
+    store.put_many([(("a.jpg", 1, 10), b"old")])
+    # 修改时间或大小不同时不命中
+    assert store.get(("a.jpg", 2, 10)) is None
+    assert store.get(("a.jpg", 1, 11)) is None
+    # 写入新版本时替换同一路径的旧记录
+    store.put_many([(("a.jpg", 2, 12), b"new")])
+    assert store.count() == 1
+    assert store.get(("a.jpg", 1, 10)) is None
+    assert store.get(("a.jpg", 2, 12)) == b"new"
+    store.close()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = IconStore(tmp_path / "icons.db", max_entries=2)
+    store.put_many([(("a.jpg", 1, 1), b"a")])
+    time.sleep(0.02)
+    store.put_many([(("b.jpg", 1, 1), b"b")])
+    time.sleep(0.02)
+    # 读取a后b成为最久未访问的条目
+    assert store.get(("a.jpg", 1, 1)) == b"a"
+    time.sleep(0.02)
+    store.put_many([(("c.jpg", 1, 1), b"c")])
+    assert store.count() == 2
+    assert store.get(("b.jpg", 1, 1)) is None
+    assert store.get(("a.jpg", 1, 1)) == b"a"
+    assert store.get(("c.jpg", 1, 1)) == b"c"
+    store.close()
+
+
+def test_make_icon_key_uses_mtime_and_size(tmp_path):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"12345")
+    key = make_icon_key(str(path))
+    assert key[0] == str(path) and key[2] == 5
+    assert key[1] == path.stat().st_mtime_ns
@@ -0,0 +1,92 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_integral_stats.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :块积分图ROI统计(IntegralStats)与逐像素统计结果一致性测试
+
+用法:
+    python -m pytest test/test_integral_stats.py
+'''
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.integral_stats import IntegralStats, BLOCK
+
+
+def reference_stats(rgb):
+    """与看图子界面 calculate_image_stats(roi, 1) 相同的逐像素统计, 该模块依赖界面环境不能直接导入"""
+    lab = cv2.cvtColor(rgb, cv2.COLOR_RGB2LAB)
+    avg_rgb = np.mean(rgb, axis=(0, 1))
+    avg_lab = np.mean(lab, axis=(0, 1))
+    contrast = np.std(lab[:, :, 0].astype(np.float32) * (100 / 255))
+    return {
+        'width': rgb.shape[1],
+        'height': rgb.shape[0],
+        'avg_brightness': 0.299 * avg_rgb[0] + 0.587 * avg_rgb[1] + 0.114 * avg_rgb[2],
+        'contrast': contrast,
+        'avg_rgb': tuple(avg_rgb),
+        'avg_lab': (avg_lab[0] * (100 / 255), avg_lab[1] - 128, avg_lab[2] - 128),
+        'R_G': avg_rgb[0] / avg_rgb[1],
+        'B_G': avg_rgb[2] / avg_rgb[1],
+    }
+
+
+def assert_stats_match(stats, expected):
+    # 结果保留1位小数, 允许舍入边界上相差一个最小单位
+    assert (stats['width'], stats['height']) == (expected['width'], expected['height'])
+    for key in ('avg_brightness', 'contrast'):
+        assert stats[key] == pytest.approx(expected[key], abs=0.06)
+    for key in ('avg_rgb', 'avg_lab'):
+        assert stats[key] == pytest.approx(expected[key], abs=0.06)
+    for key in ('R_G', 'B_G'):
+        assert stats[key] == pytest.approx(expected[key], abs=1e-4)
+
+
+def random_image(height, width, seed=0):
+    # 平滑渐变叠加噪声, 避免所有区域的均值都接近 127
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 200, width)[None, :, None] * np.array([1.0, 0.6, 0.3])
+    noise = rng.integers(0, 56, (height, width, 3))
+    return np.ascontiguousarray(np.clip(gradient + noise, 0, 255).astype(np.uint8))
+
+
+def test_random_rectangles_match_pixel_stats():
+    rgb = random_image(517, 733)
+    stats = IntegralStats(rgb)
+    rng = np.random.default_rng(1)
+    for _ in range(60):
+        x1, x2 = sorted(rng.choice(rgb.shape[1] + 1, 2, replace=False))
+        y1, y2 = sorted(rng.choice(rgb.shape[0] + 1, 2, replace=False))
+        assert_stats_match(stats.region_stats(x1, y1, x2, y2), reference_stats(rgb[y1:y2, x1:x2]))
+
+
+@pytest.mark.parametrize("x1, y1, x2, y2", [
+    (0, 0, 733, 517),                       # 整图, 宽高都不是块的整数倍
+    (BLOCK, BLOCK, 5 * BLOCK, 3 * BLOCK),   # 块对齐
+    (3, 5, 3 + BLOCK - 1, 5 + BLOCK - 1),   # 小于一个块
+    (100, 7, 101, 400),                     # 单像素宽
+])
+def test_aligned_and_small_rectangles(x1, y1, x2, y2):
+    rgb = random_image(517, 733, seed=2)
+    assert_stats_match(IntegralStats(rgb).region_stats(x1, y1, x2, y2), reference_stats(rgb[y1:y2, x1:x2]))
+
+
+@pytest.mark.parametrize("height, width", [(10, 100), (100, 10), (5, 5), (BLOCK, BLOCK - 1)])
+def test_images_smaller_than_a_block(height, width):
+    rgb = random_image(height, width, seed=3)
+    stats = IntegralStats(rgb)
+    assert_stats_match(stats.region_stats(0, 0, width, height), reference_stats(rgb))
+    assert_stats_match(stats.region_stats(1, 1, width - 1, height - 1), reference_stats(rgb[1:-1, 1:-1]))
+
+
+def test_empty_rectangle_returns_none():
+    stats = IntegralStats(random_image(64, 64))
+    assert stats.region_stats(10, 10, 10, 20) is None
@@ -0,0 +1,78 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_metadata_index.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :元数据索引(MetadataIndex)的失效、LRU淘汰及直方图/视频索引缓存测试
+
+用法:
+    python -m pytest test/test_metadata_index.py
+'''
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.metadata_index import MetadataIndex
+
+
+def test_modified_file_is_not_returned(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db")
+    index.put_many([(("a.jpg", 1, 10), 0.0, (4000, 3000, "1/100", 100))])
+    assert index.get_many([("a.jpg", 1, 10)]) == {"a.jpg": (4000, 3000, "1/100", 100)}
+    assert index.get_many([("a.jpg", 2, 10)]) == {}
+    assert index.get_many([("a.jpg", 1, 11)]) == {}
+    # 重新写入时替换同一路径的旧记录
+    index.put_many([(("a.jpg", 2, 10), 0.0, (10, 20, None, None))])
+    assert index.count() == 1
+    assert index.get_many([("a.jpg", 2, 10)]) == {"a.jpg": (10, 20, None, None)}
+    index.close()
+
+
+def test_uncacheable_values_are_skipped(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db")
+    index.put_many([(("a.jpg", 1, 10), 0.0, (1, 1, None, (100, 200))),
+                    (("b.jpg", 1, 10), 0.0, (1, 1, None, 200))])
+    assert index.count() == 1
+    assert index.get_many([("a.jpg", 1, 10), ("b.jpg", 1, 10)]) == {"b.jpg": (1, 1, None, 200)}
+    index.close()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db", max_entries=2)
+    index.put_many([(("a.jpg", 1, 1), 0.0, (1, 1, None, None))])
+    time.sleep(0.02)
+    index.put_many([(("b.jpg", 1, 1), 0.0, (2, 2, None, None))])
+    time.sleep(0.02)
+    # 读取a后b成为最久未访问的条目
+    assert "a.jpg" in index.get_many([("a.jpg", 1, 1)])
+    time.sleep(0.02)
+    index.put_many([(("c.jpg", 1, 1), 0.0, (3, 3, None, None))])
+    assert index.count() == 2
+    assert set(index.get_many([("a.jpg", 1, 1), ("b.jpg", 1, 1), ("c.jpg", 1, 1)])) == {"a.jpg", "c.jpg"}
+    index.close()
+
+
+def test_histogram_requires_same_step(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db")
+    hist = np.arange(4 * 256, dtype=np.int64).reshape(4, 256)
+    index.put_histogram(("a.jpg", 1, 10), 4, hist)
+    assert np.array_equal(index.get_histogram(("a.jpg", 1, 10), 4), hist)
+    assert index.get_histogram(("a.jpg", 1, 10), 1) is None
+    assert index.get_histogram(("a.jpg", 2, 10), 4) is None
+    index.close()
+
+
+def test_video_index_round_trip(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db")
+    pts = np.arange(5, dtype=np.float64) * 33.3
+    keyframes = np.array([0, 3], dtype=np.int64)
+    index.put_video_index(("a.mp4", 1, 10), pts, keyframes)
+    cached_pts, cached_keyframes = index.get_video_index(("a.mp4", 1, 10))
+    assert np.array_equal(cached_pts, pts) and np.array_equal(cached_keyframes, keyframes)
+    assert index.get_video_index(("a.mp4", 1, 11)) is None
+    index.close()
@@ -0,0 +1,83 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_playback_clock.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频播放时钟(PlaybackClock)的暂停、变速及跳转测试, 以可控的单调时钟代替系统时间
+
+用法:
+    python -m pytest test/test_playback_clock.py
+'''
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils import playback_clock
+from src.utils.playback_clock import PlaybackClock
+
+
+@pytest.fixture
+def wall(monkeypatch):
+    """可手动推进的单调时钟(秒)"""
+    wall = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(playback_clock, "time", types.SimpleNamespace(monotonic=lambda: wall.now))
+    return wall
+
+
+def test_starts_paused_and_runs_after_resume(wall):
+    clock = PlaybackClock()
+    assert clock.paused
+    wall.now += 1
+    assert clock.now() == 0
+    clock.resume()
+    wall.now += 0.5
+    assert clock.now() == pytest.approx(500)
+
+
+def test_pause_keeps_media_time(wall):
+    clock = PlaybackClock()
+    clock.resume()
+    wall.now += 1
+    clock.pause()
+    wall.now += 10
+    assert clock.now() == pytest.approx(1000)
+    # 恢复后从暂停处继续, 暂停期间的时间不计入
+    clock.resume()
+    wall.now += 0.25
+    assert clock.now() == pytest.approx(1250)
+
+
+def test_speed_change_rebases_at_current_time(wall):
+    clock = PlaybackClock()
+    clock.resume()
+    wall.now += 1
+    clock.set_speed(2.0)
+    assert clock.now() == pytest.approx(1000)
+    wall.now += 1
+    assert clock.now() == pytest.approx(3000)
+    # 暂停时变速不改变媒体时间, 恢复后按新速度前进
+    clock.pause()
+    clock.set_speed(0.5)
+    wall.now += 5
+    assert clock.now() == pytest.approx(3000)
+    clock.resume()
+    wall.now += 2
+    assert clock.now() == pytest.approx(4000)
+
+
+def test_set_time_keeps_pause_state(wall):
+    clock = PlaybackClock()
+    clock.set_time(5000)
+    wall.now += 1
+    assert clock.paused and clock.now() == 5000
+    clock.resume()
+    wall.now += 1
+    clock.set_time(200)
+    assert not clock.paused and clock.now() == pytest.approx(200)
+    wall.now += 0.1
+    assert clock.now() == pytest.approx(300)
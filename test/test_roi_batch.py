@@ -0,0 +1,81 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_roi_batch.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :ROI同步模式的归一化坐标映射及批量统计请求(RoiStatsBatch)测试
+
+用法:
+    python -m pytest test/test_roi_batch.py
+'''
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.decoded_image import DecodedImage
+from src.utils.roi_batch import RoiStatsBatch, normalize_rect, denormalize_rect
+
+TIMEOUT = 5
+
+
+def test_normalized_rect_maps_between_image_sizes():
+    norm_rect = normalize_rect((100, 50, 300, 150), 400, 200)
+    assert norm_rect == (0.25, 0.25, 0.75, 0.75)
+    assert denormalize_rect(norm_rect, 400, 200) == (100, 50, 300, 150)
+    # 不同分辨率的图片映射到相同的相对区域
+    assert denormalize_rect(norm_rect, 800, 600) == (200, 150, 600, 450)
+
+
+def test_denormalize_rect_clamps_to_image():
+    # 超出图像范围时限制在图像内
+    assert denormalize_rect((-0.5, -0.1, 1.5, 2.0), 100, 80) == (0, 0, 100, 80)
+    # 起点在图像之外时仍保留至少一个像素
+    assert denormalize_rect((1.2, 1.0, 1.5, 1.1), 100, 80) == (99, 79, 100, 80)
+    # 映射后宽或高为0时扩展为一个像素
+    assert denormalize_rect((0.5, 0.5, 0.5, 0.5), 100, 80) == (50, 40, 51, 41)
+
+
+def make_items(count=2, size=64):
+    rgb = np.full((size, size, 3), (30, 60, 90), dtype=np.uint8)
+    return [(DecodedImage(rgb.copy()), (0, 0, size // 2, size // 2)) for _ in range(count)] + [(None, None)]
+
+
+def test_request_returns_results_directly_when_tables_are_built():
+    batch = RoiStatsBatch(lambda *args: None)
+    items = make_items()
+    for decoded, _ in items[:-1]:
+        decoded.integral_stats()
+    results = batch.request(items)
+    assert [stats['avg_rgb'] if stats else None for stats in results] == [(30.0, 60.0, 90.0)] * 2 + [None]
+
+
+def test_latest_async_request_is_delivered():
+    done, delivered = threading.Event(), []
+
+    def on_done(generation, results):
+        delivered.append((generation, results))
+        if generation == 2:
+            done.set()
+    batch = RoiStatsBatch(on_done)
+    assert batch.request(make_items()) is None
+    assert batch.request(make_items(3)) is None
+    assert done.wait(TIMEOUT)
+    generation, results = delivered[-1]
+    assert generation == batch.generation == 2
+    assert len(results) == 4 and results[-1] is None
+    # 第一次请求的结果只有在第二次请求之前完成时才会回调
+    assert [g for g, _ in delivered] in ([2], [1, 2])
+
+
+def test_cancel_drops_pending_results():
+    delivered = []
+    batch = RoiStatsBatch(lambda generation, results: delivered.append(generation))
+    batch.request(make_items())
+    batch.cancel()
+    threading.Event().wait(0.5)
+    assert delivered == []
@@ -0,0 +1,100 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_task_scheduler.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :全局任务调度器(TaskScheduler)的优先级、按标签取消及 map 行为测试
+
+用法:
+    python -m pytest test/test_task_scheduler.py
+'''
+
+import sys
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.task_scheduler import TaskScheduler, PRIORITY_VISIBLE, PRIORITY_PREFETCH, PRIORITY_ICON
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = TaskScheduler(workers=1)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def block_worker(scheduler):
+    """占住唯一的工作线程, 返回放行用的Event"""
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit(lambda: (started.set(), release.wait(TIMEOUT)))
+    assert started.wait(TIMEOUT)
+    return release
+
+
+def test_runs_by_priority_then_submission_order(scheduler):
+    release = block_worker(scheduler)
+    order = []
+    futures = [scheduler.submit(order.append, name, priority=priority) for name, priority in
+               [("icon", PRIORITY_ICON), ("prefetch1", PRIORITY_PREFETCH), ("visible", PRIORITY_VISIBLE),
+                ("prefetch2", PRIORITY_PREFETCH)]]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ["visible", "prefetch1", "prefetch2", "icon"]
+
+
+def test_cancel_by_tag_only_affects_unstarted_tasks_with_that_tag(scheduler):
+    release = block_worker(scheduler)
+    old = [scheduler.submit(lambda: "old", tag="group1") for _ in range(3)]
+    new = scheduler.submit(lambda: "new", tag="group2")
+    assert scheduler.cancel("group1") == 3
+    release.set()
+    assert all(future.cancelled() for future in old)
+    assert new.result(TIMEOUT) == "new"
+    # 已完成的标签不再记录
+    assert scheduler.cancel("group1") == 0 and scheduler.cancel("group2") == 0
+
+
+def test_map_keeps_order_and_propagates_errors(scheduler):
+    assert scheduler.map(lambda x: x * x, range(5)) == [0, 1, 4, 9, 16]
+
+    def fail(x):
+        if x == 2:
+            raise ValueError("bad item")
+        return x
+    with pytest.raises(ValueError):
+        scheduler.map(fail, range(4))
+
+
+def test_map_caller_runs_does_not_wait_for_busy_workers(scheduler):
+    release = block_worker(scheduler)
+    try:
+        # 唯一的工作线程被占用时, 调用线程自己执行全部任务
+        assert scheduler.map(lambda x: x + 1, range(4), caller_runs=True) == [1, 2, 3, 4]
+    finally:
+        release.set()
+
+
+def test_map_inside_worker_does_not_deadlock(scheduler):
+    outer = scheduler.submit(lambda: scheduler.map(lambda x: x * 2, range(3)))
+    assert outer.result(TIMEOUT) == [0, 2, 4]
+    outer = scheduler.submit(lambda: scheduler.map(lambda x: x * 3, range(3), caller_runs=True))
+    assert outer.result(TIMEOUT) == [0, 3, 6]
+
+
+def test_shutdown_cancels_pending_tasks(scheduler):
+    release = block_worker(scheduler)
+    pending = scheduler.submit(lambda: None)
+    scheduler.shutdown()
+    release.set()
+    with pytest.raises(CancelledError):
+        pending.result(TIMEOUT)
+    with pytest.raises(RuntimeError):
+        scheduler.submit(lambda: None)
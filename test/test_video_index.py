@@ -0,0 +1,67 @@
+# -*- encoding: utf-8 -*-
+'''
+@File         :test_video_index.py
+@Time         :2026/10/18
+@Author       :diamond_cz@163.com
+@Version      :1.0
+@Description  :视频关键帧/时间戳索引(VideoIndex)的帧号查找及按索引定位测试
+
+用法:
+    python -m pytest test/test_video_index.py
+'''
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.frame_source import FrameSource
+from src.utils.video_index import VideoIndex, scan_video_index
+from test.test_frame_source import write_video, frame_id, sequential_ids
+
+
+def make_index():
+    # 第一帧时间戳不为0, 帧间隔不均匀(可变帧率)
+    pts = np.array([100.0, 133.0, 166.0, 200.0, 250.0, 300.0, 400.0])
+    return VideoIndex(pts, np.array([0, 3, 5], dtype=np.int64))
+
+
+def test_time_and_index_are_relative_to_first_frame():
+    index = make_index()
+    assert index.frame_count == 7
+    assert index.time_ms(0) == 0 and index.time_ms(4) == 150
+    assert index.index_at(0) == 0
+    # 两帧之间的时间显示前一帧
+    assert index.index_at(149) == 3 and index.index_at(150) == 4 and index.index_at(299) == 5
+    # 超出范围时限制在首尾帧
+    assert index.index_at(-50) == 0 and index.index_at(10000) == 6
+    assert index.time_ms(-1) == 0 and index.time_ms(100) == 300
+
+
+def test_index_of_pts_tolerates_rounding():
+    index = make_index()
+    assert index.index_of_pts(133.0) == 1
+    assert index.index_of_pts(132.6) == 1
+    assert index.index_of_pts(132.4) == 0
+
+
+def test_keyframe_before():
+    index = make_index()
+    assert [index.keyframe_before(i) for i in range(7)] == [0, 0, 0, 3, 3, 5, 5]
+
+
+def test_frame_source_seeks_with_scanned_index(tmp_path):
+    path = write_video(tmp_path / "test.mp4")
+    index = scan_video_index(path)
+    assert index is not None and index.frame_count == 90 and index.keyframes[0] == 0
+    expected = sequential_ids(path)
+    cap = cv2.VideoCapture(path)
+    try:
+        source = FrameSource(cap, 25, index)
+        for i in (80, 3, 79, 45, 44, 0, 89):
+            assert frame_id(source.frame_at(i)) == expected[i]
+        assert source.index_at(source.time_ms(45)) == 45
+    finally:
+        cap.release()